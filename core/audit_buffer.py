@@ -0,0 +1,144 @@
+# core/audit_buffer.py
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# BITÁCORA CON BUFFER
+# - log_event() solo agrega el evento a un buffer del proceso
+# - Dentro de transaction.atomic() el evento entra al buffer hasta el
+#   commit (on_commit): si la transacción se revierte no queda registro,
+#   igual que con el AuditLog.objects.create() de antes
+# - Modo normal: AuditFlushMiddleware escribe el buffer con un solo
+#   bulk_create al terminar el request
+# - SWGFV_AUDIT_ASYNC: un hilo en segundo plano escribe cuando el
+#   buffer llega a MAX_SIZE eventos o MAX_AGE segundos
+# - Si la escritura falla, los eventos se guardan en un JSONL
+#   (SWGFV_AUDIT_SPILL_PATH) en lugar de perderse
+# =========================================================
+
+
+def _conf(name: str, default):
+    return getattr(settings, name, default)
+
+
+class AuditBuffer:
+    def __init__(self):
+        self._events = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @property
+    def max_size(self) -> int:
+        return int(_conf("SWGFV_AUDIT_BUFFER_SIZE", 50))
+
+    @property
+    def max_age(self) -> float:
+        return float(_conf("SWGFV_AUDIT_BUFFER_SECONDS", 5))
+
+    @property
+    def async_mode(self) -> bool:
+        return bool(_conf("SWGFV_AUDIT_ASYNC", False))
+
+    def add(self, event: dict):
+        # Fuera de un bloque atómico on_commit ejecuta en el momento
+        transaction.on_commit(lambda: self._add(event))
+
+    def _add(self, event: dict):
+        with self._lock:
+            if not self._events:
+                self._oldest = time.monotonic()
+            self._events.append(event)
+            full = len(self._events) >= self.max_size
+
+        if self.async_mode:
+            self._ensure_thread()
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def is_due(self) -> bool:
+        with self._lock:
+            if not self._events:
+                return False
+            return (
+                len(self._events) >= self.max_size
+                or time.monotonic() - self._oldest >= self.max_age
+            )
+
+    def _take(self) -> list:
+        with self._lock:
+            events, self._events, self._oldest = self._events, [], None
+        return events
+
+    def flush(self) -> int:
+        """Escribe los eventos pendientes con bulk_create. Devuelve cuántos se escribieron."""
+        with self._flush_lock:
+            events = self._take()
+            if not events:
+                return 0
+
+            from core.models import AuditLog
+            try:
+                AuditLog.objects.bulk_create([AuditLog(**e) for e in events], batch_size=500)
+                return len(events)
+            except Exception:
+                logger.exception("No se pudo escribir la bitácora (%s eventos); se guardan en JSONL", len(events))
+                self._spill(events)
+                return 0
+
+    def _spill(self, events: list):
+        path = _conf("SWGFV_AUDIT_SPILL_PATH", "") or os.path.join(settings.BASE_DIR, "logs", "audit_spill.jsonl")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for e in events:
+                    f.write(json.dumps(e, default=str, ensure_ascii=False) + "\n")
+        except Exception:
+            logger.exception("No se pudo escribir el respaldo JSONL de bitácora")
+
+    # ---------------------------------------------------------
+    # Hilo en segundo plano (solo con SWGFV_AUDIT_ASYNC)
+    # ---------------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="swgfv-audit-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=self.max_age)
+            self._wakeup.clear()
+            if self.is_due():
+                try:
+                    self.flush()
+                finally:
+                    # El hilo no debe dejar conexiones abiertas entre ciclos
+                    from django.db import connection
+                    connection.close()
+
+
+audit_buffer = AuditBuffer()
+
+# Lo que quede en el buffer al terminar el proceso se escribe (o se respalda)
+atexit.register(audit_buffer.flush)
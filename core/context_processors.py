@@ -1,5 +1,10 @@
+from django.conf import settings
+
+
 def session_user(request):
     return {
         "session_usuario": request.session.get("usuario"),
         "session_tipo": request.session.get("tipo"),
+        # Parte de la clave de los fragmentos cacheados del layout
+        "swgfv_deploy": settings.SWGFV_DEPLOY_VERSION,
     }
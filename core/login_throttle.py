@@ -0,0 +1,76 @@
+# core/login_throttle.py
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.models import LoginLock
+from core.utils.cache_utils import CacheNamespace
+
+# =========================================================
+# LOCK DE LOGIN
+# - Intentos fallidos: un evento por fallo en la caché "throttle"
+#   (CacheNamespace.count_event); cuentan los de los últimos LOCK_MINUTES
+# - La caché "throttle" no es la BD: un fallo con un usuario nuevo
+#   cuesta solo la lectura de LoginLock
+# - LoginLock (BD) solo se escribe al imponer o levantar un bloqueo
+# - El estado de cada usuario se cachea; el "sin fila" poco tiempo,
+#   porque otro worker puede imponer el bloqueo
+# =========================================================
+LOCK_MINUTES = 30
+MAX_FAILS = 3
+UNLOCKED_STATE_TTL = 30
+
+# Nunca se invalidan: la versión se queda en la misma caché (sin ir a la BD)
+fail_cache = CacheNamespace("login_fail", timeout=LOCK_MINUTES * 60, alias="throttle", version_alias="throttle")
+lock_cache = CacheNamespace("login_lock", timeout=60 * 60, alias="throttle", version_alias="throttle")
+
+
+def norm_user_key(usuario: str) -> str:
+    return (usuario or "").strip().lower()
+
+
+def _lock_state(key: str) -> dict:
+    estado = lock_cache.get(key)
+    if estado is None:
+        lk = LoginLock.objects.filter(usuario_key=key).only("locked_until").first()
+        estado = {"row": lk is not None, "locked_until": lk.locked_until if lk else None}
+        # También el "sin fila": is_locked y register_fail del mismo intento
+        # (y los siguientes) no vuelven a consultar LoginLock
+        lock_cache.set(key, estado, None if lk else UNLOCKED_STATE_TTL)
+    return estado
+
+
+def is_locked(usuario: str):
+    """(bloqueado, minutos_restantes) para el usuario."""
+    estado = _lock_state(norm_user_key(usuario))
+    lk = LoginLock(locked_until=estado["locked_until"])
+    if lk.is_locked():
+        return True, int(lk.remaining_minutes())
+    return False, 0
+
+
+def register_fail(usuario: str) -> int:
+    """Suma un intento fallido; al llegar a MAX_FAILS guarda el bloqueo en BD."""
+    key = norm_user_key(usuario)
+    if is_locked(key)[0]:
+        return MAX_FAILS
+
+    fails = fail_cache.count_event(key, MAX_FAILS)
+    if fails >= MAX_FAILS:
+        locked_until = timezone.now() + timedelta(minutes=LOCK_MINUTES)
+        LoginLock.objects.update_or_create(
+            usuario_key=key,
+            defaults={"fails": fails, "locked_until": locked_until},
+        )
+        lock_cache.set(key, {"row": True, "locked_until": locked_until})
+        fail_cache.clear_events(key, MAX_FAILS)
+    return fails
+
+
+def reset(usuario: str):
+    """Login correcto: limpia el contador y, si había bloqueo, borra la fila."""
+    key = norm_user_key(usuario)
+    fail_cache.clear_events(key, MAX_FAILS)
+    if _lock_state(key)["row"]:
+        LoginLock.objects.filter(usuario_key=key).delete()
+        lock_cache.set(key, {"row": False, "locked_until": None}, UNLOCKED_STATE_TTL)
@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import AuditLog
+from core.utils.bitacora import drop_empty_partitions, ensure_partitions, is_partitioned
+
+ARCHIVE_FIELDS = [
+    "id", "created_at", "actor_user_id", "actor_email", "actor_tipo",
+    "action", "message", "target_model", "target_id",
+]
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva la bitácora (audit_logs) anterior al corte en JSONL comprimido por día "
+        "(AAAA/MM/audit_logs_AAAA-MM-DD.jsonl.gz) con manifest.json, y borra las filas en lotes. "
+        "En PostgreSQL además mantiene las particiones mensuales."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=365, help="Conserva en BD los últimos N días (default 365).")
+        parser.add_argument("--destino", type=str, default="", help="Carpeta de archivos (default SWGFV_AUDIT_ARCHIVE_DIR).")
+        parser.add_argument("--batch", type=int, default=2000, help="Filas por lote de lectura/borrado.")
+        parser.add_argument("--particiones", type=int, default=3, help="Meses futuros con partición creada (PostgreSQL).")
+        parser.add_argument("--dry-run", action="store_true", help="Solo muestra qué se archivaría.")
+
+    def handle(self, *args, **options):
+        if options["dias"] < 1:
+            raise CommandError("--dias debe ser mayor o igual a 1.")
+
+        destino = Path(
+            options["destino"]
+            or getattr(settings, "SWGFV_AUDIT_ARCHIVE_DIR", "")
+            or Path(settings.BASE_DIR) / "archivo" / "bitacora"
+        )
+        batch = max(1, options["batch"])
+        corte = timezone.now() - timedelta(days=options["dias"])
+        pendientes = AuditLog.objects.filter(created_at__lt=corte)
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(
+                f"[dry-run] Filas anteriores a {corte:%Y-%m-%d %H:%M}: {pendientes.count()}"
+            ))
+            return
+
+        destino.mkdir(parents=True, exist_ok=True)
+        manifest_path = destino / "manifest.json"
+        manifest = {"archivos": []}
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+        total = 0
+        while True:
+            primero = pendientes.order_by("created_at", "id").values_list("created_at", flat=True).first()
+            if primero is None:
+                break
+
+            dia = timezone.localtime(primero).date()
+            inicio = timezone.make_aware(datetime.combine(dia, time.min))
+            fin = min(inicio + timedelta(days=1), corte)
+            # `primero` es el mínimo: todo lo anterior a `fin` pertenece a este día
+            qs_dia = pendientes.filter(created_at__lt=fin)
+
+            archivo, filas, ids = self._escribir_dia(destino, dia, qs_dia, batch)
+            manifest["archivos"].append({
+                "archivo": archivo.relative_to(destino).as_posix(),
+                "fecha": dia.isoformat(),
+                "filas": filas,
+                "id_min": min(ids),
+                "id_max": max(ids),
+                "sha256": _sha256(archivo),
+                "archivado_en": timezone.now().isoformat(),
+            })
+            self._guardar_manifest(manifest_path, manifest)
+
+            # Borrado en lotes acotados solo después de escribir el archivo
+            for i in range(0, len(ids), batch):
+                AuditLog.objects.filter(id__in=ids[i:i + batch]).delete()
+
+            total += filas
+            self.stdout.write(f"{dia}: {filas} filas -> {archivo.name}")
+
+        if is_partitioned():
+            creadas = ensure_partitions(options["particiones"])
+            borradas = drop_empty_partitions(timezone.localtime(corte).date())
+            if creadas or borradas:
+                self.stdout.write(f"Particiones creadas: {creadas or '-'} / eliminadas: {borradas or '-'}")
+
+        self.stdout.write(self.style.SUCCESS(f"Bitácora archivada. Filas movidas: {total}"))
+
+    def _escribir_dia(self, destino: Path, dia, qs, batch: int):
+        carpeta = destino / f"{dia:%Y}" / f"{dia:%m}"
+        carpeta.mkdir(parents=True, exist_ok=True)
+
+        base = f"audit_logs_{dia.isoformat()}"
+        archivo = carpeta / f"{base}.jsonl.gz"
+        parte = 1
+        while archivo.exists():
+            parte += 1
+            archivo = carpeta / f"{base}_part{parte}.jsonl.gz"
+
+        tmp = archivo.with_suffix(".tmp")
+        ids = []
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for row in qs.order_by("id").values(*ARCHIVE_FIELDS).iterator(chunk_size=batch):
+                f.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+                ids.append(row["id"])
+        os.replace(tmp, archivo)
+        return archivo, len(ids), ids
+
+    def _guardar_manifest(self, path: Path, manifest: dict):
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
@@ -0,0 +1,78 @@
+import statistics
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from core import perf
+
+# Páginas GET sin parámetros que usan core/layout.html
+PAGINAS = [
+    "core:menu_principal",
+    "core:ayuda",
+    "core:cuenta",
+    "core:proyecto_alta",
+    "core:proyecto_consulta",
+    "core:dimensionamiento_calculo_modulos",
+    "core:calculo_dc",
+    "core:calculo_ac",
+    "core:calculo_caida_tension",
+    "core:recursos_conceptos",
+    "core:recursos_tablas",
+    "core:gestion_usuarios_alta",
+]
+
+
+def _tpl_ms(response) -> float:
+    # Server-Timing: "db;dur=..;desc=.., tpl;dur=12.3, ..."
+    for parte in response.get("Server-Timing", "").split(","):
+        nombre, _, resto = parte.strip().partition(";")
+        if nombre == "tpl":
+            return float(resto.split("=", 1)[1].split(";")[0])
+    return 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el tiempo de render de plantillas por página con los fragmentos del layout "
+        "en frío (caché vacía en cada request) y en caliente, para cada rol."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--n", type=int, default=30, help="Requests por página y modo (default 30).")
+        parser.add_argument("--usuario", type=str, default="bench@swgfv.local", help="Correo que se pone en la sesión.")
+
+    def handle(self, *args, **options):
+        n = max(1, options["n"])
+        fragmentos = caches["template_fragments"]
+        perf.patch_template_render()
+
+        self.stdout.write(f"Deploy: {settings.SWGFV_DEPLOY_VERSION}  |  mediana de {n} requests (ms de plantilla)")
+        self.stdout.write(f"{'Rol':<14}{'Página':<42}{'Frío':>8}{'Caliente':>10}{'Ahorro':>9}")
+
+        with override_settings(ALLOWED_HOSTS=["testserver"], SWGFV_PERF_ENABLED=True):
+            for rol in ("Administrador", "General"):
+                client = Client()
+                session = client.session
+                session.update({"usuario": options["usuario"], "tipo": rol, "id_usuario": 0})
+                session.save()
+                client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+                for nombre in PAGINAS:
+                    url = reverse(nombre)
+                    if client.get(url).status_code != 200:
+                        # p. ej. páginas solo de administrador con rol General
+                        continue
+
+                    frio = []
+                    for _ in range(n):
+                        fragmentos.clear()
+                        frio.append(_tpl_ms(client.get(url)))
+
+                    caliente = [_tpl_ms(client.get(url)) for _ in range(n)]
+
+                    f, c = statistics.median(frio), statistics.median(caliente)
+                    self.stdout.write(f"{rol:<14}{nombre:<42}{f:>8.2f}{c:>10.2f}{f - c:>9.2f}")
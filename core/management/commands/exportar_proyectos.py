@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Proyecto
+from core.utils.proyectos_jsonl import abrir, exportar
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta proyectos con todos sus cálculos a JSON Lines (una línea por proyecto; "
+        ".gz = comprimido). Los catálogos van por llave natural; se cargan con importar_proyectos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("salida", type=str, help='Archivo .jsonl / .jsonl.gz, o "-" para stdout.')
+        parser.add_argument("--usuario", type=str, default="", help="Solo los proyectos de este correo.")
+        parser.add_argument("--ids", type=str, default="", help="Solo estos ids de proyecto (1,2,3).")
+        parser.add_argument("--chunk", type=int, default=500, help="Proyectos por lote de lectura (default 500).")
+
+    def handle(self, *args, **options):
+        proyectos = Proyecto.objects.all()
+        if options["usuario"]:
+            proyectos = proyectos.filter(ID_Usuario__Correo_electronico__iexact=options["usuario"].strip())
+        if options["ids"]:
+            try:
+                ids = [int(x) for x in options["ids"].split(",") if x.strip()]
+            except ValueError:
+                raise CommandError("--ids debe ser una lista de enteros separados por coma.")
+            proyectos = proyectos.filter(pk__in=ids)
+
+        inicio = time.perf_counter()
+        with abrir(options["salida"], "w") as f:
+            total = exportar(proyectos, f, chunk=max(1, options["chunk"]))
+
+        # Con "-" el resumen no se mezcla con los datos
+        salida = self.stderr if options["salida"] == "-" else self.stdout
+        salida.write(self.style.SUCCESS(
+            f"✅ Proyectos exportados: {total} | {time.perf_counter() - inicio:.1f} s"
+        ))
@@ -0,0 +1,501 @@
+import math
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import (
+    CalculoAC,
+    CalculoDC,
+    CalculoTension,
+    Condulet,
+    Conductor,
+    Dimensionamiento,
+    Inversor,
+    Irradiancia,
+    MicroInversor,
+    NumeroPaneles,
+    PanelSolar,
+    Proyecto,
+    ResultadoCalculoAC,
+    ResultadoCalculoDC,
+    ResultadoTension,
+    TablaConductoresAWGConReactancia,
+    Usuario,
+)
+from core.utils.proyectos_jsonl import FORMATO, ImportadorProyectos
+
+# =========================================================
+# DATOS SINTÉTICOS PARA PRUEBAS DE CARGA
+# - Usuarios del lote: usuario<N>@<lote>.sintetico.invalid
+#   (el lote se borra completo con --limpiar <lote>)
+# - Cada proyecto lleva la cadena completa: consumos -> módulos ->
+#   inversores/cadenas -> DC -> AC -> caída de tensión, con las mismas
+#   fórmulas que las vistas de cálculo
+# - Se generan registros con el formato de exportar_proyectos y se cargan
+#   con ImportadorProyectos (bulk_create por lote)
+# =========================================================
+DOMINIO = "sintetico.invalid"
+MESES = ["ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"]
+MAPEO_BIMESTRES = {"bim1": "feb", "bim2": "abr", "bim3": "jun", "bim4": "ago", "bim5": "oct", "bim6": "dic"}
+VOLTAJES_POR_FASES = {1: ["127"], 2: ["220", "240"], 3: ["220", "440", "480"]}
+PROTECCIONES_AC = [20, 25, 32, 40, 50, 63, 80, 100, 125, 160, 200, 250]
+TUBOS = [
+    ("tubo_1_2_pulgada", "Tubo 1/2\" pared delgada"),
+    ("tubo_3_4_pulgada", "Tubo 3/4\" pared delgada"),
+    ("tubo_1_pulgada", "Tubo 1\" pared delgada"),
+    ("tubo_1_1_4_pulgada", "Tubo 1 1/4\" pared delgada"),
+    ("tubo_1_1_2_pulgada", "Tubo 1 1/2\" pared delgada"),
+    ("tubo_2_pulgada", "Tubo 2\" pared delgada"),
+    ("tubo_2_1_2_pulgada", "Tubo 2 1/2\" pared delgada"),
+]
+# Sin coordenadas en el catálogo: punto dentro de México
+LAT_MEXICO = (14.5, 32.7)
+LON_MEXICO = (-117.0, -86.7)
+
+
+def _dec(valor: float, decimales: int) -> str:
+    return f"{valor:.{decimales}f}"
+
+
+def _awg(calibre: str):
+    base = (calibre or "").upper().replace("AWG", "").strip()
+    return int(base) if base.isdigit() else None
+
+
+def _tuberia(conductor, hilos: int) -> str:
+    for attr, etiqueta in TUBOS:
+        if int(getattr(conductor, attr) or 0) >= hilos:
+            return etiqueta
+    return TUBOS[-1][1]
+
+
+def _repartir(total: int, partes: int) -> list:
+    base, resto = divmod(total, partes)
+    return [base + (1 if i < resto else 0) for i in range(partes)]
+
+
+class _Generador:
+    def __init__(self, rnd: random.Random):
+        self.rnd = rnd
+        self.irradiancias = [i for i in Irradiancia.objects.order_by("no") if (i.promedio or 0) > 0]
+        self.paneles = [
+            p for p in PanelSolar.objects.order_by("id_modulo")
+            if (p.potencia or 0) > 0 and (p.voc or 0) > 0 and (p.isc or 0) > 0
+        ]
+        self.inversores = [
+            i for i in Inversor.objects.order_by("marca", "modelo")
+            if (i.potencia or 0) > 0 and (i.corriente_salida or 0) > 0
+        ]
+        self.micros = [
+            m for m in MicroInversor.objects.order_by("marca", "modelo")
+            if (m.potencia or 0) > 0 and (m.corriente_salida or 0) > 0
+        ]
+        awg = {t.calibre_awg: t for t in TablaConductoresAWGConReactancia.objects.all()}
+        # Conductores con fila AWG: la caída de tensión necesita resistencia y reactancia
+        self.conductores = [
+            (c, awg[_awg(c.calibre_cable)])
+            for c in Conductor.objects.order_by("id_conductor")
+            if _awg(c.calibre_cable) in awg
+        ]
+
+        faltan = [
+            nombre for nombre, filas in (
+                ("irradiancia", self.irradiancias),
+                ("paneles solares", self.paneles),
+                ("inversores", self.inversores),
+                ("conductores + tabla AWG", self.conductores),
+            ) if not filas
+        ]
+        if faltan:
+            raise CommandError(f"Importa primero los catálogos: {', '.join(faltan)}")
+
+    # ---------------------------------------------------------
+    # Un proyecto completo (formato de exportar_proyectos)
+    # ---------------------------------------------------------
+    def registro(self, n: int, correo: str, lote: str) -> dict:
+        rnd = self.rnd
+        fases = rnd.choices([1, 2, 3], weights=[5, 3, 2])[0]
+        voltaje = rnd.choice(VOLTAJES_POR_FASES[fases])
+        sitio = rnd.choice(self.irradiancias)
+        if sitio.latitud is not None and sitio.longitud is not None:
+            lat = float(sitio.latitud) + rnd.uniform(-0.25, 0.25)
+            lon = float(sitio.longitud) + rnd.uniform(-0.25, 0.25)
+        else:
+            lat, lon = rnd.uniform(*LAT_MEXICO), rnd.uniform(*LON_MEXICO)
+
+        registro = {
+            "v": FORMATO,
+            "usuario": correo,
+            "proyecto": {
+                "Nombre_Proyecto": f"{lote} #{n}",
+                "Nombre_Empresa": f"Empresa {lote} {n % 97}",
+                "Direccion": f"{sitio.ciudad}, {sitio.estado}"[:255],
+                "Coordenadas": f"{lat:.6f}, {lon:.6f}",
+                "Voltaje_Nominal": voltaje,
+                "Numero_Fases": fases,
+            },
+            "calculos_dc": [],
+            "calculos_ac": [],
+            "calculos_tension": [],
+        }
+
+        panel = rnd.choice(self.paneles)
+        numero, no_modulos = self._numero_paneles(sitio, panel)
+        registro["numero_paneles"] = numero
+
+        detalles, equipos = self._dimensionamiento(panel, no_modulos)
+        registro["dimensionamiento"] = {
+            "datos": {
+                "tipo_inversor": "MICRO" if equipos[0][1] else "INVERSOR",
+                "no_inversores": len(detalles),
+            },
+            "detalles": detalles,
+        }
+
+        for det, (_, micro) in zip(detalles, equipos):
+            equipo = micro or det["_equipo"]
+            dc, awg_dc = self._calculo_dc(det, panel)
+            ac, awg_ac = self._calculo_ac(det, equipo, fases, voltaje)
+            registro["calculos_dc"].append(dc)
+            registro["calculos_ac"].append(ac)
+            registro["calculos_tension"].append(self._tension_ac(det, ac, awg_ac, equipo, fases, voltaje))
+            # Como en la vista: la caída DC por serie no aplica a micro inversores
+            if not micro:
+                registro["calculos_tension"].extend(self._tensiones_dc(det, dc, awg_dc, panel))
+            del det["_equipo"]
+        return registro
+
+    def _numero_paneles(self, sitio, panel):
+        rnd = self.rnd
+        mensual = rnd.random() < 0.6
+        base = rnd.uniform(150, 1500)
+        fase = rnd.uniform(0, 2 * math.pi)
+        por_mes = [base * (1 + 0.25 * math.sin(2 * math.pi * k / 12 + fase)) for k in range(12)]
+        if mensual:
+            consumos = {m: round(v) for m, v in zip(MESES, por_mes)}
+            consumo_promedio, dias_ref = sum(consumos.values()) / 12.0, 30.0
+        else:
+            consumos = {b: round(por_mes[2 * k] + por_mes[2 * k + 1]) for k, b in enumerate(MAPEO_BIMESTRES)}
+            consumo_promedio, dias_ref = sum(consumos.values()) / 6.0, 60.0
+        eff = round(rnd.uniform(0.75, 0.85), 2)
+
+        # Misma fórmula que el cálculo de módulos
+        pot_panel_kw = float(panel.potencia) / 1000.0
+        energia_por_modulo = pot_panel_kw * float(sitio.promedio) * eff * dias_ref
+        no_modulos = max(1, math.ceil((consumo_promedio / energia_por_modulo) * 1.1))
+        potencia_total = round(no_modulos * pot_panel_kw, 4)
+        if mensual:
+            generacion = {m: round(potencia_total * float(getattr(sitio, m) or 0) * eff * 30.0, 4) for m in MESES}
+        else:
+            generacion = {
+                b: round(potencia_total * float(getattr(sitio, m) or 0) * eff * 60.0, 4)
+                for b, m in MAPEO_BIMESTRES.items()
+            }
+
+        return {
+            "datos": {
+                "tipo_facturacion": "MENSUAL" if mensual else "BIMESTRAL",
+                "eficiencia": _dec(eff, 2),
+                "consumos": consumos,
+            },
+            "irradiancia": sitio.no,
+            "panel": panel.id_modulo,
+            "resultado": {
+                "no_modulos": no_modulos,
+                "generacion_por_periodo": generacion,
+                "generacion_anual": _dec(sum(generacion.values()), 3),
+                "potencia_total": potencia_total,
+            },
+        }, no_modulos
+
+    def _dimensionamiento(self, panel, no_modulos: int):
+        """Detalles por inversor/micro; cadenas que no rebasan el voltaje máximo de entrada."""
+        rnd = self.rnd
+        detalles, equipos = [], []
+        if self.micros and rnd.random() < 0.25:
+            micro = rnd.choice(self.micros)
+            por_micro = max(1, int(micro.no_mppt or 1))
+            for k, modulos in enumerate(_repartir(no_modulos, math.ceil(no_modulos / por_micro)), start=1):
+                detalles.append(self._detalle(k, [modulos], micro))
+                equipos.append((None, micro))
+            return detalles, equipos
+
+        inversor = rnd.choice(self.inversores)
+        n_inv = max(1, math.ceil(no_modulos * float(panel.potencia) / float(inversor.potencia)))
+        n_inv = min(n_inv, no_modulos)
+        max_serie = max(1, int(float(inversor.voltaje_maximo_entrada or 600) // float(panel.voc)))
+        for k, modulos in enumerate(_repartir(no_modulos, n_inv), start=1):
+            cadenas = _repartir(modulos, math.ceil(modulos / max_serie))
+            detalles.append(self._detalle(k, cadenas, inversor))
+            equipos.append((inversor, None))
+        return detalles, equipos
+
+    def _detalle(self, indice: int, cadenas: list, equipo) -> dict:
+        es_micro = isinstance(equipo, MicroInversor)
+        return {
+            "ref": indice,
+            "datos": {
+                "no_cadenas": len(cadenas),
+                "modulos_por_cadena": max(cadenas),
+                "modulos_por_cadena_lista": cadenas,
+                "indice": indice,
+            },
+            "inversor": None if es_micro else [equipo.marca, equipo.modelo],
+            "micro_inversor": [equipo.marca, equipo.modelo] if es_micro else None,
+            "_equipo": equipo,
+        }
+
+    def _condulet(self) -> dict:
+        return {k: self.rnd.randint(0, 3) for k in ("tipo_ll", "tipo_lr", "tipo_lb", "tipo_t", "tipo_c")}
+
+    def _calculo_dc(self, det: dict, panel):
+        rnd = self.rnd
+        cadenas = det["datos"]["no_cadenas"]
+        conductor, awg = rnd.choice(self.conductores)
+        por_serie = [round(rnd.uniform(5, 60), 2) for _ in range(cadenas)]
+        metros = max(por_serie)
+        hilos = cadenas * 2 + 1
+        amperaje = float(panel.isc) * 1.25 * 1.25
+        return {
+            "ref": det["ref"],
+            "detalle": det["ref"],
+            "conductor": conductor.pk,
+            "datos": {
+                "indice": det["datos"]["indice"],
+                "metros_lineales": _dec(metros, 3),
+                "metros_lineales_por_serie": por_serie,
+                "calibre_cable_solar": conductor.calibre_cable,
+                "hilos_tuberia": hilos,
+            },
+            "condulet": self._condulet(),
+            "resultado": {
+                "amperaje_fusible": "20" if amperaje <= 20 else "25" if amperaje <= 25 else "32",
+                "total_de_cadenas": cadenas,
+                "total_fusibles": cadenas * 2,
+                "metros_totales_cable": _dec(cadenas * 2 * metros, 3),
+                "calibre_tuberia": _tuberia(conductor, hilos),
+                "total_tubos": math.ceil(metros / 3),
+            },
+        }, awg
+
+    def _calculo_ac(self, det: dict, equipo, fases: int, voltaje: str):
+        rnd = self.rnd
+        conductor, awg = rnd.choice(self.conductores)
+        metros = round(rnd.uniform(3, 40), 2)
+        hilos = fases + 2
+        v = float(voltaje)
+        amperaje = math.ceil(float(equipo.potencia) / (v * (1.732050 if fases == 3 else 1)) * 1.25)
+        proteccion = next((p for p in PROTECCIONES_AC if amperaje <= p), PROTECCIONES_AC[-1])
+        return {
+            "ref": det["ref"],
+            "detalle": det["ref"],
+            "conductor": conductor.pk,
+            "datos": {
+                "indice": det["datos"]["indice"],
+                "metros_lineales_ac": _dec(metros, 3),
+                "calibre_cable_thhw": conductor.calibre_cable,
+                "hilos_tuberia_ac": hilos,
+            },
+            "condulet": self._condulet(),
+            "resultado": {
+                "amperaje_proteccion": _dec(proteccion, 3),
+                "total_de_cadenas_ac": det["datos"]["no_cadenas"],
+                "total_protecciones": 1,
+                "metros_totales_cable_ac": _dec(metros * fases, 3),
+                "calibre_tuberia_ac": _tuberia(conductor, hilos),
+                "total_tubos_ac": math.ceil(metros / 3),
+            },
+        }, awg
+
+    def _tipo_cable(self):
+        return "cobre" if self.rnd.random() < 0.85 else "aluminio"
+
+    def _tension_ac(self, det: dict, ac: dict, awg, equipo, fases: int, voltaje: str) -> dict:
+        rnd = self.rnd
+        tipo_cable = self._tipo_cable()
+        temperatura = round(rnd.uniform(25, 50), 1)
+        fp = round(rnd.uniform(0.90, 1.0), 2)
+        longitud = float(ac["datos"]["metros_lineales_ac"]) / 1000.0
+        corriente = float(equipo.corriente_salida)
+        coef = 0.00393 if tipo_cable == "cobre" else 0.00403
+        rt = float(awg.resistencia_ca or 0) * (1 + coef * (temperatura - 20))
+        caida = (2 if fases in (1, 2) else math.sqrt(3)) * corriente * longitud * (
+            rt * fp + float(awg.reactancia or 0) * math.sqrt(max(0.0, 1 - fp ** 2))
+        )
+        v = float(voltaje)
+        voltaje_tension = caida / v * 100
+        return {
+            "tension_ac": ac["ref"],
+            "tension_dc": None,
+            "datos": {
+                "indice": det["datos"]["indice"],
+                "serie": None,
+                "tipo_calculo": "AC",
+                "tipo_cable_ac": tipo_cable,
+                "factor_potencia_ac": _dec(fp, 4),
+                "temperatura_ac": _dec(temperatura, 3),
+                "longitud_ac": _dec(longitud, 6),
+            },
+            "resultado": {
+                "voltaje_tension_ac": _dec(voltaje_tension, 6),
+                "porcentaje_voltaje_tension_ac": _dec(voltaje_tension / v * 100, 6),
+                "calculo_rt_ac": _dec(rt, 6),
+                "corriente_corregida": _dec(corriente, 6),
+            },
+        }
+
+    def _tensiones_dc(self, det: dict, dc: dict, awg, panel) -> list:
+        tipo_cable = self._tipo_cable()
+        temperatura = round(self.rnd.uniform(25, 70), 1)
+        coef = 0.00393 if tipo_cable == "cobre" else 0.00403
+        rt = float(awg.resistencia_cc or 0) * (1 + coef * (temperatura - 20))
+        corriente = float(panel.isc)
+        out = []
+        for serie, (modulos, metros) in enumerate(
+            zip(det["datos"]["modulos_por_cadena_lista"], dc["datos"]["metros_lineales_por_serie"]), start=1
+        ):
+            longitud = metros / 1000.0
+            caida = 2 * corriente * longitud * rt
+            voltaje_cadena = float(panel.voc) * modulos
+            out.append({
+                "tension_dc": dc["ref"],
+                "tension_ac": None,
+                "datos": {
+                    "indice": det["datos"]["indice"],
+                    "serie": serie,
+                    "tipo_calculo": "DC",
+                    "tipo_cable_dc": tipo_cable,
+                    "temperatura_dc": _dec(temperatura, 3),
+                    "longitud_dc": _dec(longitud, 6),
+                },
+                "resultado": {
+                    "voltaje_tension_dc": _dec(caida, 6),
+                    "porcentaje_voltaje_tension_dc": _dec(caida / voltaje_cadena * 100, 6),
+                    "calculo_rt_dc": _dec(rt, 6),
+                    "corriente_corregida": _dec(corriente, 6),
+                },
+            })
+        return out
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera usuarios y proyectos sintéticos con cálculos completos (módulos, inversores, DC, AC, "
+        "caída de tensión) para pruebas de carga. Reproducible con --seed; se borra con --limpiar <lote>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=str, default="carga", help="Etiqueta del lote (default carga).")
+        parser.add_argument("--usuarios", type=int, default=10, help="Usuarios a crear (default 10).")
+        parser.add_argument("--proyectos", type=int, default=1000, help="Proyectos a crear (default 1000).")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador (default 0).")
+        parser.add_argument(
+            "--password",
+            type=str,
+            default="",
+            help="Contraseña de los usuarios del lote (default: sin acceso)."
+        )
+        parser.add_argument("--chunk", type=int, default=1000, help="Proyectos por transacción (default 1000).")
+        parser.add_argument("--limpiar", action="store_true", help="Borra el lote en lugar de generarlo.")
+
+    def handle(self, *args, **options):
+        lote = (options["lote"] or "").strip().lower()
+        if not lote.replace("-", "").isalnum():
+            raise CommandError("--lote solo admite letras, números y guiones.")
+        sufijo = f"@{lote}.{DOMINIO}"
+
+        if options["limpiar"]:
+            self._limpiar(sufijo, lote, max(1, options["chunk"]))
+            return
+
+        if options["usuarios"] < 1 or options["proyectos"] < 0:
+            raise CommandError("--usuarios debe ser >= 1 y --proyectos >= 0.")
+        if Usuario.objects.filter(Correo_electronico__endswith=sufijo).exists():
+            raise CommandError(f"El lote '{lote}' ya existe; bórralo con --limpiar --lote {lote}.")
+
+        inicio = time.perf_counter()
+        rnd = random.Random(options["seed"])
+        generador = _Generador(rnd)
+
+        # Un solo hash para todo el lote (make_password es lento a propósito)
+        contrasena = make_password(options["password"] or None)
+        correos = [f"usuario{n}{sufijo}" for n in range(1, options["usuarios"] + 1)]
+        Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    Nombre=f"Usuario {n}",
+                    Apellido_Paterno="Sintetico",
+                    Apellido_Materno=lote[:50],
+                    Telefono=f"55{n:08d}"[-10:],
+                    Correo_electronico=correo,
+                    Contrasena=contrasena,
+                    Tipo="General",
+                )
+                for n, correo in enumerate(correos, start=1)
+            ],
+            batch_size=1000,
+        )
+
+        importador = ImportadorProyectos(batch_size=1000)
+        chunk = max(1, options["chunk"])
+        total = options["proyectos"]
+        for desde in range(0, total, chunk):
+            registros = [
+                (n, generador.registro(n, correos[n % len(correos)], lote))
+                for n in range(desde + 1, min(desde + chunk, total) + 1)
+            ]
+            importador.cargar(registros)
+            self.stdout.write(f"... {importador.creados} proyectos")
+
+        for linea, motivo in importador.omitidos[:10]:
+            self.stdout.write(self.style.WARNING(f"[Proyecto {linea}] {motivo}"))
+
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Lote '{lote}': {len(correos)} usuarios | {importador.creados} proyectos | "
+            f"{segundos:.1f} s (seed {options['seed']})"
+        ))
+
+    def _limpiar(self, sufijo: str, lote: str, chunk: int):
+        """Borra por lotes de proyectos; condulets y resultados no cuelgan del proyecto."""
+        inicio = time.perf_counter()
+        usuarios = Usuario.objects.filter(Correo_electronico__endswith=sufijo)
+        proyectos = Proyecto.objects.filter(ID_Usuario__in=usuarios).order_by("pk").values_list("pk", flat=True)
+        borrados = 0
+        while True:
+            ids = list(proyectos[:chunk])
+            if not ids:
+                break
+            with transaction.atomic():
+                condulets, res_dc, res_ac = [], [], []
+                for c, r in CalculoDC.objects.filter(proyecto_id__in=ids).values_list("condulet_id", "resultado_dc_id"):
+                    condulets.append(c)
+                    res_dc.append(r)
+                for c, r in CalculoAC.objects.filter(proyecto_id__in=ids).values_list("condulet_id", "resultado_ac_id"):
+                    condulets.append(c)
+                    res_ac.append(r)
+                tensiones = CalculoTension.objects.filter(proyecto_id__in=ids)
+                res_tension = list(tensiones.values_list("resultado_tension_id", flat=True))
+
+                tensiones.delete()
+                CalculoDC.objects.filter(proyecto_id__in=ids).delete()
+                CalculoAC.objects.filter(proyecto_id__in=ids).delete()
+                Dimensionamiento.objects.filter(proyecto_id__in=ids).delete()
+                NumeroPaneles.objects.filter(proyecto_id__in=ids).delete()
+                Condulet.objects.filter(pk__in=[c for c in condulets if c]).delete()
+                ResultadoCalculoDC.objects.filter(pk__in=[r for r in res_dc if r]).delete()
+                ResultadoCalculoAC.objects.filter(pk__in=[r for r in res_ac if r]).delete()
+                ResultadoTension.objects.filter(pk__in=[r for r in res_tension if r]).delete()
+                Proyecto.objects.filter(pk__in=ids).delete()
+            borrados += len(ids)
+            self.stdout.write(f"... {borrados} proyectos borrados")
+
+        n_usuarios = usuarios.count()
+        usuarios.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Lote '{lote}' eliminado: {borrados} proyectos, {n_usuarios} usuarios | "
+            f"{time.perf_counter() - inicio:.1f} s"
+        ))
@@ -0,0 +1,79 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.models import TablaNOM
+from core.utils.imagenes import DERIVADOS_DIR, derivados_en_uso, generar_derivados
+
+
+def _tamano(archivo) -> int:
+    try:
+        return archivo.size if archivo else 0
+    except Exception:
+        return 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera la miniatura y el WebP de pantalla de cada imagen de TablaNOM "
+        "(solo las que cambiaron, salvo --forzar)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--forzar",
+            action="store_true",
+            help="Regenera aunque la imagen no haya cambiado (p. ej. tras cambiar calidad o anchos)."
+        )
+        parser.add_argument(
+            "--limpiar",
+            action="store_true",
+            help=f"Borra de {DERIVADOS_DIR} los derivados que ya no usa ninguna tabla."
+        )
+
+    def handle(self, *args, **options):
+        generadas = 0
+        sin_cambios = 0
+        errores = 0
+        bytes_original = 0
+        bytes_web = 0
+
+        for tabla in TablaNOM.objects.exclude(imagen="").exclude(imagen__isnull=True).order_by("id"):
+            try:
+                cambio = generar_derivados(tabla, forzar=options["forzar"])
+            except Exception as e:
+                errores += 1
+                self.stdout.write(self.style.WARNING(f"[ERROR] {tabla.id} {tabla.imagen.name}: {e}"))
+                continue
+
+            original, web, mini = _tamano(tabla.imagen), _tamano(tabla.imagen_web), _tamano(tabla.imagen_miniatura)
+            bytes_original += original
+            bytes_web += web
+
+            if cambio:
+                generadas += 1
+                self.stdout.write(self.style.SUCCESS(
+                    f"[OK] {tabla.id} {tabla.imagen.name}: original {original // 1024} KB | "
+                    f"web {web // 1024} KB | miniatura {mini // 1024} KB"
+                ))
+            else:
+                sin_cambios += 1
+
+        borrados = 0
+        if options["limpiar"]:
+            en_uso = derivados_en_uso(TablaNOM)
+            _, archivos = default_storage.listdir(DERIVADOS_DIR) if default_storage.exists(DERIVADOS_DIR) else ([], [])
+            for nombre in archivos:
+                ruta = f"{DERIVADOS_DIR}/{nombre}"
+                if ruta not in en_uso:
+                    default_storage.delete(ruta)
+                    borrados += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Derivados terminados. Generados: {generadas} | Sin cambios: {sin_cambios} | "
+            f"Errores: {errores} | Huérfanos borrados: {borrados}"
+        ))
+        if bytes_original:
+            self.stdout.write(
+                f"Vista de tabla: {bytes_original // 1024} KB (originales) -> {bytes_web // 1024} KB (WebP), "
+                f"{100 - bytes_web * 100 // bytes_original}% menos"
+            )
@@ -0,0 +1,229 @@
+import csv
+import math
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils import irradiancia_malla
+from core.utils.importacion import abrir_csv, norm_header
+
+_LAT = {"lat", "latitud", "latitude", "y"}
+_LON = {"lon", "long", "longitud", "longitude", "lng", "x"}
+_TIEMPO = {"t", "hora", "hour", "mes", "month", "paso", "timestep"}
+_VALOR = {"ghi", "valor", "value", "irradiancia"}
+_MESES_EN = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_COLUMNA_MES = {
+    **{m: k for k, m in enumerate(irradiancia_malla.MESES)},
+    **{m: k for k, m in enumerate(_MESES_EN)},
+}
+
+
+def _num(texto) -> float:
+    texto = (texto or "").strip()
+    if not texto:
+        return math.nan
+    try:
+        return float(texto.replace(",", ".") if "." not in texto else texto)
+    except ValueError:
+        return math.nan
+
+
+def _paso(valores) -> float:
+    ordenados = sorted(valores)
+    difs = [b - a for a, b in zip(ordenados, ordenados[1:]) if b - a > 1e-9]
+    return min(difs) if difs else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Convierte una malla de irradiancia (GHI) a un .npy para leerla con np.memmap. "
+        "Acepta CSV (lat, lon + 12 columnas de mes, o lat, lon, t, ghi) o "
+        "rejillas ESRI ASCII (.asc, un archivo por mes/hora, en orden de nombre)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ruta", type=str, help="CSV, archivo .asc o carpeta con .asc.")
+        parser.add_argument("--nombre", type=str, required=True, help="Nombre de la malla (subcarpeta de destino).")
+        parser.add_argument(
+            "--paso",
+            type=float,
+            default=None,
+            help="Resolución en grados; por defecto se deduce de las coordenadas del CSV."
+        )
+        parser.add_argument(
+            "--factor",
+            type=float,
+            default=1.0,
+            help="Multiplica cada valor (p. ej. 0.2778 para MJ/m² -> kWh/m²)."
+        )
+
+    def handle(self, *args, **options):
+        if not irradiancia_malla.disponible():
+            raise CommandError("Se requiere numpy para las mallas de irradiancia (pip install numpy).")
+
+        ruta = Path(options["ruta"])
+        if not ruta.is_absolute():
+            ruta = Path(settings.BASE_DIR) / ruta
+        if not ruta.exists():
+            raise CommandError(f"No se encontró: {ruta}")
+
+        inicio = time.perf_counter()
+        try:
+            if ruta.is_dir() or ruta.suffix.lower() == ".asc":
+                escritura = self._desde_asc(ruta, options)
+            else:
+                escritura = self._desde_csv(ruta, options)
+            destino = escritura.publicar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        meta = escritura.meta
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Malla '{meta['nombre']}': {meta['nlat']} x {meta['nlon']} celdas x {meta['nt']} pasos "
+            f"({meta['unidades']}) | con dato: {meta['celdas_con_dato']} | "
+            f"{destino.stat().st_size / 1e6:.1f} MB | {time.perf_counter() - inicio:.1f} s"
+        ))
+        if settings.SWGFV_IRRADIANCIA_MALLA != meta["nombre"]:
+            self.stdout.write(f"Para usarla en el cálculo: SWGFV_IRRADIANCIA_MALLA={meta['nombre']}")
+
+    # ---------------------------------------------------------
+    # CSV
+    # ---------------------------------------------------------
+    def _abrir(self, ruta: Path):
+        f = abrir_csv(ruta)
+        muestra = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        return f, csv.reader(f, dialecto)
+
+    def _desde_csv(self, ruta: Path, options):
+        f, reader = self._abrir(ruta)
+        with f:
+            encabezados = [norm_header(h) for h in next(reader, [])]
+            col = {h: k for k, h in enumerate(encabezados)}
+            i_lat = next((col[h] for h in _LAT if h in col), None)
+            i_lon = next((col[h] for h in _LON if h in col), None)
+            if i_lat is None or i_lon is None:
+                raise ValueError(f"El CSV necesita columnas de latitud y longitud. Encontradas: {encabezados}")
+
+            meses = {col[h]: k for h, k in _COLUMNA_MES.items() if h in col}
+            i_t = next((col[h] for h in _TIEMPO if h in col), None)
+            i_v = next((col[h] for h in _VALOR if h in col), None)
+            ancho = len(meses) == 12
+            if not ancho and (i_t is None or i_v is None):
+                raise ValueError("El CSV necesita 12 columnas de mes (ene..dic) o columnas de tiempo y valor (t, ghi).")
+
+            # Primera pasada: coordenadas y número de pasos
+            lats, lons = set(), set()
+            t_min, t_max = math.inf, -math.inf
+            for row in reader:
+                lat, lon = _num(row[i_lat]), _num(row[i_lon])
+                if math.isnan(lat) or math.isnan(lon):
+                    continue
+                lats.add(round(lat, 6))
+                lons.add(round(lon, 6))
+                if not ancho:
+                    t = _num(row[i_t])
+                    if not math.isnan(t):
+                        t_min, t_max = min(t_min, t), max(t_max, t)
+
+            if not lats:
+                raise ValueError("El CSV no tiene filas con coordenadas.")
+
+            base_t = 0
+            if ancho:
+                nt = 12
+            else:
+                # Mes 1..12 u hora 1..8760 -> índice desde 0
+                base_t = 1 if t_min == 1 and int(t_max) in irradiancia_malla.PASOS_VALIDOS else 0
+                nt = int(t_max) - base_t + 1
+
+            dlat = options["paso"] or _paso(lats) or 1.0
+            dlon = options["paso"] or _paso(lons) or 1.0
+            lat0, lon0 = min(lats), min(lons)
+            escritura = irradiancia_malla.EscrituraMalla(
+                options["nombre"], lat0, lon0, dlat, dlon,
+                round((max(lats) - lat0) / dlat) + 1, round((max(lons) - lon0) / dlon) + 1, nt,
+                origen=ruta.name,
+            )
+
+            # Segunda pasada: valores directo al memmap
+            f.seek(0)
+            next(reader, None)
+            factor = options["factor"]
+            ghi = escritura.ghi
+            for row in reader:
+                idx = escritura.indice(_num(row[i_lat]), _num(row[i_lon])) if row else None
+                if idx is None:
+                    continue
+                if ancho:
+                    valores = [_num(row[k]) * factor for k in sorted(meses, key=meses.get)]
+                    ghi[idx[0], idx[1], :] = valores
+                else:
+                    t = _num(row[i_t])
+                    if not math.isnan(t) and 0 <= int(t) - base_t < nt:
+                        ghi[idx[0], idx[1], int(t) - base_t] = _num(row[i_v]) * factor
+        return escritura
+
+    # ---------------------------------------------------------
+    # ESRI ASCII (.asc)
+    # ---------------------------------------------------------
+    def _encabezado_asc(self, f) -> dict:
+        # Líneas "clave valor" hasta la primera fila de datos; NODATA_value es opcional
+        enc = {}
+        while True:
+            pos = f.tell()
+            partes = f.readline().split()
+            if len(partes) != 2 or not partes[0][:1].isalpha():
+                f.seek(pos)
+                break
+            try:
+                enc[partes[0].lower()] = float(partes[1])
+            except ValueError:
+                raise ValueError(f"{Path(f.name).name}: encabezado inválido: {' '.join(partes)}")
+
+        faltan = [c for c in ("ncols", "nrows", "cellsize") if c not in enc]
+        if "xllcorner" not in enc and "xllcenter" not in enc:
+            faltan.append("xllcorner/xllcenter")
+        if "yllcorner" not in enc and "yllcenter" not in enc:
+            faltan.append("yllcorner/yllcenter")
+        if faltan:
+            raise ValueError(f"{Path(f.name).name}: faltan en el encabezado ESRI ASCII: {', '.join(faltan)}")
+        return enc
+
+    def _desde_asc(self, ruta: Path, options):
+        archivos = sorted(ruta.glob("*.asc")) if ruta.is_dir() else [ruta]
+        if not archivos:
+            raise ValueError(f"No hay archivos .asc en {ruta}")
+
+        with open(archivos[0], "r", encoding="ascii") as f:
+            geo = self._encabezado_asc(f)
+        ncols, nrows, paso = int(geo["ncols"]), int(geo["nrows"]), geo["cellsize"]
+        # xll/yll pueden venir como esquina o como centro de la celda inferior izquierda
+        lon0 = geo["xllcenter"] if "xllcenter" in geo else geo["xllcorner"] + paso / 2
+        lat0 = geo["yllcenter"] if "yllcenter" in geo else geo["yllcorner"] + paso / 2
+
+        escritura = irradiancia_malla.EscrituraMalla(
+            options["nombre"], lat0, lon0, paso, paso, nrows, ncols, len(archivos),
+            origen=ruta.name,
+        )
+        factor = options["factor"]
+        for t, archivo in enumerate(archivos):
+            with open(archivo, "r", encoding="ascii") as f:
+                enc = self._encabezado_asc(f)
+                if int(enc["ncols"]) != ncols or int(enc["nrows"]) != nrows or enc["cellsize"] != paso:
+                    raise ValueError(f"{archivo.name} no tiene la misma rejilla que {archivos[0].name}")
+                nodata = enc.get("nodata_value")
+                # La primera fila del archivo es la del norte
+                for r, linea in enumerate(f):
+                    if r >= nrows:
+                        break
+                    valores = [float(v) for v in linea.split()]
+                    fila = [math.nan if v == nodata else v * factor for v in valores]
+                    escritura.ghi[nrows - 1 - r, :, t] = fila
+        return escritura
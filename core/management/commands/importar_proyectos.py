@@ -0,0 +1,62 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.proyectos_jsonl import ImportadorProyectos, abrir
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa proyectos desde JSON Lines de exportar_proyectos. Cada proyecto se crea "
+        "con ids nuevos; usuario y catálogos se buscan por llave natural (correo, no, "
+        "id_modulo, marca+modelo, id_conductor). Las líneas que no se pueden resolver se omiten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("entrada", type=str, help='Archivo .jsonl / .jsonl.gz, o "-" para stdin.')
+        parser.add_argument(
+            "--usuario",
+            type=str,
+            default="",
+            help="Correo del dueño para proyectos cuyo usuario no existe en esta BD."
+        )
+        parser.add_argument("--chunk", type=int, default=500, help="Proyectos por transacción (default 500).")
+
+    def handle(self, *args, **options):
+        entrada = options["entrada"]
+        if entrada != "-" and not Path(entrada).exists():
+            raise CommandError(f"No se encontró: {entrada}")
+
+        importador = ImportadorProyectos(usuario_defecto=options["usuario"])
+        chunk = max(1, options["chunk"])
+        inicio = time.perf_counter()
+
+        lote = []
+        with abrir(entrada, "r") as f:
+            for linea, texto in enumerate(f, start=1):
+                if not texto.strip():
+                    continue
+                try:
+                    lote.append((linea, json.loads(texto)))
+                except json.JSONDecodeError as e:
+                    importador.omitidos.append((linea, f"JSON inválido: {e}"))
+                    continue
+                if len(lote) >= chunk:
+                    importador.cargar(lote)
+                    lote = []
+                    self.stdout.write(f"... {importador.creados} proyectos")
+            if lote:
+                importador.cargar(lote)
+
+        for linea, motivo in sorted(importador.omitidos)[:50]:
+            self.stdout.write(self.style.WARNING(f"[Línea {linea}] {motivo}"))
+        if len(importador.omitidos) > 50:
+            self.stdout.write(self.style.WARNING(f"... y {len(importador.omitidos) - 50} más"))
+
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Proyectos importados: {importador.creados} | Omitidos: {len(importador.omitidos)} | "
+            f"{segundos:.1f} s ({importador.creados / max(segundos, 1e-9) * 60:.0f} por minuto)"
+        ))
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import LoginLock
+
+
+class Command(BaseCommand):
+    help = "Elimina filas de LoginLock sin bloqueo vigente (vencidas o sin fecha de bloqueo)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horas", type=int, default=24, help="Antigüedad mínima del bloqueo vencido (default 24).")
+        parser.add_argument("--batch", type=int, default=1000, help="Filas por lote de borrado.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo cuenta, no borra.")
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(hours=options["horas"])
+        batch = max(1, options["batch"])
+
+        qs = LoginLock.objects.filter(Q(locked_until__isnull=True) | Q(locked_until__lt=limite))
+        total = qs.count()
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"[dry-run] Filas a eliminar: {total}"))
+            return
+
+        borrados = 0
+        while True:
+            ids = list(qs.order_by("id").values_list("id", flat=True)[:batch])
+            if not ids:
+                break
+            n, _ = LoginLock.objects.filter(id__in=ids).delete()
+            borrados += n
+
+        self.stdout.write(self.style.SUCCESS(f"LoginLock limpiado. Filas eliminadas: {borrados}"))
@@ -0,0 +1,54 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Servidor local compatible con /recaptcha/api/siteverify para pruebas sin red. "
+        "Usar con SWGFV_RECAPTCHA_VERIFY_URL=http://127.0.0.1:<puerto>/siteverify"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency-ms", type=int, default=0, help="Retardo simulado por respuesta.")
+
+    def handle(self, *args, **options):
+        latency = max(0, options["latency_ms"]) / 1000.0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                data = parse_qs(self.rfile.read(length).decode("utf-8"))
+                token = (data.get("response") or [""])[0]
+                if latency:
+                    time.sleep(latency)
+
+                # Acepta cualquier token salvo "fail"
+                ok = bool(token) and token != "fail"
+                body = json.dumps({"success": ok} if ok else {"success": False, "error-codes": ["invalid-input-response"]})
+                payload = body.encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((options["host"], options["port"]), Handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"Stub reCAPTCHA en http://{options['host']}:{options['port']}/siteverify (Ctrl+C para salir)"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import GlosarioConcepto
+from core.utils.texto import clave_orden
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la clave de orden alfabético del glosario (sin acentos). "
+        "Solo escribe los conceptos cuya clave cambió; los IDs no se modifican."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa cuántos conceptos cambiarían."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Filas por UPDATE (default 500)."
+        )
+
+    def handle(self, *args, **options):
+        cambiados = []
+        total = 0
+        campos = GlosarioConcepto.objects.values_list("id", "nombre_concepto", "clave_orden")
+        for pk, nombre, actual in campos.iterator(chunk_size=2000):
+            total += 1
+            nueva = clave_orden(nombre)
+            if nueva != actual:
+                cambiados.append(GlosarioConcepto(id=pk, clave_orden=nueva))
+
+        if not total:
+            self.stdout.write(self.style.WARNING("No hay conceptos para reordenar."))
+            return
+
+        if cambiados and not options["dry_run"]:
+            with transaction.atomic():
+                GlosarioConcepto.objects.bulk_update(
+                    cambiados, ["clave_orden"], batch_size=options["batch_size"]
+                )
+
+        verbo = "Por actualizar" if options["dry_run"] else "Actualizados"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Orden del glosario al día. {verbo}: {len(cambiados)} | "
+                f"Sin cambios: {total - len(cambiados)} | Total: {total}"
+            )
+        )
@@ -0,0 +1,147 @@
+import time
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection as db_connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía los correos pendientes de email_outbox en lotes, reutilizando una sola "
+        "conexión SMTP por lote. Reintenta con backoff exponencial."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=50, help="Correos por lote (default 50).")
+        parser.add_argument("--max-attempts", type=int, default=5, help="Intentos antes de marcar FALLIDO.")
+        parser.add_argument("--backoff", type=int, default=60, help="Segundos base del backoff (se duplica por intento).")
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=600,
+            help="Segundos que un correo ENVIANDO queda reservado; si el worker muere se retoma después (default 600).",
+        )
+        parser.add_argument("--loop", action="store_true", help="Queda escuchando la outbox (worker).")
+        parser.add_argument("--interval", type=int, default=10, help="Segundos entre revisiones con --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            enviados, fallidos = self._procesar_lote(options)
+            if enviados or fallidos:
+                self.stdout.write(f"Outbox: enviados={enviados} reintentos/fallidos={fallidos}")
+
+            if not options["loop"]:
+                break
+            if not (enviados or fallidos):
+                time.sleep(max(1, options["interval"]))
+
+    def _backoff(self, attempts: int, base: int) -> timedelta:
+        # 1m, 2m, 4m, ... con tope de 1 h
+        return timedelta(seconds=min(base * (2 ** max(0, attempts - 1)), 3600))
+
+    def _reservar(self, options) -> list:
+        """
+        Toma un lote y lo deja ENVIANDO (con el intento ya contado) antes de enviar.
+        Se confirma de inmediato: si el worker muere a medio lote, los correos ya
+        enviados no vuelven a PENDIENTE y solo se retoman los ENVIANDO vencidos.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            qs = EmailOutbox.objects.filter(
+                Q(status=EmailOutbox.PENDIENTE) | Q(status=EmailOutbox.ENVIANDO),
+                next_attempt_at__lte=now,
+            ).order_by("id")
+            if db_connection.features.has_select_for_update_skip_locked:
+                # Varios workers pueden correr a la vez sin tomar el mismo correo
+                qs = qs.select_for_update(skip_locked=True)
+            ids = list(qs.values_list("id", flat=True)[: max(1, options["batch"])])
+            if not ids:
+                return []
+
+            EmailOutbox.objects.filter(id__in=ids).update(
+                status=EmailOutbox.ENVIANDO,
+                attempts=F("attempts") + 1,
+                last_attempt_at=now,
+                next_attempt_at=now + timedelta(seconds=max(1, options["lease"])),
+            )
+        lote = list(EmailOutbox.objects.filter(id__in=ids).order_by("id"))
+
+        # ENVIANDO vencido que ya agotó sus intentos: no se vuelve a mandar
+        agotados = [x.id for x in lote if x.attempts > options["max_attempts"]]
+        if agotados:
+            EmailOutbox.objects.filter(id__in=agotados).update(
+                status=EmailOutbox.FALLIDO,
+                last_error="El envío se interrumpió y se agotaron los intentos.",
+            )
+        return [x for x in lote if x.id not in agotados]
+
+    def _marcar_enviado(self, item):
+        # El cuerpo lleva el enlace de recuperación: no se guarda una vez enviado
+        EmailOutbox.objects.filter(id=item.id).update(
+            status=EmailOutbox.ENVIADO,
+            sent_at=timezone.now(),
+            last_error="",
+            body="",
+        )
+
+    def _marcar_error(self, item, error, options):
+        cambios = {"last_error": str(error)[:1000]}
+        if item.attempts >= options["max_attempts"]:
+            cambios["status"] = EmailOutbox.FALLIDO
+        else:
+            cambios["status"] = EmailOutbox.PENDIENTE
+            cambios["next_attempt_at"] = timezone.now() + self._backoff(item.attempts, options["backoff"])
+        EmailOutbox.objects.filter(id=item.id).update(**cambios)
+
+    def _procesar_lote(self, options):
+        lote = self._reservar(options)
+        if not lote:
+            return 0, 0
+
+        enviados = fallidos = 0
+        smtp = get_connection(fail_silently=False)
+        try:
+            smtp.open()
+        except Exception as e:
+            # No se pudo abrir la conexión: todo el lote se reintenta luego
+            for item in lote:
+                self._marcar_error(item, e, options)
+            return 0, len(lote)
+
+        try:
+            for item in lote:
+                msg = EmailMessage(
+                    item.subject,
+                    item.body,
+                    item.from_email or None,
+                    [item.to_email],
+                    connection=smtp,
+                )
+                try:
+                    try:
+                        msg.send()
+                    except SMTPServerDisconnected:
+                        # El servidor cerró la conexión: se reabre una vez
+                        smtp.close()
+                        smtp.open()
+                        msg.send()
+                except Exception as e:
+                    self._marcar_error(item, e, options)
+                    fallidos += 1
+                else:
+                    # Cada resultado se guarda al momento (autocommit), no al final del lote
+                    self._marcar_enviado(item)
+                    enviados += 1
+        finally:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+        return enviados, fallidos
@@ -1,11 +1,33 @@
 import csv
+import hashlib
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
 from core.models import TablaNOM
+from core.utils.imagenes import generar_derivados
+from core.utils.importacion import abrir_csv
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _sincronizar_archivo(origen: Path, destino: Path) -> bool:
+    """Copia origen -> destino solo si el contenido difiere. True si copió."""
+    if destino.exists():
+        if destino.stat().st_size == origen.stat().st_size and _sha256(destino) == _sha256(origen):
+            return False
+    shutil.copy2(origen, destino)
+    return True
 
 
 class Command(BaseCommand):
@@ -30,8 +52,15 @@ class Command(BaseCommand):
             default="media/tablas_nom",
             help="Ruta relativa a la carpeta media donde quedarán las imágenes usadas por ImageField."
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Hilos para comparar/copiar imágenes (default 4)."
+        )
 
     def handle(self, *args, **options):
+        inicio = time.perf_counter()
         csv_path = Path(settings.BASE_DIR) / options["file"]
         origen_dir = Path(settings.BASE_DIR) / options["origen"]
         destino_dir = Path(settings.BASE_DIR) / options["destino"]
@@ -44,12 +73,11 @@ class Command(BaseCommand):
 
         destino_dir.mkdir(parents=True, exist_ok=True)
 
-        actualizadas = 0
         omitidas = 0
         no_encontradas_bd = 0
         no_encontradas_archivo = 0
 
-        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        with abrir_csv(csv_path) as f:
             reader = csv.DictReader(f)
 
             columnas_esperadas = {"nombre_tabla", "notas", "nombre_imagen"}
@@ -62,6 +90,7 @@ class Command(BaseCommand):
                     f"Encontradas: {sorted(columnas_encontradas)}"
                 )
 
+            filas = []
             for row in reader:
                 nombre_tabla = (row.get("nombre_tabla") or "").strip()
                 nombre_imagen = (row.get("nombre_imagen") or "").strip()
@@ -69,41 +98,72 @@ class Command(BaseCommand):
                 if not nombre_tabla or not nombre_imagen:
                     omitidas += 1
                     continue
+                filas.append((nombre_tabla, nombre_imagen))
+
+        # Una sola consulta para todas las tablas del CSV
+        tablas = TablaNOM.objects.in_bulk([n for n, _ in filas], field_name="nombre_tabla")
+
+        pendientes = []  # (tabla, nombre_imagen)
+        for nombre_tabla, nombre_imagen in filas:
+            tabla = tablas.get(nombre_tabla)
+            if not tabla:
+                no_encontradas_bd += 1
+                self.stdout.write(
+                    self.style.WARNING(f"[BD] No encontrada: {nombre_tabla}")
+                )
+                continue
 
-                tabla = TablaNOM.objects.filter(nombre_tabla=nombre_tabla).first()
-                if not tabla:
-                    no_encontradas_bd += 1
-                    self.stdout.write(
-                        self.style.WARNING(f"[BD] No encontrada: {nombre_tabla}")
-                    )
-                    continue
-
-                origen = origen_dir / nombre_imagen
-                if not origen.exists():
-                    no_encontradas_archivo += 1
-                    self.stdout.write(
-                        self.style.WARNING(f"[IMG] No encontrada: {origen}")
-                    )
-                    continue
-
-                destino = destino_dir / nombre_imagen
-
-                # Copiar imagen a media/tablas_nom
-                shutil.copy2(origen, destino)
-
+            origen = origen_dir / nombre_imagen
+            if not origen.exists():
+                no_encontradas_archivo += 1
+                self.stdout.write(
+                    self.style.WARNING(f"[IMG] No encontrada: {origen}")
+                )
+                continue
+
+            pendientes.append((tabla, nombre_imagen))
+
+        # Copiar a media/tablas_nom solo los archivos cuyo contenido cambió
+        archivos = sorted({nombre_imagen for _, nombre_imagen in pendientes})
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            copiados = dict(zip(
+                archivos,
+                pool.map(lambda n: _sincronizar_archivo(origen_dir / n, destino_dir / n), archivos),
+            ))
+
+        por_actualizar = []
+        por_derivar = []
+        for tabla, nombre_imagen in pendientes:
+            nombre = f"tablas_nom/{nombre_imagen}"
+            cambio_nombre = tabla.imagen.name != nombre
+            if cambio_nombre:
                 # Guardar ruta relativa en ImageField
-                tabla.imagen.name = f"tablas_nom/{nombre_imagen}"
-                tabla.save(update_fields=["imagen"])
-
-                actualizadas += 1
-                self.stdout.write(self.style.SUCCESS(
-                    f"[OK] {tabla.id} -> tablas_nom/{nombre_imagen}"
-                ))
+                tabla.imagen.name = nombre
+                por_actualizar.append(tabla)
+                self.stdout.write(self.style.SUCCESS(f"[OK] {tabla.id} -> {nombre}"))
+            if cambio_nombre or copiados[nombre_imagen] or not tabla.imagen_web:
+                por_derivar.append(tabla)
+
+        if por_actualizar:
+            TablaNOM.objects.bulk_update(por_actualizar, ["imagen"])
+
+        errores_derivados = 0
+        for tabla in por_derivar:
+            try:
+                generar_derivados(tabla)
+            except Exception as e:
+                errores_derivados += 1
+                self.stdout.write(self.style.WARNING(f"[DERIVADOS] {tabla.id}: {e}"))
 
         self.stdout.write(self.style.SUCCESS(
             f"Sincronización terminada. "
-            f"Actualizadas: {actualizadas} | "
+            f"Actualizadas: {len(por_actualizar)} | "
+            f"Archivos copiados: {sum(copiados.values())} | "
+            f"Sin cambios: {len(pendientes) - len(por_actualizar)} | "
             f"Omitidas: {omitidas} | "
             f"No encontradas en BD: {no_encontradas_bd} | "
             f"No encontradas en carpeta: {no_encontradas_archivo}"
-        ))
\ No newline at end of file
+        ))
+        if errores_derivados:
+            self.stdout.write(self.style.WARNING(f"Derivados con error: {errores_derivados}"))
+        self.stdout.write(f"Tiempo: {(time.perf_counter() - inicio) * 1000:.0f} ms")
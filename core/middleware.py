@@ -1,41 +1,146 @@
 # core/middleware.py
 from datetime import timedelta
+import time
+from django.conf import settings
+from django.core import signing
+from django.db import connection
 from django.shortcuts import redirect
 from django.utils import timezone
 
+from core import perf
+from core.audit_buffer import audit_buffer
+
 class SessionIdleTimeoutMiddleware:
     """
     Cierra la sesión si NO hay actividad (requests) por más de IDLE_MINUTES.
+
+    La marca de actividad solo se reescribe cuando avanzó más de
+    SWGFV_SESSION_ACTIVITY_GRANULARITY segundos, así una navegación normal
+    no genera un UPDATE en django_session por cada request.
+    Con SWGFV_IDLE_TRACKING = "cookie" la marca vive en una cookie firmada
+    (ligada a la sesión) y las peticiones de solo lectura no escriben sesión.
+    Sin cookie válida (primera petición, cookie borrada o de otra sesión)
+    vale la marca guardada en la sesión: borrar la cookie no desactiva el
+    cierre por inactividad.
     """
     IDLE_MINUTES = 10
     SESSION_KEY = "last_activity"
+    COOKIE_NAME = "swgfv_last_activity"
+    COOKIE_SALT = "swgfv.idle"
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.granularity = int(getattr(settings, "SWGFV_SESSION_ACTIVITY_GRANULARITY", 60))
+        self.use_cookie = getattr(settings, "SWGFV_IDLE_TRACKING", "session") == "cookie"
+
+    def _parse(self, value, now):
+        if not value:
+            return None
+        try:
+            last_dt = timezone.datetime.fromisoformat(value)
+            if timezone.is_naive(last_dt):
+                last_dt = timezone.make_aware(last_dt, timezone.get_current_timezone())
+            return last_dt
+        except Exception:
+            return now
+
+    def _last_from_cookie(self, request, now):
+        try:
+            raw = request.get_signed_cookie(self.COOKIE_NAME, salt=self.COOKIE_SALT)
+        except (KeyError, signing.BadSignature):
+            return None
+        session_key, _, stamp = raw.partition("|")
+        # Cookie de otra sesión (p. ej. tras cerrar sesión): se ignora
+        if session_key != (request.session.session_key or ""):
+            return None
+        return self._parse(stamp, now)
 
     def __call__(self, request):
         # Solo aplica si hay sesión iniciada en tu sistema
-        if request.session.get("usuario") and request.session.get("tipo"):
-            now = timezone.now()
-            last = request.session.get(self.SESSION_KEY)
-
-            if last:
-                try:
-                    last_dt = timezone.datetime.fromisoformat(last)
-                    if timezone.is_naive(last_dt):
-                        last_dt = timezone.make_aware(last_dt, timezone.get_current_timezone())
-                except Exception:
-                    last_dt = now
-            else:
-                last_dt = now
-
-            if now - last_dt > timedelta(minutes=self.IDLE_MINUTES):
-                # Cerrar sesión por inactividad
-                request.session.flush()
-                return redirect("core:login")
-
-            # Actualiza actividad
+        if not (request.session.get("usuario") and request.session.get("tipo")):
+            return self.get_response(request)
+
+        now = timezone.now()
+        last_dt = self._last_from_cookie(request, now) if self.use_cookie else None
+        desde_sesion = last_dt is None
+        if desde_sesion:
+            last_dt = self._parse(request.session.get(self.SESSION_KEY), now)
+
+        if last_dt and now - last_dt > timedelta(minutes=self.IDLE_MINUTES):
+            # Cerrar sesión por inactividad
+            request.session.flush()
+            response = redirect("core:login")
+            if self.use_cookie:
+                response.delete_cookie(self.COOKIE_NAME)
+            return response
+
+        # Actualiza actividad solo si avanzó más que la granularidad
+        stale = last_dt is None or (now - last_dt).total_seconds() >= self.granularity
+
+        if stale and desde_sesion:
             request.session[self.SESSION_KEY] = now.isoformat()
             request.session.modified = True
 
-        return self.get_response(request)
+        response = self.get_response(request)
+
+        if (stale or desde_sesion) and self.use_cookie and request.session.session_key:
+            response.set_signed_cookie(
+                self.COOKIE_NAME,
+                f"{request.session.session_key}|{now.isoformat()}",
+                salt=self.COOKIE_SALT,
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
+
+
+class AuditFlushMiddleware:
+    """
+    Escribe en lote (bulk_create) los eventos de bitácora acumulados
+    durante el request. Con SWGFV_AUDIT_ASYNC los escribe el hilo del buffer.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            if not audit_buffer.async_mode:
+                audit_buffer.flush()
+
+
+class PerfMiddleware:
+    """
+    Mide cada request (consultas, tiempo de BD, templates, PDF y total),
+    agrega el header Server-Timing y acumula las ventanas por URL que
+    muestra el tablero de rendimiento (core.perf).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "SWGFV_PERF_ENABLED", True)
+        if self.enabled:
+            perf.patch_template_render()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = perf.start()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(perf.db_wrapper):
+                response = self.get_response(request)
+        finally:
+            perf.stop()
+
+        total = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        url_name = (match.view_name if match else "") or "(sin ruta)"
+
+        perf.record(url_name, stats, total)
+        response["Server-Timing"] = perf.server_timing(stats, total)
+        return response
@@ -0,0 +1,68 @@
+from datetime import date
+
+from django.db import migrations, models
+
+
+def _add_months(d, n):
+    m = d.month - 1 + n
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def particionar_audit_logs(apps, schema_editor):
+    """
+    Solo PostgreSQL: convierte audit_logs en tabla particionada por mes
+    (RANGE sobre created_at). La PK pasa a (id, created_at), requisito de
+    PostgreSQL; para Django id sigue siendo la llave.
+    """
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql":
+        return
+
+    with conn.cursor() as c:
+        c.execute("SELECT relkind FROM pg_class WHERE relname = 'audit_logs'")
+        row = c.fetchone()
+        if not row or row[0] == "p":
+            return
+
+        c.execute("SELECT date_trunc('month', MIN(created_at))::date, MAX(id) FROM audit_logs")
+        min_mes, max_id = c.fetchone()
+
+        c.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old")
+        c.execute(
+            "CREATE TABLE audit_logs (LIKE audit_logs_old INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        c.execute("CREATE SEQUENCE audit_logs_part_id_seq OWNED BY audit_logs.id")
+        c.execute("ALTER TABLE audit_logs ALTER COLUMN id SET DEFAULT nextval('audit_logs_part_id_seq')")
+        c.execute("ALTER TABLE audit_logs ADD PRIMARY KEY (id, created_at)")
+
+        mes = (min_mes or date.today()).replace(day=1)
+        ultimo = _add_months(date.today().replace(day=1), 3)
+        while mes <= ultimo:
+            fin = _add_months(mes, 1)
+            c.execute(
+                f"CREATE TABLE audit_logs_p{mes.year:04d}_{mes.month:02d} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{fin.isoformat()}')"
+            )
+            mes = fin
+        c.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+        c.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_old")
+        if max_id:
+            c.execute("SELECT setval('audit_logs_part_id_seq', %s, true)", [max_id])
+        c.execute("DROP TABLE audit_logs_old")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_email_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar_audit_logs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-created_at', '-id'], name='audit_logs_created_idx'),
+        ),
+    ]
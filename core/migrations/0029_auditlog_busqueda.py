@@ -0,0 +1,73 @@
+from django.db import migrations
+
+SEARCH_COLUMNS = ["action", "actor_email", "actor_tipo", "message", "target_model", "target_id"]
+
+PG_VECTOR = (
+    "to_tsvector('spanish', "
+    + " || ' ' || ".join(f"coalesce({c}, '')" for c in SEARCH_COLUMNS)
+    + ")"
+)
+
+
+def crear_indice_texto(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as c:
+        if conn.vendor == "postgresql":
+            c.execute(f"CREATE INDEX IF NOT EXISTS audit_logs_search_idx ON audit_logs USING GIN ({PG_VECTOR})")
+            return
+
+        if conn.vendor != "sqlite":
+            return
+        try:
+            c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs__fts_check USING fts5(x)")
+            c.execute("DROP TABLE audit_logs__fts_check")
+        except Exception:
+            # SQLite sin FTS5: la búsqueda usa icontains
+            return
+
+        # Si una migración posterior reconstruye la tabla (SQLite lo hace en
+        # casi cualquier AlterField) los triggers se pierden; post_migrate los
+        # vuelve a crear (core/utils/fts_sqlite.py, mismas definiciones)
+        cols = ", ".join(SEARCH_COLUMNS)
+        new_cols = ", ".join(f"new.{x}" for x in SEARCH_COLUMNS)
+        old_cols = ", ".join(f"old.{x}" for x in SEARCH_COLUMNS)
+        c.execute(
+            f"CREATE VIRTUAL TABLE audit_logs_fts USING fts5({cols}, "
+            f"content='audit_logs', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        c.execute(
+            f"CREATE TRIGGER audit_logs_fts_ai AFTER INSERT ON audit_logs BEGIN "
+            f"INSERT INTO audit_logs_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        c.execute(
+            f"CREATE TRIGGER audit_logs_fts_ad AFTER DELETE ON audit_logs BEGIN "
+            f"INSERT INTO audit_logs_fts(audit_logs_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+        )
+        c.execute(
+            f"CREATE TRIGGER audit_logs_fts_au AFTER UPDATE ON audit_logs BEGIN "
+            f"INSERT INTO audit_logs_fts(audit_logs_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO audit_logs_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        c.execute("INSERT INTO audit_logs_fts(audit_logs_fts) VALUES ('rebuild')")
+
+
+def borrar_indice_texto(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as c:
+        if conn.vendor == "postgresql":
+            c.execute("DROP INDEX IF EXISTS audit_logs_search_idx")
+        elif conn.vendor == "sqlite":
+            for trg in ("audit_logs_fts_ai", "audit_logs_fts_ad", "audit_logs_fts_au"):
+                c.execute(f"DROP TRIGGER IF EXISTS {trg}")
+            c.execute("DROP TABLE IF EXISTS audit_logs_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_auditlog_particiones'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_texto, borrar_indice_texto),
+    ]
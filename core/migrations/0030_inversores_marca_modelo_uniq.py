@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+def fusionar_duplicados(apps, schema_editor):
+    """
+    Antes de la restricción única: si hay (marca, modelo) repetidos se
+    conserva el id menor y las referencias de los demás se mueven a él.
+    """
+    for nombre in ("Inversor", "MicroInversor"):
+        Modelo = apps.get_model("core", nombre)
+        vistos = {}
+        duplicados = {}
+        for pk, marca, modelo in Modelo.objects.order_by("id").values_list("id", "marca", "modelo"):
+            llave = (marca, modelo)
+            if llave in vistos:
+                duplicados[pk] = vistos[llave]
+            else:
+                vistos[llave] = pk
+
+        if not duplicados:
+            continue
+
+        for rel in Modelo._meta.related_objects:
+            if rel.many_to_many:
+                continue
+            for viejo, nuevo in duplicados.items():
+                rel.related_model.objects.filter(**{rel.field.name: viejo}).update(**{rel.field.name: nuevo})
+
+        Modelo.objects.filter(id__in=list(duplicados)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_auditlog_busqueda'),
+    ]
+
+    operations = [
+        migrations.RunPython(fusionar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='inversor',
+            constraint=models.UniqueConstraint(fields=('marca', 'modelo'), name='inversores_marca_modelo_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='microinversor',
+            constraint=models.UniqueConstraint(fields=('marca', 'modelo'), name='micro_inversores_marca_modelo_uniq'),
+        ),
+    ]
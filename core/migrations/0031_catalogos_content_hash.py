@@ -0,0 +1,130 @@
+# Generated by Django 4.2.27 on 2026-10-18 23:45
+
+import hashlib
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# Campos que controla cada CSV (llave + campos actualizables), como en
+# core/utils/catalogos_csv.py al momento de esta migración
+CAMPOS_HASH = {
+    "Irradiancia": ["no", "tarifa", "region", "estado", "ciudad", "ene", "feb", "mar", "abr", "may", "jun",
+                    "jul", "ago", "sep", "oct", "nov", "dic", "promedio"],
+    "PanelSolar": ["id_modulo", "marca", "modelo", "potencia", "voc", "isc", "vmp", "imp"],
+    "Inversor": ["marca", "modelo", "potencia", "corriente_entrada", "corriente_salida", "voltaje_arranque",
+                 "voltaje_maximo_entrada", "no_mppt", "no_fases", "voltaje_nominal"],
+    "MicroInversor": ["marca", "modelo", "potencia", "corriente_entrada", "corriente_salida", "voltaje_arranque",
+                      "voltaje_maximo_entrada", "no_mppt", "no_fases", "voltaje_nominal"],
+    "Conductor": ["id_conductor", "calibre_cable", "tubo_1_2_pulgada", "tubo_3_4_pulgada", "tubo_1_pulgada",
+                  "tubo_1_1_4_pulgada", "tubo_1_1_2_pulgada", "tubo_2_pulgada", "tubo_2_1_2_pulgada"],
+    "TablaConductoresAWGConReactancia": ["calibre_awg", "area_transversal", "resistencia_cc", "resistencia_ca",
+                                         "reactancia"],
+    "GlosarioConcepto": ["nombre_concepto", "descripcion", "formula", "categoria"],
+    "TablaNOM": ["nombre_tabla", "notas"],
+}
+
+
+
+# Copia de formato_hash/hash_fila (core/utils/importacion.py) al momento de
+# esta migración: un cambio posterior en el helper no altera lo que hace
+def formato_hash(modelo, campos: list) -> list:
+    return [(c, getattr(modelo._meta.get_field(c), "decimal_places", None)) for c in campos]
+
+
+def hash_fila(formato: list, fila: dict) -> str:
+    partes = []
+    for campo, dp in formato:
+        v = fila.get(campo)
+        if v is None or v == "":
+            partes.append("")
+        elif dp is not None:
+            partes.append(format(Decimal(str(v)).quantize(Decimal(1).scaleb(-dp)), "f"))
+        else:
+            partes.append(str(v))
+    return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+
+def calcular_hashes(apps, schema_editor):
+    for nombre, campos in CAMPOS_HASH.items():
+        Modelo = apps.get_model("core", nombre)
+        formato = formato_hash(Modelo, campos)
+        lote = []
+        for obj in Modelo.objects.only(*campos).iterator(chunk_size=2000):
+            obj.content_hash = hash_fila(formato, {c: getattr(obj, c) for c in campos})
+            lote.append(obj)
+            if len(lote) >= 1000:
+                Modelo.objects.bulk_update(lote, ["content_hash"])
+                lote = []
+        if lote:
+            Modelo.objects.bulk_update(lote, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_inversores_marca_modelo_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conductor',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='glosarioconcepto',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='inversor',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='irradiancia',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='microinversor',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='panelsolar',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='tablaconductoresawgconreactancia',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='tablanom',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalogo', models.CharField(max_length=50)),
+                ('version', models.PositiveIntegerField()),
+                ('origen', models.CharField(blank=True, default='', max_length=255)),
+                ('filas', models.PositiveIntegerField(default=0)),
+                ('nuevos', models.PositiveIntegerField(default=0)),
+                ('cambiados', models.PositiveIntegerField(default=0)),
+                ('eliminados', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'catalog_versions',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['catalogo', '-version'], name='catalog_versions_cat_idx')],
+            },
+        ),
+        migrations.RunPython(calcular_hashes, migrations.RunPython.noop),
+    ]
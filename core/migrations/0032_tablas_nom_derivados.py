@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_catalogos_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablanom',
+            name='imagen_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tablanom',
+            name='imagen_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='tablanom',
+            name='imagen_miniatura',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='tablas_nom/derivados/'),
+        ),
+        migrations.AddField(
+            model_name='tablanom',
+            name='imagen_web',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='tablas_nom/derivados/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_tablas_nom_derivados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='numeropaneles',
+            name='malla_irradiancia',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
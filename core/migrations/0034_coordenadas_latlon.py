@@ -0,0 +1,158 @@
+# Generated by Django 4.2.27 on 2026-10-18 23:56
+
+import hashlib
+import re
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Copia de core/utils/geo.parsear_coordenadas al momento de esta migración
+_COORDENADAS_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def parsear_coordenadas(texto: str):
+    m = _COORDENADAS_RE.match(texto or "")
+    if not m:
+        return None
+    lat, lon = float(m.group(1)), float(m.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def llenar_latlon(apps, schema_editor):
+    Proyecto = apps.get_model("core", "Proyecto")
+    lote = []
+    for p in Proyecto.objects.only("id", "Coordenadas").iterator(chunk_size=2000):
+        coords = parsear_coordenadas(p.Coordenadas)
+        if not coords:
+            continue
+        p.latitud, p.longitud = round(coords[0], 6), round(coords[1], 6)
+        lote.append(p)
+        if len(lote) >= 1000:
+            Proyecto.objects.bulk_update(lote, ["latitud", "longitud"])
+            lote = []
+    if lote:
+        Proyecto.objects.bulk_update(lote, ["latitud", "longitud"])
+
+
+# Coordenadas de data/irradiancia.csv (columnas Latitud/Longitud) para que la
+# sugerencia de sitio funcione sin volver a correr import_irradiancia
+SITIOS_IRRADIANCIA = [
+    # (no, ciudad, latitud, longitud)
+    (1, "Aguascalientes", 21.88, -102.29),
+    (2, "Tijuana", 32.51, -117.04),
+    (3, "Mexicali", 32.62, -115.45),
+    (4, "La Paz", 24.14, -110.31),
+    (5, "Campeche", 19.85, -90.53),
+    (6, "Tuxtla Gutiérrez", 16.75, -93.12),
+    (7, "Juárez", 31.69, -106.42),
+    (8, "Chihuahua", 28.63, -106.07),
+    (9, "Saltillo", 25.42, -101.00),
+    (10, "Torreón", 25.54, -103.41),
+    (11, "Colima", 19.24, -103.72),
+    (12, "Ciudad de México", 19.43, -99.13),
+    (13, "Durango", 24.02, -104.65),
+    (14, "Toluca", 19.29, -99.66),
+    (15, "León", 21.12, -101.68),
+    (16, "Guanajuato", 21.02, -101.26),
+    (17, "Acapulco", 16.85, -99.82),
+    (18, "Chilpancingo", 17.55, -99.50),
+    (19, "Pachuca", 20.10, -98.76),
+    (20, "Guadalajara", 20.67, -103.35),
+    (21, "Morelia", 19.70, -101.19),
+    (22, "Cuernavaca", 18.92, -99.23),
+    (23, "Tepic", 21.50, -104.89),
+    (24, "Monterrey", 25.69, -100.32),
+    (25, "Guadalupe", 25.68, -100.26),
+    (26, "Oaxaca", 17.07, -96.73),
+    (27, "Puebla", 19.04, -98.21),
+    (28, "Querétaro", 20.59, -100.39),
+    (29, "Cancún", 21.16, -86.85),
+    (30, "Chetumal", 18.50, -88.30),
+    (31, "San Luis Potosí", 22.16, -100.98),
+    (32, "Culiacán", 24.81, -107.39),
+    (33, "Hermosillo", 29.07, -110.96),
+    (34, "Villahermosa", 17.99, -92.93),
+    (35, "Reynosa", 26.09, -98.28),
+    (36, "Ciudad Victoria", 23.74, -99.15),
+    (37, "Tlaxcala", 19.32, -98.24),
+    (38, "Xalapa", 19.54, -96.91),
+    (39, "Mérida", 20.97, -89.62),
+    (40, "Zacatecas", 22.77, -102.58),
+]
+
+
+# content_hash de Irradiancia con las columnas de ubicación (mismo cálculo que
+# hash_fila de core/utils/importacion.py al momento de esta migración): así la
+# siguiente importación del mismo CSV no reescribe las 40 filas
+CAMPOS_HASH_IRRADIANCIA = [
+    ("no", None), ("tarifa", None), ("region", None), ("estado", None), ("ciudad", None),
+    ("ene", 2), ("feb", 2), ("mar", 2), ("abr", 2), ("may", 2), ("jun", 2),
+    ("jul", 2), ("ago", 2), ("sep", 2), ("oct", 2), ("nov", 2), ("dic", 2),
+    ("promedio", 2), ("latitud", 6), ("longitud", 6),
+]
+
+
+def _hash_irradiancia(obj) -> str:
+    partes = []
+    for campo, dp in CAMPOS_HASH_IRRADIANCIA:
+        v = getattr(obj, campo)
+        if v is None or v == "":
+            partes.append("")
+        elif dp is not None:
+            partes.append(format(Decimal(str(v)).quantize(Decimal(1).scaleb(-dp)), "f"))
+        else:
+            partes.append(str(v))
+    return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+
+def llenar_latlon_irradiancia(apps, schema_editor):
+    Irradiancia = apps.get_model("core", "Irradiancia")
+    por_no = {no: (ciudad, lat, lon) for no, ciudad, lat, lon in SITIOS_IRRADIANCIA}
+    lote = []
+    for i in Irradiancia.objects.filter(latitud__isnull=True):
+        sitio = por_no.get(i.no)
+        # Solo si el número corresponde a la misma ciudad del CSV
+        if not sitio or sitio[0].casefold() != (i.ciudad or "").strip().casefold():
+            continue
+        i.latitud, i.longitud = Decimal(str(sitio[1])), Decimal(str(sitio[2]))
+        i.content_hash = _hash_irradiancia(i)
+        lote.append(i)
+    Irradiancia.objects.bulk_update(lote, ["latitud", "longitud", "content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_numero_paneles_malla'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='irradiancia',
+            name='latitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='irradiancia',
+            name='longitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='latitud',
+            field=models.DecimalField(blank=True, decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='longitud',
+            field=models.DecimalField(blank=True, decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['latitud', 'longitud'], name='proyectos_latlon_idx'),
+        ),
+        migrations.RunPython(llenar_latlon, migrations.RunPython.noop),
+        migrations.RunPython(llenar_latlon_irradiancia, migrations.RunPython.noop),
+    ]
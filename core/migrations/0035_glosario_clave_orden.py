@@ -0,0 +1,54 @@
+# Generated by Django 4.2.27 on 2026-10-19 00:00
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Copia de core/utils/texto.clave_orden al momento de esta migración
+_NO_ALNUM_RE = re.compile(r"[^0-9a-z{]+")
+
+
+def clave_orden(texto: str) -> str:
+    s = unicodedata.normalize("NFC", (texto or "").casefold()).replace("ñ", "n{")
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = _NO_ALNUM_RE.sub(" ", s).strip()
+    return s.encode("ascii", "ignore").hex()[:254]
+
+
+def llenar_clave_orden(apps, schema_editor):
+    GlosarioConcepto = apps.get_model("core", "GlosarioConcepto")
+    lote = []
+    for c in GlosarioConcepto.objects.only("id", "nombre_concepto").iterator(chunk_size=2000):
+        c.clave_orden = clave_orden(c.nombre_concepto)
+        lote.append(c)
+        if len(lote) >= 1000:
+            GlosarioConcepto.objects.bulk_update(lote, ["clave_orden"])
+            lote = []
+    if lote:
+        GlosarioConcepto.objects.bulk_update(lote, ["clave_orden"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_coordenadas_latlon'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='glosarioconcepto',
+            options={'ordering': ['clave_orden', 'nombre_concepto'], 'verbose_name': 'Concepto del glosario', 'verbose_name_plural': 'Conceptos del glosario'},
+        ),
+        migrations.AddField(
+            model_name='glosarioconcepto',
+            name='clave_orden',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='glosarioconcepto',
+            index=models.Index(fields=['clave_orden', 'nombre_concepto'], name='glosario_orden_idx'),
+        ),
+        migrations.RunPython(llenar_clave_orden, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+from django.db import migrations, transaction
+
+# Misma definición que core/utils/tablas_busqueda.py (el nombre pesa más que las notas)
+PG_CONFIG = "swgfv_es"
+PG_VECTOR = (
+    f"setweight(to_tsvector('{PG_CONFIG}'::regconfig, coalesce(nombre_tabla, '')), 'A') || "
+    f"setweight(to_tsvector('{PG_CONFIG}'::regconfig, coalesce(notas, '')), 'B')"
+)
+
+
+def _config_postgresql(conn, c):
+    # Configuración "spanish" que además quita acentos; con la forma de dos
+    # argumentos to_tsvector es IMMUTABLE y se puede indexar
+    c.execute(f"SELECT 1 FROM pg_ts_config WHERE cfgname = '{PG_CONFIG}'")
+    if c.fetchone():
+        return
+    c.execute(f"CREATE TEXT SEARCH CONFIGURATION {PG_CONFIG} (COPY = spanish)")
+    try:
+        with transaction.atomic(using=conn.alias):
+            c.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+            c.execute(
+                f"ALTER TEXT SEARCH CONFIGURATION {PG_CONFIG} "
+                f"ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem"
+            )
+    except Exception:
+        # Sin permiso para la extensión: la búsqueda funciona, pero sensible a acentos
+        pass
+
+
+def crear_indice_texto(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as c:
+        if conn.vendor == "postgresql":
+            _config_postgresql(conn, c)
+            c.execute(f"CREATE INDEX IF NOT EXISTS tablas_nom_search_idx ON tablas_nom USING GIN (({PG_VECTOR}))")
+            return
+
+        if conn.vendor != "sqlite":
+            return
+        try:
+            c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tablas_nom__fts_check USING fts5(x)")
+            c.execute("DROP TABLE tablas_nom__fts_check")
+        except Exception:
+            # SQLite sin FTS5: la búsqueda usa icontains
+            return
+
+        # Si una migración posterior reconstruye la tabla (SQLite lo hace en
+        # casi cualquier AlterField) los triggers se pierden; post_migrate los
+        # vuelve a crear (core/utils/fts_sqlite.py, mismas definiciones)
+        c.execute(
+            "CREATE VIRTUAL TABLE tablas_nom_fts USING fts5(nombre_tabla, notas, "
+            "content='tablas_nom', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        c.execute(
+            "CREATE TRIGGER tablas_nom_fts_ai AFTER INSERT ON tablas_nom BEGIN "
+            "INSERT INTO tablas_nom_fts(rowid, nombre_tabla, notas) VALUES (new.id, new.nombre_tabla, new.notas); END"
+        )
+        c.execute(
+            "CREATE TRIGGER tablas_nom_fts_ad AFTER DELETE ON tablas_nom BEGIN "
+            "INSERT INTO tablas_nom_fts(tablas_nom_fts, rowid, nombre_tabla, notas) "
+            "VALUES ('delete', old.id, old.nombre_tabla, old.notas); END"
+        )
+        # Solo cuando cambia el texto (no al guardar imagen, hash o derivados)
+        c.execute(
+            "CREATE TRIGGER tablas_nom_fts_au AFTER UPDATE OF nombre_tabla, notas ON tablas_nom BEGIN "
+            "INSERT INTO tablas_nom_fts(tablas_nom_fts, rowid, nombre_tabla, notas) "
+            "VALUES ('delete', old.id, old.nombre_tabla, old.notas); "
+            "INSERT INTO tablas_nom_fts(rowid, nombre_tabla, notas) VALUES (new.id, new.nombre_tabla, new.notas); END"
+        )
+        c.execute("INSERT INTO tablas_nom_fts(tablas_nom_fts) VALUES ('rebuild')")
+
+
+def borrar_indice_texto(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as c:
+        if conn.vendor == "postgresql":
+            c.execute("DROP INDEX IF EXISTS tablas_nom_search_idx")
+            c.execute(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {PG_CONFIG}")
+        elif conn.vendor == "sqlite":
+            for trg in ("tablas_nom_fts_ai", "tablas_nom_fts_ad", "tablas_nom_fts_au"):
+                c.execute(f"DROP TRIGGER IF EXISTS {trg}")
+            c.execute("DROP TABLE IF EXISTS tablas_nom_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_glosario_clave_orden'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_texto, borrar_indice_texto),
+    ]
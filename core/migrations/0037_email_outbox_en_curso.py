@@ -0,0 +1,30 @@
+# Generated by Django 4.2.27 on 2026-10-19 00:26
+
+from django.db import migrations, models
+
+
+def borrar_cuerpos_enviados(apps, schema_editor):
+    # El cuerpo lleva el enlace de recuperación; ya enviado no hace falta guardarlo
+    EmailOutbox = apps.get_model("core", "EmailOutbox")
+    EmailOutbox.objects.filter(status="ENVIADO").exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_tablas_nom_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='last_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='status',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ENVIANDO', 'Enviando'), ('ENVIADO', 'Enviado'), ('FALLIDO', 'Fallido')], default='PENDIENTE', max_length=10),
+        ),
+        migrations.RunPython(borrar_cuerpos_enviados, migrations.RunPython.noop),
+    ]
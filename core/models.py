@@ -3,6 +3,9 @@ from django.contrib.auth.hashers import make_password, check_password
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from core.utils.geo import parsear_coordenadas
+from core.utils.texto import CLAVE_ORDEN_MAX, clave_orden
+
 
 # =========================
 # MODELO USUARIO
@@ -62,12 +65,27 @@ class Proyecto(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(3)]
     )
 
+    # Derivadas de Coordenadas al guardar (sugerencia de irradiancia por cercanía)
+    latitud = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, editable=False)
+    longitud = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, editable=False)
+
     class Meta:
         db_table = "proyectos"
+        indexes = [
+            models.Index(fields=["latitud", "longitud"], name="proyectos_latlon_idx"),
+        ]
 
     def __str__(self):
         return self.Nombre_Proyecto
 
+    def save(self, *args, **kwargs):
+        coords = parsear_coordenadas(self.Coordenadas)
+        self.latitud, self.longitud = (round(coords[0], 6), round(coords[1], 6)) if coords else (None, None)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "Coordenadas" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "latitud", "longitud"}
+        super().save(*args, **kwargs)
+
 
 # =========================
 # BLOQUEO LOGIN (TABLA login_locks)
@@ -111,10 +129,82 @@ class AuditLog(models.Model):
     class Meta:
         db_table = "audit_logs"   # ✅ IMPORTANTE: coincide con tu tabla en Render
         ordering = ["-created_at"]
+        # En PostgreSQL la tabla está particionada por mes (migración 0028)
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="audit_logs_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.created_at} {self.actor_email} {self.action}"
 
+# =========================
+# OUTBOX DE CORREOS (TABLA email_outbox)
+# - El request solo inserta la fila; el envío lo hace send_outbox
+# =========================
+class EmailOutbox(models.Model):
+    PENDIENTE = "PENDIENTE"
+    ENVIANDO = "ENVIANDO"
+    ENVIADO = "ENVIADO"
+    FALLIDO = "FALLIDO"
+    STATUS_CHOICES = [
+        (PENDIENTE, "Pendiente"),
+        (ENVIANDO, "Enviando"),
+        (ENVIADO, "Enviado"),
+        (FALLIDO, "Fallido"),
+    ]
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    from_email = models.CharField(max_length=254, blank=True, default="")
+    to_email = models.CharField(max_length=254)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDIENTE)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "email_outbox"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="email_outbox_pend_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.status})"
+
+
+# =========================
+# [MODULO] VERSIONES DE CATÁLOGO
+# Una fila por importación (o edición) de cada catálogo.
+# `version` solo avanza cuando cambió el contenido.
+# =========================
+class CatalogVersion(models.Model):
+    catalogo = models.CharField(max_length=50)
+    version = models.PositiveIntegerField()
+    origen = models.CharField(max_length=255, blank=True, default="")
+
+    filas = models.PositiveIntegerField(default=0)
+    nuevos = models.PositiveIntegerField(default=0)
+    cambiados = models.PositiveIntegerField(default=0)
+    eliminados = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "catalog_versions"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["catalogo", "-version"], name="catalog_versions_cat_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.catalogo} v{self.version}"
+
 # =========================
 # [MODULO] IRRADIANCIA (CATÁLOGO)
 # Ruta: core/models.py
@@ -144,6 +234,12 @@ class Irradiancia(models.Model):
 
     promedio = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
 
+    # Ubicación del sitio (índice de cercanía en core/utils/catalogos.py)
+    latitud = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitud = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         verbose_name = "Irradiancia"
         verbose_name_plural = "Irradiancias"
@@ -171,6 +267,8 @@ class PanelSolar(models.Model):
     imp = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)       # A
 
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         verbose_name = "Panel Solar"
         verbose_name_plural = "Paneles Solares"
@@ -223,6 +321,10 @@ class NumeroPaneles(models.Model):
     eficiencia = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
     consumos = models.JSONField(default=dict, blank=True)
 
+    # Nombre de la malla de irradiancia (core/utils/irradiancia_malla.py) usada en
+    # las coordenadas del proyecto; vacío = se usa la fila de ciudad (irradiancia)
+    malla_irradiancia = models.CharField(max_length=100, blank=True, default="")
+
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
@@ -289,11 +391,17 @@ class Inversor(models.Model):
     no_fases = models.PositiveIntegerField(null=True, blank=True)
     voltaje_nominal = models.CharField(max_length=50, null=True, blank=True)  # ej. 127/220
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         verbose_name = "Inversor"
         verbose_name_plural = "Inversores"
         ordering = ["marca", "modelo"]
         db_table = "inversores"
+        # Llave natural del catálogo (upsert de los import_*)
+        constraints = [
+            models.UniqueConstraint(fields=["marca", "modelo"], name="inversores_marca_modelo_uniq"),
+        ]
 
     def __str__(self):
         return f"{self.marca} {self.modelo}"
@@ -317,11 +425,17 @@ class MicroInversor(models.Model):
     no_fases = models.PositiveIntegerField(null=True, blank=True)
     voltaje_nominal = models.CharField(max_length=50, null=True, blank=True)  # ej. 127/220
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         verbose_name = "Micro inversor"
         verbose_name_plural = "Micro inversores"
         ordering = ["marca", "modelo"]
         db_table = "micro_inversores"
+        # Llave natural del catálogo (upsert de los import_*)
+        constraints = [
+            models.UniqueConstraint(fields=["marca", "modelo"], name="micro_inversores_marca_modelo_uniq"),
+        ]
 
     def __str__(self):
         return f"{self.marca} {self.modelo}"
@@ -428,6 +542,8 @@ class Conductor(models.Model):
     tubo_2_pulgada = models.PositiveIntegerField(default=0, db_column="tubo_2_pulgada")
     tubo_2_1_2_pulgada = models.PositiveIntegerField(default=0, db_column="tubo_2_1/2_pulgada")
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         db_table = "conductores"
         ordering = ["id_conductor"]
@@ -649,6 +765,8 @@ class TablaConductoresAWGConReactancia(models.Model):
     resistencia_ca = models.DecimalField(max_digits=12, decimal_places=6, null=True, blank=True)
     reactancia = models.DecimalField(max_digits=12, decimal_places=6, null=True, blank=True)
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
     class Meta:
         db_table = "tabla_conductores_awg_con_reactancia"
         ordering = ["calibre_awg"]
@@ -775,15 +893,30 @@ class GlosarioConcepto(models.Model):
     categoria = models.CharField(max_length=100, blank=True, default="")
     created_at = models.DateTimeField(default=timezone.now)
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
+    # Orden alfabético sin acentos (core/utils/texto.clave_orden); se calcula al guardar
+    clave_orden = models.CharField(max_length=CLAVE_ORDEN_MAX, blank=True, default="", editable=False)
+
     class Meta:
         db_table = "glosario_conceptos"
-        ordering = ["nombre_concepto"]
+        ordering = ["clave_orden", "nombre_concepto"]
+        indexes = [
+            models.Index(fields=["clave_orden", "nombre_concepto"], name="glosario_orden_idx"),
+        ]
         verbose_name = "Concepto del glosario"
         verbose_name_plural = "Conceptos del glosario"
 
     def __str__(self):
         return self.nombre_concepto
 
+    def save(self, *args, **kwargs):
+        self.clave_orden = clave_orden(self.nombre_concepto)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "nombre_concepto" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "clave_orden"}
+        super().save(*args, **kwargs)
+
 # =========================================================
 # [MODULO] TABLAS NOM
 # Tabla: tablas_nom
@@ -794,6 +927,14 @@ class TablaNOM(models.Model):
     imagen = models.ImageField(upload_to="tablas_nom/", blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    content_hash = models.CharField(max_length=40, blank=True, default="", editable=False)  # importación delta
+
+    # Derivados de la imagen (core/utils/imagenes.py); nombres por hash del contenido
+    imagen_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    imagen_ancho = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    imagen_miniatura = models.ImageField(upload_to="tablas_nom/derivados/", blank=True, null=True, editable=False)
+    imagen_web = models.ImageField(upload_to="tablas_nom/derivados/", blank=True, null=True, editable=False)
+
     class Meta:
         db_table = "tablas_nom"
         ordering = ["nombre_tabla"]
@@ -0,0 +1,224 @@
+# core/perf.py
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# INSTRUMENTACIÓN POR REQUEST
+# - Consultas (número y tiempo), render de templates, generación de
+#   PDF y tiempo total, por nombre de URL
+# - Se exponen en el header Server-Timing (PerfMiddleware)
+# - Ventanas móviles por URL (últimos N requests) para el tablero
+# - Detección de N+1: la misma forma de SQL repetida más de N veces
+# =========================================================
+HIST_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+_current = contextvars.ContextVar("swgfv_perf", default=None)
+
+
+def _conf(name: str, default):
+    return getattr(settings, name, default)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db", "tpl", "pdf", "shapes", "_tpl_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.tpl = 0.0
+        self.pdf = 0.0
+        self.shapes = Counter()
+        self._tpl_depth = 0
+
+
+def start() -> RequestStats:
+    stats = RequestStats()
+    _current.set(stats)
+    return stats
+
+
+def stop():
+    _current.set(None)
+
+
+def add(kind: str, seconds: float):
+    """Suma tiempo a la categoría ("pdf", "tpl", ...) del request en curso."""
+    stats = _current.get()
+    if stats is not None:
+        setattr(stats, kind, getattr(stats, kind) + seconds)
+
+
+class timed:
+    """Context manager: with perf.timed("pdf"): ..."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        add(self.kind, time.perf_counter() - self._start)
+        return False
+
+
+# ---------------------------------------------------------
+# SQL
+# ---------------------------------------------------------
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def sql_shape(sql: str) -> str:
+    shape = _IN_LIST.sub("IN (...)", sql)
+    return _NUMBER.sub("?", shape)
+
+
+def db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db += time.perf_counter() - start
+        stats.queries += 1
+        stats.shapes[sql_shape(sql)] += 1
+
+
+# ---------------------------------------------------------
+# Templates: se mide el render del backend de Django (una vez por
+# render(); los {% include %} quedan dentro de ese tiempo)
+# ---------------------------------------------------------
+_templates_patched = False
+_patch_lock = threading.Lock()
+
+
+def patch_template_render():
+    global _templates_patched
+    with _patch_lock:
+        if _templates_patched:
+            return
+        from django.template.backends.django import Template
+
+        original = Template.render
+
+        def render(self, context=None, request=None):
+            stats = _current.get()
+            if stats is None:
+                return original(self, context, request)
+            stats._tpl_depth += 1
+            start = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                stats._tpl_depth -= 1
+                if stats._tpl_depth == 0:
+                    stats.tpl += time.perf_counter() - start
+
+        Template.render = render
+        _templates_patched = True
+
+
+# ---------------------------------------------------------
+# Agregados por URL (por proceso)
+# ---------------------------------------------------------
+_windows = {}
+_nplus1 = {}
+_agg_lock = threading.Lock()
+
+
+def nplus1_shapes(stats: RequestStats) -> list:
+    limite = int(_conf("SWGFV_PERF_NPLUS1_THRESHOLD", 10))
+    return [(shape, n) for shape, n in stats.shapes.most_common() if n > limite]
+
+
+def record(url_name: str, stats: RequestStats, total: float):
+    window = int(_conf("SWGFV_PERF_WINDOW", 500))
+    sospechosos = nplus1_shapes(stats)
+
+    with _agg_lock:
+        dq = _windows.get(url_name)
+        if dq is None or dq.maxlen != window:
+            dq = _windows[url_name] = deque(dq or (), maxlen=window)
+        dq.append((total, stats.db, stats.tpl, stats.pdf, stats.queries))
+
+        if sospechosos:
+            _nplus1[url_name] = {
+                "shape": sospechosos[0][0][:500],
+                "repeticiones": sospechosos[0][1],
+                "visto": time.time(),
+            }
+
+    if sospechosos:
+        logger.warning(
+            "Posible N+1 en %s: %s consultas con la misma forma: %s",
+            url_name, sospechosos[0][1], sospechosos[0][0][:200],
+        )
+
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.db * 1000:.1f};desc="{stats.queries} queries"',
+        f"tpl;dur={stats.tpl * 1000:.1f}",
+        f"pdf;dur={stats.pdf * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ])
+
+
+def _percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, int(round(p * (len(sorted_vals) - 1))))
+    return sorted_vals[k]
+
+
+def snapshot() -> list:
+    """Resumen por URL para el tablero: conteos, percentiles e histograma (ms)."""
+    with _agg_lock:
+        data = {k: list(v) for k, v in _windows.items()}
+        nplus1 = {k: dict(v) for k, v in _nplus1.items()}
+
+    out = []
+    for url_name, muestras in data.items():
+        n = len(muestras)
+        totales = sorted(m[0] * 1000 for m in muestras)
+        hist = [0] * (len(HIST_BUCKETS_MS) + 1)
+        for t in totales:
+            i = 0
+            while i < len(HIST_BUCKETS_MS) and t > HIST_BUCKETS_MS[i]:
+                i += 1
+            hist[i] += 1
+
+        out.append({
+            "url_name": url_name,
+            "n": n,
+            "p50": _percentile(totales, 0.50),
+            "p95": _percentile(totales, 0.95),
+            "max": totales[-1] if totales else 0.0,
+            "db_avg": sum(m[1] for m in muestras) * 1000 / n,
+            "tpl_avg": sum(m[2] for m in muestras) * 1000 / n,
+            "pdf_avg": sum(m[3] for m in muestras) * 1000 / n,
+            "queries_avg": sum(m[4] for m in muestras) / n,
+            "hist": hist,
+            "nplus1": nplus1.get(url_name),
+        })
+    out.sort(key=lambda r: r["p95"], reverse=True)
+    return out
+
+
+def hist_labels() -> list:
+    labels = [f"≤{b}" for b in HIST_BUCKETS_MS]
+    labels.append(f">{HIST_BUCKETS_MS[-1]}")
+    return labels
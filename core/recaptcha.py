@@ -0,0 +1,169 @@
+# core/recaptcha.py
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# VERIFICACIÓN reCAPTCHA
+# - Sesión HTTP compartida (keep-alive) con timeouts cortos
+# - Circuit breaker por proceso: tras N errores seguidos no se llama
+#   a Google durante COOLDOWN segundos y se aplica la política
+#   "closed" (rechaza) u "open" (deja pasar)
+# - Verificador intercambiable (SWGFV_RECAPTCHA_VERIFIER):
+#   "google", "stub" o ruta a una clase con verify(token, remote_ip)
+# =========================================================
+GOOGLE_VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+class RecaptchaUnavailable(Exception):
+    """El servicio de verificación no respondió (red, timeout, HTTP 5xx)."""
+
+
+def _conf(name: str, default):
+    return getattr(settings, name, default)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=int(_conf("SWGFV_RECAPTCHA_POOL_SIZE", 10)), max_retries=0)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+class GoogleRecaptchaVerifier:
+    """Verifica contra siteverify (Google o un servidor compatible, p. ej. recaptcha_stub)."""
+
+    def __init__(self):
+        self.url = _conf("SWGFV_RECAPTCHA_VERIFY_URL", "") or GOOGLE_VERIFY_URL
+        self.timeout = (
+            float(_conf("SWGFV_RECAPTCHA_CONNECT_TIMEOUT", 2.0)),
+            float(_conf("SWGFV_RECAPTCHA_READ_TIMEOUT", 3.0)),
+        )
+
+    def verify(self, token: str, remote_ip: str = None) -> bool:
+        data = {"secret": settings.RECAPTCHA_PRIVATE_KEY, "response": token}
+        if remote_ip:
+            data["remoteip"] = remote_ip
+        try:
+            r = get_http_session().post(self.url, data=data, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise RecaptchaUnavailable(str(e)) from e
+
+        if r.status_code >= 500:
+            raise RecaptchaUnavailable(f"HTTP {r.status_code}")
+        try:
+            return bool(r.json().get("success", False))
+        except ValueError:
+            return False
+
+
+class StubRecaptchaVerifier:
+    """Verificador local sin red: acepta cualquier token salvo "fail"."""
+
+    def verify(self, token: str, remote_ip: str = None) -> bool:
+        return bool(token) and token != "fail"
+
+
+VERIFIERS = {
+    "google": GoogleRecaptchaVerifier,
+    "stub": StubRecaptchaVerifier,
+}
+
+_verifier = None
+
+
+def get_verifier():
+    global _verifier
+    if _verifier is None:
+        name = _conf("SWGFV_RECAPTCHA_VERIFIER", "google")
+        cls = VERIFIERS.get(name) or import_string(name)
+        _verifier = cls()
+    return _verifier
+
+
+# =========================================================
+# Circuit breaker + métricas (por proceso)
+# =========================================================
+_state_lock = threading.Lock()
+_breaker = {"fails": 0, "open_until": 0.0}
+_metrics = {
+    "calls": 0,
+    "ok": 0,
+    "rejected": 0,
+    "errors": 0,
+    "short_circuited": 0,
+    "latency_total": 0.0,
+    "latency_max": 0.0,
+    "latency_last": 0.0,
+}
+
+
+def get_recaptcha_metrics() -> dict:
+    with _state_lock:
+        m = dict(_metrics)
+        m["breaker_open"] = time.monotonic() < _breaker["open_until"]
+    m["latency_avg"] = m["latency_total"] / m["calls"] if m["calls"] else 0.0
+    return m
+
+
+def _on_unavailable() -> bool:
+    policy = _conf("SWGFV_RECAPTCHA_FAILURE_POLICY", "closed")
+    return policy == "open"
+
+
+def verify(token: str, remote_ip: str = None) -> bool:
+    """True si el token es válido (o si el servicio no responde y la política es "open")."""
+    if not token:
+        return False
+
+    with _state_lock:
+        if time.monotonic() < _breaker["open_until"]:
+            _metrics["short_circuited"] += 1
+            return _on_unavailable()
+
+    start = time.perf_counter()
+    try:
+        ok = get_verifier().verify(token, remote_ip)
+        error = None
+    except RecaptchaUnavailable as e:
+        ok = None
+        error = e
+    elapsed = time.perf_counter() - start
+
+    with _state_lock:
+        _metrics["calls"] += 1
+        _metrics["latency_total"] += elapsed
+        _metrics["latency_last"] = elapsed
+        _metrics["latency_max"] = max(_metrics["latency_max"], elapsed)
+
+        if error is None:
+            _breaker["fails"] = 0
+            _metrics["ok" if ok else "rejected"] += 1
+        else:
+            _metrics["errors"] += 1
+            _breaker["fails"] += 1
+            if _breaker["fails"] >= int(_conf("SWGFV_RECAPTCHA_BREAKER_FAILS", 5)):
+                _breaker["fails"] = 0
+                _breaker["open_until"] = time.monotonic() + float(_conf("SWGFV_RECAPTCHA_BREAKER_COOLDOWN", 30))
+                logger.warning("reCAPTCHA: circuit breaker abierto tras errores consecutivos")
+
+    if error is not None:
+        logger.warning("reCAPTCHA no disponible (%.3fs): %s", elapsed, error)
+        return _on_unavailable()
+    return ok
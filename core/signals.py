@@ -0,0 +1,52 @@
+# core/signals.py
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+
+from core.utils.catalogos import en_carga_masiva, registrar_version
+from core.utils.catalogos_csv import CATALOGO_POR_MODELO
+from core.utils.fts_sqlite import restaurar_triggers_fts
+from core.utils.importacion import ResultadoImportacion, hash_instancia
+
+# =========================================================
+# Catálogos editados desde la UI
+# - pre_save: recalcula content_hash (así la siguiente importación
+#   compara contra lo que realmente hay en la BD)
+# - post_save/post_delete: nueva versión del catálogo, que a su vez
+#   invalida los catálogos cacheados
+# Durante una importación (carga_masiva) la versión la registra el loader.
+# =========================================================
+
+
+def _catalogo_hash(sender, instance, **kwargs):
+    instance.content_hash = hash_instancia(CATALOGO_POR_MODELO[sender], instance)
+
+
+def _catalogo_cambio(sender, instance, created=False, **kwargs):
+    if en_carga_masiva():
+        return
+    spec = CATALOGO_POR_MODELO[sender]
+    cambio = ResultadoImportacion(spec.nombre)
+    if kwargs.get("signal") is post_delete:
+        cambio.eliminados = 1
+    elif created:
+        cambio.nuevos = 1
+    else:
+        cambio.actualizados = 1
+    registrar_version(spec.clave, cambio, "edición", filas=1)
+
+
+for _model in CATALOGO_POR_MODELO:
+    pre_save.connect(_catalogo_hash, sender=_model, dispatch_uid=f"catalogo_hash_{_model.__name__}")
+    post_save.connect(_catalogo_cambio, sender=_model, dispatch_uid=f"catalogo_save_{_model.__name__}")
+    post_delete.connect(_catalogo_cambio, sender=_model, dispatch_uid=f"catalogo_delete_{_model.__name__}")
+
+
+# =========================================================
+# Triggers FTS5 (SQLite): una migración que reconstruye audit_logs o
+# tablas_nom los borra; se revisan al terminar cada migrate
+# =========================================================
+def _restaurar_fts(sender, using="default", **kwargs):
+    if sender.name == "core":
+        restaurar_triggers_fts(using)
+
+
+post_migrate.connect(_restaurar_fts, dispatch_uid="core_restaurar_triggers_fts")
@@ -0,0 +1,85 @@
+# core/tests/smtp_sink.py
+import socketserver
+import threading
+from email import message_from_bytes
+
+# =========================================================
+# SUMIDERO SMTP LOCAL PARA PRUEBAS
+# - Servidor en 127.0.0.1 con puerto libre, en un hilo
+# - Guarda cada mensaje recibido y cuenta las conexiones
+# - `rechazar`: destinatarios a los que responde 550 en RCPT TO
+# =========================================================
+
+
+class _Manejador(socketserver.StreamRequestHandler):
+    def _responder(self, linea: str):
+        self.wfile.write(f"{linea}\r\n".encode())
+
+    def handle(self):
+        sumidero = self.server.sumidero
+        with sumidero.lock:
+            sumidero.conexiones += 1
+        self._responder("220 sumidero ESMTP")
+        destinatarios = []
+
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            comando = linea.decode("utf-8", "replace").strip()
+            verbo = comando.upper()
+
+            if verbo.startswith(("EHLO", "HELO")):
+                self._responder("250 sumidero")
+            elif verbo.startswith("MAIL FROM"):
+                destinatarios = []
+                self._responder("250 OK")
+            elif verbo.startswith("RCPT TO"):
+                correo = comando.split(":", 1)[1].strip().strip("<>")
+                if correo in sumidero.rechazar:
+                    self._responder("550 Destinatario rechazado")
+                else:
+                    destinatarios.append(correo)
+                    self._responder("250 OK")
+            elif verbo == "DATA":
+                self._responder("354 Termina con .")
+                datos = []
+                while True:
+                    linea = self.rfile.readline()
+                    if linea in (b".\r\n", b".\n", b""):
+                        break
+                    datos.append(linea)
+                with sumidero.lock:
+                    sumidero.mensajes.append((list(destinatarios), message_from_bytes(b"".join(datos))))
+                self._responder("250 OK")
+            elif verbo == "QUIT":
+                self._responder("221 Adios")
+                return
+            else:
+                # RSET, NOOP
+                self._responder("250 OK")
+
+
+class SumideroSMTP:
+    def __init__(self, rechazar=()):
+        self.rechazar = set(rechazar)
+        self.mensajes = []
+        self.conexiones = 0
+        self.lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Manejador)
+        self._server.daemon_threads = True
+        self._server.sumidero = self
+        self.puerto = self._server.server_address[1]
+        self._hilo = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def destinatarios(self) -> list:
+        with self.lock:
+            return [d for dests, _ in self.mensajes for d in dests]
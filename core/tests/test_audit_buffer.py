@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core.audit_buffer import audit_buffer
+from core.models import AuditLog
+
+
+def _evento(action: str) -> dict:
+    return {"actor_email": "admin@x.com", "actor_tipo": "Administrador", "action": action, "message": action}
+
+
+@override_settings(SWGFV_AUDIT_ASYNC=False, SWGFV_AUDIT_BUFFER_SIZE=50)
+class AuditBufferTests(TestCase):
+    """Eventos de bitácora dentro de transacciones (core/audit_buffer.py)."""
+
+    def setUp(self):
+        audit_buffer._take()
+
+    def test_rollback_descarta_el_evento(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    audit_buffer.add(_evento("ALTA"))
+                    raise ValueError("falla después de registrar")
+            except ValueError:
+                pass
+            audit_buffer.add(_evento("CONSULTA"))
+
+        self.assertEqual(audit_buffer.flush(), 1)
+        self.assertEqual(list(AuditLog.objects.values_list("action", flat=True)), ["CONSULTA"])
+
+    def test_commit_registra_el_evento(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                audit_buffer.add(_evento("ALTA"))
+            # Aún no hay commit del bloque externo
+            self.assertEqual(audit_buffer.pending(), 0)
+
+        self.assertEqual(audit_buffer.flush(), 1)
+        self.assertTrue(AuditLog.objects.filter(action="ALTA").exists())
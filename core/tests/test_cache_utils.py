@@ -0,0 +1,54 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core.utils import cache_utils
+from core.utils.cache_utils import CacheNamespace
+
+# Caché "default" casi llena: cada set() dispara el cull de DatabaseCache
+CACHES_PEQUENA = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "swgfv_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10, "CULL_FREQUENCY": 1},
+    },
+    "versiones": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "swgfv_cache_versiones",
+        "TIMEOUT": None,
+    },
+}
+
+
+@override_settings(CACHES=CACHES_PEQUENA)
+class CacheNamespaceTests(TestCase):
+    """Invalidación por versión (core/utils/cache_utils.py)."""
+
+    def setUp(self):
+        caches["default"].clear()
+        caches["versiones"].clear()
+        self.addCleanup(setattr, cache_utils, "NAMESPACE_VERSION_TTL", cache_utils.NAMESPACE_VERSION_TTL)
+        cache_utils.NAMESPACE_VERSION_TTL = 0
+
+    def test_invalidate_oculta_las_claves_anteriores(self):
+        ns = CacheNamespace("prueba", timeout=60)
+        ns.set("a", 1)
+        ns.invalidate()
+        self.assertIsNone(ns.get("a"))
+        ns.set("a", 2)
+        self.assertEqual(ns.get("a"), 2)
+
+    def test_el_cull_no_revive_claves_invalidadas(self):
+        ns = CacheNamespace("prueba", timeout=60)
+        ns.set("a", "vieja")
+        ns.invalidate()
+
+        # Llenar "default" hasta que el cull vacíe la tabla (CULL_FREQUENCY=1)
+        relleno = CacheNamespace("relleno", timeout=60)
+        for n in range(30):
+            relleno.set(n, n)
+        caches["default"].set(f"{cache_utils.CACHE_KEY_PREFIX}:prueba:a", "vieja", 60, version=1)
+
+        # La versión sigue en 2: la clave de la versión 1 no se lee
+        otro_worker = CacheNamespace("prueba", timeout=60)
+        self.assertEqual(otro_worker.version(), 2)
+        self.assertIsNone(otro_worker.get("a"))
@@ -0,0 +1,53 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from core.models import AuditLog, TablaNOM
+from core.utils.bitacora import search_logs
+from core.utils.fts_sqlite import ESPEJOS_FTS, restaurar_triggers_fts, triggers_fts
+from core.utils.tablas_busqueda import buscar_tablas
+
+
+def _triggers(tabla: str) -> set:
+    with connection.cursor() as c:
+        c.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [tabla])
+        return {r[0] for r in c.fetchall()}
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "triggers FTS5 solo en SQLite")
+class TriggersFtsTests(TestCase):
+    """Restauración de los triggers de audit_logs_fts y tablas_nom_fts."""
+
+    def _quitar_triggers(self, tabla: str):
+        # Lo mismo que deja una reconstrucción de la tabla en una migración
+        with connection.cursor() as c:
+            for nombre in triggers_fts(tabla):
+                c.execute(f"DROP TRIGGER {nombre}")
+
+    def test_las_migraciones_crean_los_mismos_triggers(self):
+        for tabla in ESPEJOS_FTS:
+            self.assertEqual(_triggers(tabla), set(triggers_fts(tabla)))
+        self.assertEqual(restaurar_triggers_fts(), [])
+
+    def test_restaura_y_reindexa_la_bitacora(self):
+        self._quitar_triggers("audit_logs")
+        AuditLog.objects.create(action="LOGIN_OK", message="Entrada de inversión", actor_email="ana@x.com")
+        self.assertEqual(search_logs(AuditLog.objects.all(), "inversion").count(), 0)
+
+        with self.assertLogs("core.utils.fts_sqlite", "WARNING"):
+            self.assertEqual(restaurar_triggers_fts(), ["audit_logs_fts"])
+        self.assertEqual(_triggers("audit_logs"), set(triggers_fts("audit_logs")))
+        self.assertEqual(search_logs(AuditLog.objects.all(), "inversion").count(), 1)
+
+        AuditLog.objects.create(action="LOGOUT", message="Salida", actor_email="ana@x.com")
+        self.assertEqual(search_logs(AuditLog.objects.all(), "salida").count(), 1)
+
+    def test_restaura_tablas_nom(self):
+        self._quitar_triggers("tablas_nom")
+        TablaNOM.objects.create(nombre_tabla="Tabla 310.15 Ampacidad", notas="")
+        self.assertEqual(buscar_tablas(TablaNOM.objects.all(), "ampacidad"), [])
+
+        with self.assertLogs("core.utils.fts_sqlite", "WARNING"):
+            self.assertEqual(restaurar_triggers_fts(), ["tablas_nom_fts"])
+        self.assertEqual(len(buscar_tablas(TablaNOM.objects.all(), "ampacidad")), 1)
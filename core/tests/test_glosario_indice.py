@@ -0,0 +1,47 @@
+from django.test import SimpleTestCase
+
+from core.utils.glosario_indice import IndiceGlosario
+from core.utils.texto import clave_orden
+
+
+def _concepto(id, nombre, categoria="", formula="", descripcion=""):
+    return {
+        "id": id,
+        "clave_orden": clave_orden(nombre),
+        "nombre_concepto": nombre,
+        "categoria": categoria,
+        "formula": formula,
+        "descripcion": descripcion,
+    }
+
+
+class IndiceGlosarioTests(SimpleTestCase):
+    """Búsqueda en el índice invertido del glosario."""
+
+    def setUp(self):
+        self.indice = IndiceGlosario([
+            _concepto(1, "Factor de potencia", "Eléctrica", "FP = cos φ", "Relación entre potencia activa y aparente"),
+            _concepto(2, "Eficiencia del inversor", "Inversores", "η = Psal / Pent", "Potencia de salida entre entrada"),
+            _concepto(3, "Ángulo de inclinación", "Módulos", "β", "Inclinación de los módulos respecto a la horizontal"),
+            _concepto(4, "Tensión eficaz", "Eléctrica", "Vrms = Vp / √2", ""),
+            _concepto(5, "Ángulo de desfase", "Eléctrica", "φ = arccos FP", ""),
+        ])
+
+    def test_sin_acentos_y_por_raiz(self):
+        self.assertEqual(self.indice.buscar("angulo inclinacion"), [3])
+        self.assertEqual(self.indice.buscar("inversores"), [2])
+
+    def test_consulta_vacia_devuelve_todo(self):
+        self.assertEqual(len(self.indice.buscar("")), 5)
+        self.assertEqual(self.indice.buscar("", categoria="Electrica"), [5, 1, 4])
+
+    def test_solo_palabras_vacias_no_devuelve_nada(self):
+        self.assertEqual(self.indice.buscar("de"), [])
+        self.assertEqual(self.indice.buscar("de la"), [])
+
+    def test_simbolos_buscan_en_formula(self):
+        self.assertEqual(self.indice.buscar("φ"), [5, 1])
+        self.assertEqual(self.indice.buscar("√"), [4])
+        self.assertEqual(self.indice.buscar("η"), [2])
+        self.assertEqual(self.indice.buscar("%"), [])
+        self.assertEqual(self.indice.buscar("φ", categoria="Eléctrica"), [5, 1])
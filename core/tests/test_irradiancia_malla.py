@@ -0,0 +1,150 @@
+import json
+import math
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.utils import irradiancia_malla
+from core.utils.irradiancia_malla import DIAS_MES, HORAS_ANIO, MESES, EscrituraMalla, Malla, obtener_malla
+
+# Mes k: 1 + k/10 kWh/m²/día; cada celda suma su desplazamiento
+MENSUAL = [1 + k / 10 for k in range(12)]
+
+
+@unittest.skipUnless(irradiancia_malla.disponible(), "numpy no está instalado")
+class MallaIrradianciaTests(SimpleTestCase):
+    """Importación de mallas (importar_irradiancia_malla) y lectura por celda."""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        ajustes = override_settings(SWGFV_IRRADIANCIA_MALLA_DIR=str(self.dir), SWGFV_IRRADIANCIA_MALLA="")
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        irradiancia_malla._abiertas.clear()
+
+    def _importar(self, ruta: Path, nombre="prueba"):
+        call_command("importar_irradiancia_malla", str(ruta), nombre=nombre, stdout=StringIO())
+        return obtener_malla(nombre)
+
+    def _mensual(self, celda) -> list:
+        return [getattr(celda, m) for m in MESES]
+
+    def test_csv_ancho(self):
+        ruta = self.dir / "ancho.csv"
+        filas = ["lat,lon," + ",".join(MESES)]
+        for lat, lon, extra in ((19.0, -99.0, 0), (19.5, -99.0, 1), (19.0, -98.5, 2)):
+            filas.append(f"{lat},{lon}," + ",".join(str(v + extra) for v in MENSUAL))
+        ruta.write_text("\n".join(filas), encoding="utf-8")
+
+        malla = self._importar(ruta)
+        self.assertEqual((malla.meta["nlat"], malla.meta["nlon"], malla.meta["nt"]), (2, 2, 12))
+        self.assertEqual(malla.meta["celdas_con_dato"], 3)
+        self.assertEqual(self._mensual(malla.celda(19.5, -99.0)), [round(v + 1, 3) for v in MENSUAL])
+        self.assertEqual(self._mensual(malla.celda(19.1, -98.6)), [round(v + 2, 3) for v in MENSUAL])
+        # Celda dentro de la malla pero sin fila en el CSV
+        self.assertIsNone(malla.celda(19.5, -98.5))
+
+    def test_csv_largo(self):
+        ruta = self.dir / "largo.csv"
+        filas = ["latitud;longitud;mes;ghi"]
+        for lat in (20.0, 20.25):
+            for k, v in enumerate(MENSUAL, start=1):
+                filas.append(f"{lat};-100.0;{k};{v}")
+        ruta.write_text("\n".join(filas), encoding="utf-8")
+
+        malla = self._importar(ruta)
+        self.assertEqual((malla.meta["nlat"], malla.meta["nlon"], malla.meta["dlat"]), (2, 1, 0.25))
+        celda = malla.celda(20.25, -100.0)
+        self.assertEqual(self._mensual(celda), [round(v, 3) for v in MENSUAL])
+        self.assertEqual(celda.promedio, round(sum(MENSUAL) / 12, 3))
+
+    def _asc(self, carpeta: Path, nodata: bool):
+        carpeta.mkdir()
+        for k, v in enumerate(MENSUAL):
+            encabezado = ["ncols 2", "nrows 2", "xllcorner -101.0", "yllcorner 21.0", "cellsize 0.5"]
+            if nodata:
+                encabezado.append("NODATA_value -9999")
+            # Primera fila = norte; la celda noroeste no tiene dato si hay NODATA
+            norte = f"{-9999 if nodata else v} {v + 1}"
+            (carpeta / f"ghi_{k + 1:02d}.asc").write_text(
+                "\n".join([*encabezado, norte, f"{v + 2} {v + 3}"]) + "\n", encoding="ascii"
+            )
+
+    def test_asc_con_nodata(self):
+        self._asc(self.dir / "asc", nodata=True)
+        malla = self._importar(self.dir / "asc")
+        # Centro de la celda inferior izquierda = esquina + medio paso
+        self.assertEqual((malla.meta["lat0"], malla.meta["lon0"]), (21.25, -100.75))
+        self.assertIsNone(malla.celda(21.75, -100.75))
+        self.assertEqual(self._mensual(malla.celda(21.75, -100.25)), [round(v + 1, 3) for v in MENSUAL])
+        self.assertEqual(self._mensual(malla.celda(21.25, -100.75)), [round(v + 2, 3) for v in MENSUAL])
+        self.assertEqual(malla.meta["celdas_con_dato"], 3)
+
+    def test_asc_sin_nodata(self):
+        self._asc(self.dir / "asc", nodata=False)
+        malla = self._importar(self.dir / "asc")
+        self.assertEqual(self._mensual(malla.celda(21.75, -100.75)), [round(v, 3) for v in MENSUAL])
+        self.assertEqual(malla.meta["celdas_con_dato"], 4)
+
+    def test_celda_fuera_de_la_malla(self):
+        escritura = EscrituraMalla("prueba", 19.0, -99.0, 0.5, 0.5, 2, 2, 12)
+        escritura.ghi[:] = 5.0
+        escritura.publicar()
+        malla = obtener_malla("prueba")
+        self.assertIsNotNone(malla.celda(19.0, -99.0))
+        self.assertIsNotNone(malla.celda(19.7, -98.3))
+        for lat, lon in ((18.7, -99.0), (20.0, -99.0), (19.0, -99.3), (19.0, -98.0), (math.nan, -99.0)):
+            with self.subTest(lat=lat, lon=lon):
+                self.assertIsNone(malla.celda(lat, lon))
+
+    def test_horario_a_mensual(self):
+        escritura = EscrituraMalla("horaria", 19.0, -99.0, 1.0, 1.0, 1, 1, HORAS_ANIO)
+        # 500 W/m² las 12 horas de luz de cada día = 6 kWh/m²/día todo el año;
+        # enero además con NaN en su última hora (se ignora)
+        dia = [0.0] * 6 + [500.0] * 12 + [0.0] * 6
+        escritura.ghi[0, 0, :] = dia * sum(DIAS_MES)
+        escritura.ghi[0, 0, DIAS_MES[0] * 24 - 1] = math.nan
+        escritura.publicar()
+
+        celda = obtener_malla("horaria").celda(19.0, -99.0)
+        self.assertEqual(self._mensual(celda), [6.0] * 12)
+        self.assertEqual(celda.promedio, 6.0)
+
+    def test_reemplazo_de_meta_publica_la_nueva_version(self):
+        archivos = []
+        for valor in (1.0, 2.0, 3.0):
+            escritura = EscrituraMalla("prueba", 19.0, -99.0, 0.5, 0.5, 1, 1, 12)
+            escritura.ghi[:] = valor
+            archivos.append(escritura.publicar().name)
+            if valor == 1.0:
+                primera = obtener_malla("prueba")
+
+        meta = json.loads((self.dir / "prueba" / "meta.json").read_text(encoding="utf-8"))
+        self.assertEqual(meta["archivo"], archivos[-1])
+        # Se conservan la versión vigente y la anterior; la más antigua se borra
+        self.assertEqual(sorted(p.name for p in (self.dir / "prueba").glob("ghi-*.npy")), sorted(archivos[1:]))
+
+        actual = obtener_malla("prueba")
+        self.assertIsNot(actual, primera)
+        self.assertEqual(actual.celda(19.0, -99.0).ene, 3.0)
+        # Un worker con la malla ya abierta sigue leyendo su propio mapeo
+        self.assertEqual(primera.celda(19.0, -99.0).ene, 1.0)
+
+    def test_meta_que_no_corresponde_al_arreglo(self):
+        escritura = EscrituraMalla("prueba", 19.0, -99.0, 0.5, 0.5, 2, 2, 12)
+        escritura.publicar()
+        archivo_meta = self.dir / "prueba" / "meta.json"
+        meta = json.loads(archivo_meta.read_text(encoding="utf-8"))
+        meta["nlat"] = 3
+        archivo_meta.write_text(json.dumps(meta), encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            Malla("prueba")
+        with self.assertLogs("core.utils.irradiancia_malla", "WARNING"):
+            self.assertIsNone(obtener_malla("prueba"))
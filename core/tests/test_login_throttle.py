@@ -0,0 +1,44 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core import login_throttle
+from core.models import LoginLock
+
+
+class LoginThrottleTests(TestCase):
+    """Consultas a la BD por intento fallido (core/login_throttle.py)."""
+
+    def setUp(self):
+        caches["throttle"].clear()
+
+    def test_muchos_usuarios_sin_escrituras(self):
+        usuarios = [f"usuario{n}@x.com" for n in range(200)]
+        with CaptureQueriesContext(connection) as ctx:
+            for u in usuarios:
+                login_throttle.is_locked(u)
+                login_throttle.register_fail(u)
+
+        sql = [q["sql"] for q in ctx.captured_queries]
+        # Solo la lectura de LoginLock por usuario nuevo; nada en swgfv_cache
+        self.assertEqual(len(sql), len(usuarios))
+        self.assertTrue(all(s.lstrip().upper().startswith("SELECT") for s in sql))
+        self.assertFalse([s for s in sql if "swgfv_cache" in s])
+
+    def test_reintentos_del_mismo_usuario_no_consultan(self):
+        login_throttle.register_fail("ana@x.com")
+        with CaptureQueriesContext(connection) as ctx:
+            login_throttle.is_locked("ana@x.com")
+            login_throttle.register_fail("Ana@x.com ")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_bloqueo_y_reset(self):
+        for _ in range(login_throttle.MAX_FAILS):
+            login_throttle.register_fail("ana@x.com")
+        self.assertTrue(login_throttle.is_locked("ana@x.com")[0])
+        self.assertTrue(LoginLock.objects.filter(usuario_key="ana@x.com").exists())
+
+        login_throttle.reset("ana@x.com")
+        self.assertEqual(login_throttle.is_locked("ana@x.com"), (False, 0))
+        self.assertFalse(LoginLock.objects.exists())
@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.utils import pdf_utils
+
+
+class PdfProfileTests(SimpleTestCase):
+    """Selección del perfil PDF (SWGFV_PDF_PROFILE)."""
+
+    @override_settings(SWGFV_PDF_PROFILE="estandar")
+    def test_perfil_valido(self):
+        self.assertEqual(pdf_utils.get_pdf_profile_name(), "estandar")
+
+    @override_settings(SWGFV_PDF_PROFILE="compact")
+    def test_perfil_desconocido_usa_el_de_por_defecto(self):
+        pdf_utils._perfiles_invalidos.discard("compact")
+        with self.assertLogs("core.utils.pdf_utils", "WARNING") as logs:
+            self.assertEqual(pdf_utils.get_pdf_profile_name(), "compacto")
+            pdf_utils.get_pdf_profile_name()
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("'compact'", logs.output[0])
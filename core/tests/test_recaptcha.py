@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core import recaptcha
+from core.recaptcha import RecaptchaUnavailable, StubRecaptchaVerifier
+
+
+class VerificadorCaido(StubRecaptchaVerifier):
+    """Verificador intercambiable que simula a Google sin responder."""
+
+    llamadas = 0
+
+    def verify(self, token: str, remote_ip: str = None) -> bool:
+        type(self).llamadas += 1
+        raise RecaptchaUnavailable("timeout simulado")
+
+
+class _SiteverifyLento(BaseHTTPRequestHandler):
+    # Responde como siteverify, pero después del read timeout del cliente
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.server.retardo)
+        payload = json.dumps({"success": True}).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(
+    RECAPTCHA_PRIVATE_KEY="secreto",
+    SWGFV_RECAPTCHA_BREAKER_FAILS=3,
+    SWGFV_RECAPTCHA_BREAKER_COOLDOWN=30,
+    SWGFV_RECAPTCHA_FAILURE_POLICY="closed",
+)
+class RecaptchaTests(SimpleTestCase):
+    """Verificador intercambiable, timeout y circuit breaker (core/recaptcha.py)."""
+
+    def setUp(self):
+        self._reiniciar()
+        self.addCleanup(self._reiniciar)
+        VerificadorCaido.llamadas = 0
+
+    def _reiniciar(self):
+        recaptcha._verifier = None
+        recaptcha._breaker.update(fails=0, open_until=0.0)
+        for k in recaptcha._metrics:
+            recaptcha._metrics[k] = 0.0 if k.startswith("latency") else 0
+
+    @override_settings(SWGFV_RECAPTCHA_VERIFIER="stub")
+    def test_stub(self):
+        self.assertTrue(recaptcha.verify("token"))
+        self.assertFalse(recaptcha.verify("fail"))
+        self.assertFalse(recaptcha.verify(""))
+        m = recaptcha.get_recaptcha_metrics()
+        self.assertEqual((m["calls"], m["ok"], m["rejected"]), (2, 1, 1))
+
+    @override_settings(SWGFV_RECAPTCHA_VERIFIER="core.tests.test_recaptcha.VerificadorCaido")
+    def test_breaker_se_abre_y_se_cierra(self):
+        # Tres errores seguidos abren el breaker
+        with self.assertLogs("core.recaptcha", "WARNING") as logs:
+            self.assertEqual([recaptcha.verify("token") for _ in range(3)], [False, False, False])
+        self.assertIn("circuit breaker abierto", "\n".join(logs.output))
+        self.assertTrue(recaptcha.get_recaptcha_metrics()["breaker_open"])
+
+        # Abierto: no se llama al verificador
+        self.assertFalse(recaptcha.verify("token"))
+        self.assertEqual(VerificadorCaido.llamadas, 3)
+        self.assertEqual(recaptcha.get_recaptcha_metrics()["short_circuited"], 1)
+
+        # Pasado el cooldown se vuelve a intentar
+        ahora = time.monotonic() + 31
+        with mock.patch("core.recaptcha.time.monotonic", return_value=ahora), self.assertLogs("core.recaptcha"):
+            self.assertFalse(recaptcha.get_recaptcha_metrics()["breaker_open"])
+            recaptcha.verify("token")
+        self.assertEqual(VerificadorCaido.llamadas, 4)
+
+    @override_settings(
+        SWGFV_RECAPTCHA_VERIFIER="core.tests.test_recaptcha.VerificadorCaido",
+        SWGFV_RECAPTCHA_FAILURE_POLICY="open",
+    )
+    def test_politica_open_deja_pasar(self):
+        with self.assertLogs("core.recaptcha", "WARNING"):
+            self.assertEqual([recaptcha.verify("token") for _ in range(4)], [True] * 4)
+        self.assertEqual(recaptcha.get_recaptcha_metrics()["short_circuited"], 1)
+
+    def test_timeout_de_lectura(self):
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), _SiteverifyLento)
+        servidor.retardo = 1.0
+        hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+        hilo.start()
+        self.addCleanup(servidor.server_close)
+        self.addCleanup(servidor.shutdown)
+
+        with self.settings(
+            SWGFV_RECAPTCHA_VERIFIER="google",
+            SWGFV_RECAPTCHA_VERIFY_URL=f"http://127.0.0.1:{servidor.server_port}/siteverify",
+            SWGFV_RECAPTCHA_READ_TIMEOUT=0.2,
+        ):
+            inicio = time.perf_counter()
+            with self.assertLogs("core.recaptcha", "WARNING") as logs:
+                self.assertFalse(recaptcha.verify("token"))
+            self.assertIn("timed out", logs.output[0])
+            self.assertLess(time.perf_counter() - inicio, 0.9)
+
+        m = recaptcha.get_recaptcha_metrics()
+        self.assertEqual((m["calls"], m["errors"], m["ok"]), (1, 1, 0))
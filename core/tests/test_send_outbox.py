@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import EmailOutbox
+from core.tests.smtp_sink import SumideroSMTP
+
+
+def _encolar(*correos):
+    return [
+        EmailOutbox.objects.create(
+            from_email="no-reply@swgfv.local",
+            to_email=c,
+            subject="SWGFV - Restablecer contraseña",
+            body=f"Enlace para {c}",
+        )
+        for c in correos
+    ]
+
+
+class SendOutboxTests(TestCase):
+    """send_outbox contra un servidor SMTP local (core/tests/smtp_sink.py)."""
+
+    def _smtp(self, sumidero):
+        return self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=sumidero.puerto,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+        )
+
+    def test_envia_el_lote_por_una_conexion_y_borra_el_cuerpo(self):
+        _encolar("a@x.com", "b@x.com", "c@x.com")
+
+        with SumideroSMTP() as sumidero, self._smtp(sumidero):
+            call_command("send_outbox", stdout=mock.MagicMock())
+
+        self.assertEqual(sumidero.conexiones, 1)
+        self.assertEqual(sorted(sumidero.destinatarios()), ["a@x.com", "b@x.com", "c@x.com"])
+        self.assertIn("Enlace para a@x.com", sumidero.mensajes[0][1].get_payload(decode=True).decode())
+        for item in EmailOutbox.objects.all():
+            self.assertEqual(item.status, EmailOutbox.ENVIADO)
+            self.assertEqual(item.attempts, 1)
+            self.assertEqual(item.body, "")
+            self.assertIsNotNone(item.sent_at)
+
+    def test_caida_a_medio_lote_no_reenvia_lo_ya_enviado(self):
+        _encolar("a@x.com", "b@x.com", "c@x.com")
+        send_original = EmailMessage.send
+        llamadas = []
+
+        def send_que_muere(msg, *args, **kwargs):
+            llamadas.append(msg.to[0])
+            if len(llamadas) == 2:
+                # Simula que el worker muere (SIGTERM, timeout) tras el primer envío
+                raise KeyboardInterrupt
+            return send_original(msg, *args, **kwargs)
+
+        with SumideroSMTP() as sumidero, self._smtp(sumidero):
+            with mock.patch.object(EmailMessage, "send", send_que_muere):
+                with self.assertRaises(KeyboardInterrupt):
+                    call_command("send_outbox", stdout=mock.MagicMock())
+
+            estados = dict(EmailOutbox.objects.values_list("to_email", "status"))
+            self.assertEqual(estados["a@x.com"], EmailOutbox.ENVIADO)
+            self.assertEqual(estados["b@x.com"], EmailOutbox.ENVIANDO)
+            self.assertEqual(estados["c@x.com"], EmailOutbox.ENVIANDO)
+
+            # Mientras dura la reserva nadie los vuelve a tomar
+            call_command("send_outbox", stdout=mock.MagicMock())
+            self.assertEqual(sumidero.destinatarios(), ["a@x.com"])
+
+            # Vencida la reserva solo se retoma lo que quedó ENVIANDO
+            EmailOutbox.objects.filter(status=EmailOutbox.ENVIANDO).update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+            call_command("send_outbox", stdout=mock.MagicMock())
+
+        self.assertEqual(sorted(sumidero.destinatarios()), ["a@x.com", "b@x.com", "c@x.com"])
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.ENVIADO).exists())
+
+    def test_destinatario_rechazado_se_reintenta_con_backoff(self):
+        _encolar("a@x.com", "rechazado@x.com")
+
+        with SumideroSMTP(rechazar=["rechazado@x.com"]) as sumidero, self._smtp(sumidero):
+            call_command("send_outbox", "--backoff", "60", stdout=mock.MagicMock())
+
+        self.assertEqual(sumidero.destinatarios(), ["a@x.com"])
+        item = EmailOutbox.objects.get(to_email="rechazado@x.com")
+        self.assertEqual(item.status, EmailOutbox.PENDIENTE)
+        self.assertEqual(item.attempts, 1)
+        self.assertNotEqual(item.body, "")
+        self.assertIn("550", item.last_error)
+        self.assertGreater(item.next_attempt_at, timezone.now() + timedelta(seconds=30))
+
+    def test_servidor_caido_marca_fallido_al_agotar_intentos(self):
+        (item,) = _encolar("a@x.com")
+
+        with SumideroSMTP() as sumidero:
+            puerto = sumidero.puerto
+        # El puerto ya no escucha: open() falla
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=puerto,
+            EMAIL_TIMEOUT=2,
+        ):
+            for _ in range(2):
+                EmailOutbox.objects.filter(id=item.id).update(next_attempt_at=timezone.now())
+                call_command("send_outbox", "--max-attempts", "2", stdout=mock.MagicMock())
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, EmailOutbox.FALLIDO)
+        self.assertEqual(item.attempts, 2)
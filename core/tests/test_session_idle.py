@@ -0,0 +1,74 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.middleware import SessionIdleTimeoutMiddleware
+
+# Páginas sin archivos estáticos con manifiesto en las pruebas
+ESTATICOS = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+
+@override_settings(
+    STATICFILES_STORAGE=ESTATICOS,
+    SWGFV_SESSION_ACTIVITY_GRANULARITY=60,
+    SESSION_COOKIE_SECURE=False,
+)
+class SessionIdleTimeoutTests(TestCase):
+    """Escrituras en django_session por request (SessionIdleTimeoutMiddleware)."""
+
+    def setUp(self):
+        self.inicio = timezone.now()
+        self.url = reverse("core:recursos_tablas")
+        s = self.client.session
+        s["usuario"] = "admin@x.com"
+        s["tipo"] = "Administrador"
+        s["id_usuario"] = 1
+        s.save()
+
+    def _get(self, segundos: int):
+        """GET a self.url `segundos` después del inicio; devuelve (respuesta, escrituras de sesión)."""
+        ahora = self.inicio + timedelta(seconds=segundos)
+        with mock.patch("core.middleware.timezone.now", return_value=ahora):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(self.url)
+        escrituras = [
+            q["sql"] for q in ctx.captured_queries
+            if "django_session" in q["sql"] and q["sql"].lstrip().upper().startswith(("UPDATE", "INSERT"))
+        ]
+        return response, len(escrituras)
+
+    def test_una_escritura_por_ventana_de_granularidad(self):
+        escrituras = [self._get(t)[1] for t in (0, 10, 30, 59, 61, 90, 125)]
+        # Se escribe al primer request y al pasar cada ventana de 60 s
+        self.assertEqual(escrituras, [1, 0, 0, 0, 1, 0, 1])
+
+    def test_inactividad_cierra_la_sesion(self):
+        self._get(0)
+        response, _ = self._get((SessionIdleTimeoutMiddleware.IDLE_MINUTES + 1) * 60)
+        self.assertRedirects(response, reverse("core:login"), fetch_redirect_response=False)
+
+    @override_settings(SWGFV_IDLE_TRACKING="cookie")
+    def test_modo_cookie_sin_escrituras_de_sesion(self):
+        escrituras = [self._get(t)[1] for t in (0, 10, 61, 125, 300)]
+        # Solo la primera petición (sin cookie) guarda la marca en la sesión
+        self.assertEqual(escrituras, [1, 0, 0, 0, 0])
+        self.assertIn(SessionIdleTimeoutMiddleware.COOKIE_NAME, self.client.cookies)
+
+    @override_settings(SWGFV_IDLE_TRACKING="cookie")
+    def test_modo_cookie_borrar_la_cookie_no_evita_el_cierre(self):
+        self._get(0)
+        del self.client.cookies[SessionIdleTimeoutMiddleware.COOKIE_NAME]
+        response, _ = self._get((SessionIdleTimeoutMiddleware.IDLE_MINUTES + 1) * 60)
+        self.assertRedirects(response, reverse("core:login"), fetch_redirect_response=False)
+
+    @override_settings(SWGFV_IDLE_TRACKING="cookie")
+    def test_modo_cookie_la_cookie_mantiene_la_sesion_activa(self):
+        # Actividad continua solo en la cookie: la marca de la sesión queda vieja
+        for t in range(0, 15 * 60, 120):
+            response, _ = self._get(t)
+            self.assertEqual(response.status_code, 200)
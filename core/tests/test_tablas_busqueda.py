@@ -0,0 +1,45 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import TablaNOM
+from core.utils.tablas_busqueda import buscar_tablas
+
+ESTATICOS = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+
+@override_settings(STATICFILES_STORAGE=ESTATICOS, SESSION_COOKIE_SECURE=False)
+class BuscarTablasTests(TestCase):
+    """Búsqueda de texto en tablas_nom (core/utils/tablas_busqueda.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        TablaNOM.objects.create(nombre_tabla="Tabla 310.15(B)(16) Ampacidad", notas="Conductores a 75 °C")
+        TablaNOM.objects.create(nombre_tabla="Tabla 250.122 Puesta a tierra", notas="Calibre mínimo del conductor")
+
+    def setUp(self):
+        s = self.client.session
+        s["usuario"] = "admin@x.com"
+        s["tipo"] = "Administrador"
+        s["id_usuario"] = 1
+        s.save()
+
+    def test_encuentra_por_nombre_y_notas(self):
+        nombres = [t.nombre_tabla for t in buscar_tablas(TablaNOM.objects.all(), "conductor")]
+        self.assertEqual(len(nombres), 2)
+        self.assertEqual(
+            [t.nombre_tabla for t in buscar_tablas(TablaNOM.objects.all(), "ampacidad")],
+            ["Tabla 310.15(B)(16) Ampacidad"],
+        )
+
+    def test_solo_signos_no_devuelve_tablas(self):
+        for q in ("-", "%", "°", "()", '"'):
+            with self.subTest(q=q):
+                self.assertEqual(buscar_tablas(TablaNOM.objects.all(), q), [])
+
+    def test_pagina_con_solo_signos(self):
+        url = reverse("core:recursos_tablas")
+        for q in ("-", "%", "°"):
+            with self.subTest(q=q):
+                response = self.client.get(url, {"q": q})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context["tablas"]), [])
@@ -29,6 +29,8 @@ urlpatterns = [
     path("usuarios/export/csv/", views.usuarios_export_csv, name="usuarios_export_csv"),
     path("usuarios/export/pdf/", views.usuarios_export_pdf, name="usuarios_export_pdf"),
     path("usuarios/actividad/", views.usuarios_actividad, name="usuarios_actividad"),
+    path("usuarios/actividad/export/csv/", views.usuarios_actividad_csv, name="usuarios_actividad_csv"),
+    path("sistema/rendimiento/", views.rendimiento_view, name="rendimiento"),
 
     # Cuenta
     path("cuenta/", views.cuenta_view, name="cuenta"),
@@ -62,6 +64,11 @@ path(
     # Recursos
     path("recursos/tablas/", views.recursos_tablas, name="recursos_tablas"),
     path("recursos/conceptos/", views.recursos_conceptos, name="recursos_conceptos"),
+    path(
+        "recursos/conceptos/autocompletar/",
+        views.recursos_conceptos_autocompletar,
+        name="recursos_conceptos_autocompletar",
+    ),
     path("recursos/alta-concepto/", views.recursos_alta_concepto, name="recursos_alta_concepto"),
     path("recursos/alta-tabla/", views.recursos_alta_tabla, name="recursos_alta_tabla"),
     path("recursos/modificacion-concepto/", views.recursos_modificacion_concepto, name="recursos_modificacion_concepto"),
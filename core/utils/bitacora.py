@@ -0,0 +1,248 @@
+# core/utils/bitacora.py
+import re
+from datetime import date
+
+from django.core import signing
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
+
+# =========================================================
+# PARTICIONES MENSUALES DE audit_logs (solo PostgreSQL)
+# - La tabla se convierte en particionada en la migración 0028
+# - Nombres: audit_logs_pAAAA_MM + audit_logs_default
+# =========================================================
+AUDIT_TABLE = "audit_logs"
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{AUDIT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def _add_months(d: date, n: int) -> date:
+    m = d.month - 1 + n
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def partition_name(d: date) -> str:
+    return f"{AUDIT_TABLE}_p{d.year:04d}_{d.month:02d}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as c:
+        c.execute("SELECT relkind FROM pg_class WHERE relname = %s", [AUDIT_TABLE])
+        row = c.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions() -> list:
+    """[(nombre, primer_día_del_mes)] de las particiones mensuales existentes."""
+    with connection.cursor() as c:
+        c.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [AUDIT_TABLE],
+        )
+        names = [r[0] for r in c.fetchall()]
+
+    out = []
+    for n in names:
+        m = _PARTITION_RE.match(n)
+        if m:
+            out.append((n, date(int(m.group(1)), int(m.group(2)), 1)))
+    return sorted(out, key=lambda x: x[1])
+
+
+def ensure_partitions(meses_adelante: int = 3, desde: date = None) -> list:
+    """
+    Crea las particiones mensuales faltantes desde `desde` (default: mes
+    actual) hasta `meses_adelante`. Si la partición default ya tiene filas
+    de ese mes, se mueven a la nueva partición.
+    """
+    if not is_partitioned():
+        return []
+
+    inicio = (desde or date.today()).replace(day=1)
+    existentes = {n for n, _ in list_partitions()}
+    creadas = []
+
+    for i in range(meses_adelante + 1):
+        mes = _add_months(inicio, i)
+        nombre = partition_name(mes)
+        if nombre in existentes:
+            continue
+        fin = _add_months(mes, 1)
+
+        with transaction.atomic(), connection.cursor() as c:
+            c.execute(f"CREATE TABLE {nombre} (LIKE {AUDIT_TABLE} INCLUDING DEFAULTS)")
+            c.execute(
+                f"""
+                WITH movidas AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= %s AND created_at < %s
+                    RETURNING *
+                )
+                INSERT INTO {nombre} SELECT * FROM movidas
+                """,
+                [mes.isoformat(), fin.isoformat()],
+            )
+            c.execute(
+                f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {nombre} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [mes.isoformat(), fin.isoformat()],
+            )
+        creadas.append(nombre)
+    return creadas
+
+
+def drop_empty_partitions(antes_de: date) -> list:
+    """Elimina particiones mensuales vacías que terminan antes de `antes_de`."""
+    if not is_partitioned():
+        return []
+
+    borradas = []
+    for nombre, mes in list_partitions():
+        if _add_months(mes, 1) > antes_de:
+            continue
+        with connection.cursor() as c:
+            c.execute(f"SELECT EXISTS (SELECT 1 FROM {nombre})")
+            if c.fetchone()[0]:
+                continue
+            c.execute(f"DROP TABLE {nombre}")
+        borradas.append(nombre)
+    return borradas
+
+
+# =========================================================
+# BÚSQUEDA DE TEXTO EN LA BITÁCORA
+# - PostgreSQL: índice GIN sobre to_tsvector (migración 0029)
+# - SQLite: tabla FTS5 espejo (audit_logs_fts) mantenida por triggers
+# - Otros motores: icontains como antes
+# Campos: acción, actor (correo y tipo), mensaje y target
+# =========================================================
+AUDIT_FTS_TABLE = f"{AUDIT_TABLE}_fts"
+AUDIT_SEARCH_COLUMNS = ["action", "actor_email", "actor_tipo", "message", "target_model", "target_id"]
+
+PG_SEARCH_CONFIG = "spanish"
+PG_SEARCH_VECTOR = (
+    f"to_tsvector('{PG_SEARCH_CONFIG}', "
+    + " || ' ' || ".join(f"coalesce({c}, '')" for c in AUDIT_SEARCH_COLUMNS)
+    + ")"
+)
+
+_fts_available = None
+
+
+def search_backend() -> str:
+    """"postgresql", "fts5" o "" (sin índice de texto)."""
+    global _fts_available
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite":
+        if _fts_available is None:
+            _fts_available = AUDIT_FTS_TABLE in connection.introspection.table_names()
+        return "fts5" if _fts_available else ""
+    return ""
+
+
+def _fts5_query(texto: str) -> str:
+    # Cada palabra entre comillas (sin operadores del usuario) y con prefijo
+    palabras = [w.replace('"', "") for w in texto.split()]
+    return " ".join(f'"{w}"*' for w in palabras if w)
+
+
+def search_logs(qs, texto: str):
+    """
+    Filtra qs por texto libre y anota `rank` (mayor = más relevante).
+    Sin índice de texto disponible se usa icontains y rank = 0.
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return qs.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    backend = search_backend()
+
+    if backend == "postgresql":
+        query = f"websearch_to_tsquery('{PG_SEARCH_CONFIG}', %s)"
+        return qs.filter(
+            RawSQL(f"{PG_SEARCH_VECTOR} @@ {query}", [texto], output_field=BooleanField())
+        ).annotate(
+            # ts_rank es real: en float8 la comparación con el cursor (float de
+            # Python) es exacta y la última fila de una página no se repite
+            rank=RawSQL(f"ts_rank({PG_SEARCH_VECTOR}, {query})::float8", [texto], output_field=FloatField())
+        )
+
+    if backend == "fts5":
+        fts_q = _fts5_query(texto)
+        if not fts_q:
+            return qs.none()
+        # Join directo con la tabla FTS: bm25() se calcula una vez por fila
+        return qs.extra(
+            tables=[AUDIT_FTS_TABLE],
+            where=[f"{AUDIT_FTS_TABLE}.rowid = {AUDIT_TABLE}.id", f"{AUDIT_FTS_TABLE} MATCH %s"],
+            params=[fts_q],
+        ).annotate(
+            rank=RawSQL(f"-bm25({AUDIT_FTS_TABLE})", [], output_field=FloatField())
+        )
+
+    return qs.filter(
+        Q(message__icontains=texto) |
+        Q(target_model__icontains=texto) |
+        Q(target_id__icontains=texto)
+    ).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+# =========================================================
+# Paginación por llave (keyset) sobre (created_at, id)
+# =========================================================
+def encode_cursor(values) -> str:
+    return signing.dumps([str(v) for v in values], salt="swgfv.bitacora.cursor", compress=True)
+
+
+def decode_cursor(token: str):
+    try:
+        return signing.loads(token, salt="swgfv.bitacora.cursor")
+    except signing.BadSignature:
+        return None
+
+
+def keyset_page(qs, por_relevancia: bool, after: str = "", size: int = 50):
+    """
+    Devuelve (filas, cursor_siguiente). Orden: (created_at, id) descendente,
+    o (rank, created_at, id) si por_relevancia.
+    """
+    orden = ["-rank", "-created_at", "-id"] if por_relevancia else ["-created_at", "-id"]
+    qs = qs.order_by(*orden)
+
+    cursor = decode_cursor(after) if after else None
+    if cursor:
+        try:
+            if por_relevancia:
+                rank, created_at, pk = float(cursor[0]), parse_datetime(cursor[1]), int(cursor[2])
+                qs = qs.filter(
+                    Q(rank__lt=rank)
+                    | Q(rank=rank, created_at__lt=created_at)
+                    | Q(rank=rank, created_at=created_at, id__lt=pk)
+                )
+            else:
+                created_at, pk = parse_datetime(cursor[0]), int(cursor[1])
+                qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        except (TypeError, ValueError, IndexError):
+            pass
+
+    filas = list(qs[: size + 1])
+    siguiente = ""
+    if len(filas) > size:
+        filas = filas[:size]
+        last = filas[-1]
+        valores = [last.created_at.isoformat(), last.id]
+        if por_relevancia:
+            valores.insert(0, repr(float(last.rank)))
+        siguiente = encode_cursor(valores)
+    return filas, siguiente
@@ -0,0 +1,170 @@
+# core/utils/cache_utils.py
+import threading
+import time
+
+from django.core.cache import caches
+
+# =========================================================
+# CACHÉ COMPARTIDA POR NAMESPACE
+# - Claves con prefijo "swgfv:<namespace>:" sobre la caché de Django
+#   (por defecto una tabla en BD, compartida entre workers de gunicorn)
+# - Invalidación por versión: invalidate() sube la versión del
+#   namespace y las claves anteriores quedan huérfanas (expiran solas)
+# - La versión vive en el alias "versiones", sin cull ni expiración:
+#   si se perdiera volvería a 1 y revivirían claves ya invalidadas
+# - Contadores de hits/misses por namespace (por proceso)
+# =========================================================
+CACHE_KEY_PREFIX = "swgfv"
+
+# La versión de cada namespace se relee de la caché cada N segundos;
+# otro worker ve una invalidación a más tardar tras este intervalo.
+NAMESPACE_VERSION_TTL = 5
+
+_MISSING = object()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count(namespace: str, field: str, n: int = 1):
+    with _stats_lock:
+        s = _stats.setdefault(namespace, {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0})
+        s[field] += n
+
+
+def get_cache_stats() -> dict:
+    """Copia de los contadores por namespace (hits, misses, sets, invalidations)."""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+class CacheNamespace:
+    """
+    Acceso a la caché de Django con claves agrupadas por namespace.
+    Todas las operaciones usan la versión vigente del namespace.
+    """
+
+    def __init__(self, name: str, timeout=None, alias: str = "default", version_alias: str = "versiones"):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self.version_alias = version_alias
+        self._version = None
+        self._version_checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def version_backend(self):
+        return caches[self.version_alias]
+
+    def _version_key(self) -> str:
+        return f"{CACHE_KEY_PREFIX}:nsver:{self.name}"
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is None else timeout
+
+    def key(self, key) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.name}:{key}"
+
+    def version(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._version_checked < NAMESPACE_VERSION_TTL:
+                return self._version
+
+        v = self.version_backend.get(self._version_key())
+        if v is None:
+            self.version_backend.add(self._version_key(), 1, None)
+            v = self.version_backend.get(self._version_key()) or 1
+
+        with self._lock:
+            self._version = int(v)
+            self._version_checked = now
+        return self._version
+
+    def get(self, key, default=None):
+        value = self.backend.get(self.key(key), _MISSING, version=self.version())
+        if value is _MISSING:
+            _count(self.name, "misses")
+            return default
+        _count(self.name, "hits")
+        return value
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+        full = {self.key(k): k for k in keys}
+        found = self.backend.get_many(list(full), version=self.version())
+        _count(self.name, "hits", len(found))
+        _count(self.name, "misses", len(keys) - len(found))
+        return {full[k]: v for k, v in found.items()}
+
+    def set(self, key, value, timeout=None):
+        _count(self.name, "sets")
+        self.backend.set(self.key(key), value, self._timeout(timeout), version=self.version())
+
+    def add(self, key, value, timeout=None) -> bool:
+        added = self.backend.add(self.key(key), value, self._timeout(timeout), version=self.version())
+        if added:
+            _count(self.name, "sets")
+        return added
+
+    def delete(self, key):
+        self.backend.delete(self.key(key), version=self.version())
+
+    def _event_keys(self, key, limit: int) -> list:
+        return [self.key(f"{key}:{n}") for n in range(1, limit + 1)]
+
+    def count_event(self, key, limit: int, timeout=None) -> int:
+        """
+        Registra un evento y devuelve cuántos siguen vigentes (tope: limit).
+
+        Cada evento ocupa su propia clave con add(): la ventana corre desde
+        cada evento (no la reinicia un set() con el TIMEOUT por defecto, como
+        hace incr() en DatabaseCache) y dos eventos simultáneos no se pisan.
+        Cuesta una escritura por evento.
+        """
+        version = self.version()
+        keys = self._event_keys(key, limit)
+        vigentes = self.backend.get_many(keys, version=version)
+        n = len(vigentes)
+        for k in keys:
+            if k in vigentes:
+                continue
+            n += 1
+            if self.backend.add(k, 1, self._timeout(timeout), version=version):
+                _count(self.name, "sets")
+                return n
+        return limit
+
+    def clear_events(self, key, limit: int):
+        """Borra los eventos de key; si no hay ninguno no escribe nada."""
+        version = self.version()
+        keys = self._event_keys(key, limit)
+        if self.backend.get_many(keys, version=version):
+            self.backend.delete_many(keys, version=version)
+
+    def get_or_set(self, key, producer, timeout=None):
+        """Devuelve el valor cacheado o lo calcula con producer() y lo guarda."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = producer()
+            self.set(key, value, timeout)
+        return value
+
+    def invalidate(self) -> int:
+        """Invalida todas las claves del namespace subiendo su versión."""
+        vkey = self._version_key()
+        # Sin backend.incr(): en DatabaseCache re-guarda con el TIMEOUT por
+        # defecto y la versión volvería a 1 al expirar
+        v = int(self.version_backend.get(vkey) or self.version() or 1) + 1
+        self.version_backend.set(vkey, v, None)
+
+        with self._lock:
+            self._version = int(v)
+            self._version_checked = time.monotonic()
+        _count(self.name, "invalidations")
+        return self._version
@@ -0,0 +1,146 @@
+# core/utils/catalogos.py
+import contextvars
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Max
+
+from core.utils.cache_utils import CacheNamespace
+
+# =========================================================
+# CATÁLOGOS CACHEADOS (listas para selects de las vistas)
+# - Se invalidan solo cuando cambia la versión del catálogo:
+#   importación con filas nuevas/cambiadas/eliminadas o edición
+#   desde la UI (core/signals.py)
+# - En la caché van tuplas de valores con la lista de columnas, no
+#   objetos pickle: tras una migración la lista ya no coincide con el
+#   modelo y se recarga (un pickle viejo traería las columnas nuevas
+#   diferidas, una consulta extra por objeto)
+# =========================================================
+CATALOGO_TIMEOUT = 60 * 60  # 1 h
+
+catalogo_cache = CacheNamespace("catalogo", timeout=CATALOGO_TIMEOUT)
+
+# nombre -> (modelo, orden)
+CATALOGOS = {
+    "irradiancias": ("Irradiancia", ("estado", "ciudad")),
+    "paneles": ("PanelSolar", ("marca", "modelo")),
+    "inversores": ("Inversor", ("marca", "modelo")),
+    "micro_inversores": ("MicroInversor", ("marca", "modelo")),
+}
+
+
+def get_catalogo(nombre: str) -> list:
+    """Lista de objetos del catálogo (desde la caché compartida)."""
+    modelo_nombre, orden = CATALOGOS[nombre]
+    modelo = apps.get_model("core", modelo_nombre)
+    campos = [f.attname for f in modelo._meta.concrete_fields]
+
+    datos = catalogo_cache.get(nombre)
+    if not datos or datos["campos"] != campos:
+        datos = {
+            "campos": campos,
+            "filas": list(modelo.objects.order_by(*orden).values_list(*campos)),
+        }
+        catalogo_cache.set(nombre, datos)
+    return [modelo.from_db(DEFAULT_DB_ALIAS, campos, fila) for fila in datos["filas"]]
+
+
+def invalidar_catalogos():
+    catalogo_cache.invalidate()
+
+
+# =========================================================
+# VERSIONES DE CATÁLOGO (CatalogVersion)
+# - Cada import_* registra una fila; `version` avanza solo si hubo cambios
+# - versiones_catalogos() queda en caché hasta el siguiente cambio
+# =========================================================
+version_cache = CacheNamespace("catalogo_version", timeout=CATALOGO_TIMEOUT)
+
+_carga_masiva = contextvars.ContextVar("swgfv_carga_masiva", default=False)
+
+
+@contextmanager
+def carga_masiva():
+    """Durante una importación las señales por fila no registran versiones."""
+    token = _carga_masiva.set(True)
+    try:
+        yield
+    finally:
+        _carga_masiva.reset(token)
+
+
+def en_carga_masiva() -> bool:
+    return _carga_masiva.get()
+
+
+def versiones_catalogos() -> dict:
+    """{catálogo: versión vigente}."""
+    def _cargar():
+        from core.models import CatalogVersion
+        return {
+            r["catalogo"]: r["v"]
+            for r in CatalogVersion.objects.values("catalogo").annotate(v=Max("version"))
+        }
+    return version_cache.get_or_set("todas", _cargar)
+
+
+def version_catalogo(nombre: str) -> int:
+    return versiones_catalogos().get(nombre, 0)
+
+
+def registrar_version(nombre: str, resultado, origen: str = "", filas: int = 0) -> int:
+    """
+    Guarda un CatalogVersion con el resumen de la carga. Si hubo cambios
+    la versión avanza y se invalidan las cachés que dependen del catálogo.
+    """
+    from core.models import CatalogVersion
+
+    anterior = CatalogVersion.objects.filter(catalogo=nombre).aggregate(v=Max("version"))["v"] or 0
+    cambio = resultado.hubo_cambios
+    version = anterior + 1 if cambio else anterior
+
+    CatalogVersion.objects.create(
+        catalogo=nombre,
+        version=version,
+        origen=origen[:255],
+        filas=filas,
+        nuevos=resultado.nuevos,
+        cambiados=resultado.actualizados,
+        eliminados=resultado.eliminados,
+    )
+
+    if cambio:
+        version_cache.invalidate()
+        invalidar_catalogos()
+    return version
+
+
+# =========================================================
+# IRRADIANCIA MÁS CERCANA A UNAS COORDENADAS
+# - Índice por cuadrícula (core/utils/geo.py) construido una vez por
+#   proceso y por versión del catálogo "irradiancia"
+# =========================================================
+_indice_irradiancias = {"version": None, "indice": None}
+
+
+def indice_irradiancias():
+    from core.utils.geo import IndiceCuadricula
+
+    version = version_catalogo("irradiancia")
+    if _indice_irradiancias["indice"] is None or _indice_irradiancias["version"] != version:
+        _indice_irradiancias["indice"] = IndiceCuadricula(
+            (float(i.latitud), float(i.longitud), i)
+            for i in get_catalogo("irradiancias")
+            if i.latitud is not None and i.longitud is not None
+        )
+        _indice_irradiancias["version"] = version
+    return _indice_irradiancias["indice"]
+
+
+def irradiancia_cercana(lat, lon):
+    """(Irradiancia, distancia_km) del sitio más cercano, o None."""
+    if lat is None or lon is None:
+        return None
+    return indice_irradiancias().mas_cercano(float(lat), float(lon))
@@ -0,0 +1,158 @@
+# core/utils/catalogos_csv.py
+from decimal import Decimal
+
+from core.models import (
+    Conductor,
+    GlosarioConcepto,
+    Inversor,
+    Irradiancia,
+    MicroInversor,
+    PanelSolar,
+    TablaConductoresAWGConReactancia,
+    TablaNOM,
+)
+from core.utils.importacion import CatalogoCSV, Columna, decimal_coma, entero, texto
+from core.utils.texto import clave_orden
+
+# =========================================================
+# DECLARACIÓN DE LOS CSV DE CATÁLOGO (data/*.csv)
+# Encabezados: se comparan sin acentos/espacios/mayúsculas (norm_header)
+# =========================================================
+MESES = ["ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"]
+
+_INVERSOR_COLUMNAS = [
+    Columna("marca", "Marca", requerido=True),
+    Columna("modelo", "Modelo", requerido=True),
+    Columna("potencia", "Potencia", convertir=decimal_coma),
+    Columna("corriente_entrada", "Corriente de entrada", convertir=decimal_coma),
+    Columna("corriente_salida", "Corriente de salida", convertir=decimal_coma),
+    Columna("voltaje_arranque", "Voltaje de arranque", convertir=decimal_coma),
+    # El CSV trae "Voltaje mÃ¡ximo de entrada": norm_header lo repara
+    Columna("voltaje_maximo_entrada", "Voltaje máximo de entrada", convertir=decimal_coma),
+    Columna("no_mppt", "No mppt", convertir=entero),
+    Columna("no_fases", "No fases", convertir=entero),
+    Columna("voltaje_nominal", "Voltaje nominal"),
+]
+
+
+def _clave_termino(val):
+    return clave_orden(texto(val))
+
+
+CATALOGOS_CSV = {
+    "irradiancia": CatalogoCSV(
+        "Irradiancia",
+        Irradiancia,
+        [
+            Columna("no", "No", convertir=entero, requerido=True),
+            Columna("tarifa", "Tarifa"),
+            Columna("region", "Region"),
+            Columna("estado", "Estado"),
+            Columna("ciudad", "Ciudad", requerido=True),
+            *[Columna(m, convertir=decimal_coma, default=Decimal("0")) for m in MESES],
+            Columna("promedio", "Promedio", convertir=decimal_coma, default=Decimal("0")),
+            Columna("latitud", "Latitud", convertir=decimal_coma),
+            Columna("longitud", "Longitud", convertir=decimal_coma),
+        ],
+        claves=["no"],
+        archivo="data/irradiancia.csv",
+    ),
+    "paneles": CatalogoCSV(
+        "Paneles solares",
+        PanelSolar,
+        [
+            Columna("id_modulo", "PK Id_modulo", "id_modulo", convertir=entero, requerido=True),
+            Columna("marca", "Marca", requerido=True),
+            Columna("modelo", "Modelo", requerido=True),
+            Columna("potencia", "Potencia", convertir=decimal_coma),
+            Columna("voc", "Voc", convertir=decimal_coma),
+            Columna("isc", "Isc", convertir=decimal_coma),
+            Columna("vmp", "Vmp", convertir=decimal_coma),
+            Columna("imp", "Imp", convertir=decimal_coma),
+        ],
+        claves=["id_modulo"],
+        archivo="data/paneles_solares.csv",
+        stream=True,
+    ),
+    "inversores": CatalogoCSV(
+        "Inversores",
+        Inversor,
+        _INVERSOR_COLUMNAS,
+        claves=["marca", "modelo"],
+        archivo="data/inversor.csv",
+        stream=True,
+    ),
+    "micro_inversores": CatalogoCSV(
+        "Micro inversores",
+        MicroInversor,
+        _INVERSOR_COLUMNAS,
+        claves=["marca", "modelo"],
+        archivo="data/microinversor.csv",
+        stream=True,
+    ),
+    "conductores": CatalogoCSV(
+        "Conductores",
+        Conductor,
+        [
+            Columna("id_conductor", convertir=entero, requerido=True),
+            Columna("calibre_cable"),
+            Columna("tubo_1_2_pulgada", "tubo_1/2_pulgada", convertir=entero, default=0),
+            Columna("tubo_3_4_pulgada", "tubo_3/4_pulgada", convertir=entero, default=0),
+            Columna("tubo_1_pulgada", "tubo_1_pulgada", convertir=entero, default=0),
+            Columna("tubo_1_1_4_pulgada", "tubo_1_1/4_pulgada", convertir=entero, default=0),
+            Columna("tubo_1_1_2_pulgada", "tubo_1_1/2_pulgada", convertir=entero, default=0),
+            Columna("tubo_2_pulgada", "tubo_2_pulgada", convertir=entero, default=0),
+            Columna("tubo_2_1_2_pulgada", "tubo_2_1/2_pulgada", convertir=entero, default=0),
+        ],
+        claves=["id_conductor"],
+        archivo="data/conductores.csv",
+    ),
+    "conductores_awg": CatalogoCSV(
+        "Conductores AWG con reactancia",
+        TablaConductoresAWGConReactancia,
+        [
+            Columna("calibre_awg", convertir=entero, requerido=True),
+            Columna("area_transversal", convertir=decimal_coma),
+            Columna("resistencia_cc", convertir=decimal_coma),
+            Columna("resistencia_ca", convertir=decimal_coma),
+            Columna("reactancia", convertir=decimal_coma),
+        ],
+        claves=["calibre_awg"],
+        archivo="data/tabla_conductores_awg_con_reactancia.csv",
+    ),
+    "glosario": CatalogoCSV(
+        "Glosario",
+        GlosarioConcepto,
+        [
+            Columna("nombre_concepto", "termino", requerido=True),
+            Columna("descripcion", "definicion", requerido=True),
+            Columna("formula", "formula"),
+            Columna("categoria", "categoria"),
+            # Misma columna "termino": bulk_create no pasa por GlosarioConcepto.save()
+            Columna("clave_orden", "termino", convertir=_clave_termino),
+        ],
+        claves=["nombre_concepto"],
+        # clave_orden depende solo de la llave: fuera del hash y del UPDATE
+        campos_actualizar=["descripcion", "formula", "categoria"],
+        archivo="data/glosario_fotovoltaico_extendido_swgfv.csv",
+        sincronizar=True,
+    ),
+    # Solo texto: las imágenes las relaciona sincronizar_imagenes_tablas_nom
+    "tablas_nom": CatalogoCSV(
+        "Tablas NOM",
+        TablaNOM,
+        [
+            Columna("nombre_tabla", requerido=True),
+            Columna("notas"),
+        ],
+        claves=["nombre_tabla"],
+        archivo="data/tablas_nom.csv",
+        sincronizar=True,
+    ),
+}
+
+for _clave, _spec in CATALOGOS_CSV.items():
+    _spec.clave = _clave
+
+# Modelo -> declaración (hash de contenido en las ediciones desde la UI)
+CATALOGO_POR_MODELO = {spec.modelo: spec for spec in CATALOGOS_CSV.values()}
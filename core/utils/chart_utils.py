@@ -0,0 +1,160 @@
+# core/utils/chart_utils.py
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from reportlab.graphics import renderSVG
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib.colors import HexColor
+
+from core.utils.cache_utils import CacheNamespace
+
+# =========================================================
+# GRÁFICAS (consumo vs generación) con caché por hash de datos
+# - PDF: Drawing de ReportLab ya expandido (en memoria del proceso;
+#   los Drawing de charts no se pueden serializar con pickle)
+# - HTML: SVG pre-renderizado (en la caché compartida)
+# =========================================================
+CHART_CACHE_VERSION = 2
+CHART_SVG_TIMEOUT = 60 * 60 * 24  # 24 h
+CHART_DRAWING_MAX_ITEMS = 256
+
+COLOR_GENERACION = "#2E86DE"
+COLOR_CONSUMO = "#E67E22"
+COLOR_GENERACION_VS = "#2ECC71"
+
+# Misma familia que el resto del reporte: evita agregar Times-Roman al PDF
+CHART_FONT = "Helvetica"
+
+svg_cache = CacheNamespace("chart_svg", timeout=CHART_SVG_TIMEOUT)
+
+_drawings = OrderedDict()
+_drawings_lock = threading.Lock()
+
+
+def chart_data_hash(kind: str, labels, *series) -> str:
+    """Hash estable de los datos de una gráfica (tipo + etiquetas + series)."""
+    payload = {
+        "v": CHART_CACHE_VERSION,
+        "kind": kind,
+        "labels": [str(x) for x in labels],
+        "series": [[round(float(v or 0), 3) for v in s] for s in series],
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _build_generacion(labels, gen_vals) -> Drawing:
+    d = Drawing(500, 220, initialFontName=CHART_FONT)
+    chart = VerticalBarChart()
+    chart.x = 30
+    chart.y = 30
+    chart.height = 150
+    chart.width = 440
+    chart.data = [list(gen_vals)]
+    chart.categoryAxis.categoryNames = list(labels)
+    chart.valueAxis.valueMin = 0
+    chart.categoryAxis.labels.fontName = CHART_FONT
+    chart.valueAxis.labels.fontName = CHART_FONT
+    chart.bars[0].fillColor = HexColor(COLOR_GENERACION)
+    d.add(chart)
+    return d
+
+
+def _build_generacion_vs_consumo(labels, consumo_vals, gen_vals) -> Drawing:
+    d = Drawing(500, 240, initialFontName=CHART_FONT)
+    chart = VerticalBarChart()
+    chart.x = 30
+    chart.y = 30
+    chart.height = 160
+    chart.width = 440
+    chart.data = [list(consumo_vals), list(gen_vals)]
+    chart.categoryAxis.categoryNames = list(labels)
+    chart.valueAxis.valueMin = 0
+    chart.categoryAxis.labels.fontName = CHART_FONT
+    chart.valueAxis.labels.fontName = CHART_FONT
+    chart.bars[0].fillColor = HexColor(COLOR_CONSUMO)
+    chart.bars[1].fillColor = HexColor(COLOR_GENERACION_VS)
+
+    legend = Legend()
+    legend.x = 360
+    legend.y = 200
+    legend.alignment = "right"
+    legend.fontName = CHART_FONT
+    legend.colorNamePairs = [
+        (HexColor(COLOR_CONSUMO), "Consumo (kWh)"),
+        (HexColor(COLOR_GENERACION_VS), "Generación (kWh)"),
+    ]
+
+    d.add(chart)
+    d.add(legend)
+    return d
+
+
+_BUILDERS = {
+    "generacion": _build_generacion,
+    "generacion_vs_consumo": _build_generacion_vs_consumo,
+}
+
+
+def _get_drawing(kind: str, labels, *series) -> Drawing:
+    key = chart_data_hash(kind, labels, *series)
+
+    with _drawings_lock:
+        d = _drawings.get(key)
+        if d is not None:
+            _drawings.move_to_end(key)
+            return d
+
+    # expandUserNodes() deja solo formas primitivas: el layout del chart
+    # se calcula una sola vez y el Drawing cacheado se dibuja directo.
+    d = _BUILDERS[kind](labels, *series).expandUserNodes()
+
+    with _drawings_lock:
+        _drawings[key] = d
+        _drawings.move_to_end(key)
+        while len(_drawings) > CHART_DRAWING_MAX_ITEMS:
+            _drawings.popitem(last=False)
+    return d
+
+
+def _get_svg(kind: str, labels, *series) -> str:
+    data_hash = chart_data_hash(kind, labels, *series)
+    svg = svg_cache.get(data_hash)
+    if svg is None:
+        svg = renderSVG.drawToString(_get_drawing(kind, labels, *series))
+        # Quitamos la declaración XML/DOCTYPE para poder incrustarlo en el HTML
+        start = svg.find("<svg")
+        svg = svg[start:] if start >= 0 else svg
+        # ids únicos: varias gráficas conviven en la misma página
+        suffix = data_hash[:8]
+        svg = (
+            svg.replace('id="clip"', f'id="clip-{suffix}"')
+            .replace("url(#clip)", f"url(#clip-{suffix})")
+            .replace('id="group"', f'id="group-{suffix}"')
+        )
+        svg_cache.set(data_hash, svg)
+    return svg
+
+
+def drawing_generacion(labels, gen_vals) -> Drawing:
+    """Gráfica 1 (PDF): generación por periodo."""
+    return _get_drawing("generacion", labels, gen_vals)
+
+
+def drawing_generacion_vs_consumo(labels, consumo_vals, gen_vals) -> Drawing:
+    """Gráfica 2 (PDF): consumo vs generación por periodo."""
+    return _get_drawing("generacion_vs_consumo", labels, consumo_vals, gen_vals)
+
+
+def svg_generacion(labels, gen_vals) -> str:
+    """Gráfica 1 (HTML): SVG listo para incrustar."""
+    return _get_svg("generacion", labels, gen_vals)
+
+
+def svg_generacion_vs_consumo(labels, consumo_vals, gen_vals) -> str:
+    """Gráfica 2 (HTML): SVG listo para incrustar."""
+    return _get_svg("generacion_vs_consumo", labels, consumo_vals, gen_vals)
@@ -0,0 +1,69 @@
+# core/utils/fts_sqlite.py
+import logging
+
+from django.db import connections
+
+from core.utils.bitacora import AUDIT_FTS_TABLE, AUDIT_SEARCH_COLUMNS, AUDIT_TABLE
+from core.utils.tablas_busqueda import TABLAS_FTS_TABLE, TABLAS_TABLE
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# TRIGGERS DE LAS TABLAS FTS5 ESPEJO (SQLite)
+# - audit_logs_fts (migración 0029) y tablas_nom_fts (migración 0036)
+#   se mantienen con triggers AFTER INSERT/DELETE/UPDATE
+# - SQLite no tiene ALTER COLUMN: Django reconstruye la tabla (crea
+#   new__<tabla>, copia, borra la original y renombra) y los triggers
+#   se pierden con la tabla borrada
+# - post_migrate (core/signals.py) revisa que existan; si falta alguno
+#   lo vuelve a crear y reconstruye el índice ('rebuild')
+# =========================================================
+# tabla -> (tabla FTS, columnas indexadas, columnas que disparan el UPDATE o None = todas)
+ESPEJOS_FTS = {
+    AUDIT_TABLE: (AUDIT_FTS_TABLE, AUDIT_SEARCH_COLUMNS, None),
+    # Solo cuando cambia el texto (no al guardar imagen, hash o derivados)
+    TABLAS_TABLE: (TABLAS_FTS_TABLE, ["nombre_tabla", "notas"], ["nombre_tabla", "notas"]),
+}
+
+
+def triggers_fts(tabla: str) -> dict:
+    """{nombre del trigger: CREATE TRIGGER} para la tabla espejo de `tabla`."""
+    fts, columnas, columnas_update = ESPEJOS_FTS[tabla]
+    cols = ", ".join(columnas)
+    new_cols = ", ".join(f"new.{c}" for c in columnas)
+    old_cols = ", ".join(f"old.{c}" for c in columnas)
+    borrar = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});"
+    insertar = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});"
+    de_columnas = f" OF {', '.join(columnas_update)}" if columnas_update else ""
+    return {
+        f"{fts}_ai": f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabla} BEGIN {insertar} END",
+        f"{fts}_ad": f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabla} BEGIN {borrar} END",
+        f"{fts}_au": f"CREATE TRIGGER {fts}_au AFTER UPDATE{de_columnas} ON {tabla} BEGIN {borrar} {insertar} END",
+    }
+
+
+def restaurar_triggers_fts(using: str = "default") -> list:
+    """Vuelve a crear los triggers que falten. Devuelve las tablas FTS reconstruidas."""
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return []
+
+    reconstruidas = []
+    with conn.cursor() as c:
+        for tabla, (fts, _, _) in ESPEJOS_FTS.items():
+            c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [fts])
+            if not c.fetchone():
+                continue  # migración aún no aplicada o SQLite sin FTS5
+            c.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [tabla])
+            existentes = {r[0] for r in c.fetchall()}
+            faltan = {n: sql for n, sql in triggers_fts(tabla).items() if n not in existentes}
+            if not faltan:
+                continue
+
+            logger.warning("%s: faltaban los triggers %s; se crean y se reconstruye %s", tabla, ", ".join(faltan), fts)
+            for sql in faltan.values():
+                c.execute(sql)
+            # Las filas escritas sin triggers no están en el índice
+            c.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            reconstruidas.append(fts)
+    return reconstruidas
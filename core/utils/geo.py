@@ -0,0 +1,91 @@
+# core/utils/geo.py
+import math
+import re
+from collections import defaultdict
+
+# Mismo formato que valida ProyectoForm.clean_Coordenadas: "lat, lon"
+_COORDENADAS_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def parsear_coordenadas(texto: str):
+    """(lat, lon) como float, o None si el texto no es válido."""
+    m = _COORDENADAS_RE.match(texto or "")
+    if not m:
+        return None
+    lat, lon = float(m.group(1)), float(m.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+# =========================================================
+# ÍNDICE POR CUADRÍCULA (sitio más cercano)
+# - Los puntos se reparten en cubetas de CUBETA_GRADOS x CUBETA_GRADOS
+# - La búsqueda recorre anillos de cubetas alrededor del punto y se
+#   detiene cuando ningún anillo siguiente puede estar más cerca:
+#   con sitios repartidos por el país se revisan unas pocas cubetas
+# =========================================================
+CUBETA_GRADOS = 2.0
+KM_POR_GRADO = 111.19
+
+
+def distancia_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia sobre la esfera (haversine)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0 * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndiceCuadricula:
+    def __init__(self, puntos, cubeta: float = CUBETA_GRADOS):
+        """puntos: iterable de (lat, lon, valor)."""
+        self.cubeta = cubeta
+        self._cubetas = defaultdict(list)
+        lat_max = 0.0
+        for lat, lon, valor in puntos:
+            self._cubetas[self._clave(lat, lon)].append((lat, lon, valor))
+            lat_max = max(lat_max, abs(lat))
+        self._lat_max = lat_max
+        if self._cubetas:
+            claves = list(self._cubetas)
+            self._i = (min(i for i, _ in claves), max(i for i, _ in claves))
+            self._j = (min(j for _, j in claves), max(j for _, j in claves))
+
+    def __len__(self):
+        return sum(len(v) for v in self._cubetas.values())
+
+    def _clave(self, lat: float, lon: float):
+        return math.floor(lat / self.cubeta), math.floor(lon / self.cubeta)
+
+    def _anillo(self, ci: int, cj: int, r: int):
+        if r == 0:
+            yield ci, cj
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def mas_cercano(self, lat: float, lon: float):
+        """(valor, distancia_km) del punto más cercano, o None si no hay puntos."""
+        if not self._cubetas:
+            return None
+        ci, cj = self._clave(lat, lon)
+        ultimo = max(ci - self._i[0], self._i[1] - ci, cj - self._j[0], self._j[1] - cj)
+        # Cota inferior de km por grado (la longitud se acorta con la latitud)
+        km_grado = KM_POR_GRADO * math.cos(math.radians(min(89.0, max(self._lat_max, abs(lat)))))
+
+        mejor = None
+        for r in range(ultimo + 1):
+            for clave in self._anillo(ci, cj, r):
+                for plat, plon, valor in self._cubetas.get(clave, ()):
+                    d = distancia_km(lat, lon, plat, plon)
+                    if mejor is None or d < mejor[1]:
+                        mejor = (valor, d)
+            # Lo que está en el anillo r+1 o más allá queda a >= r cubetas completas
+            if mejor is not None and mejor[1] <= r * self.cubeta * km_grado:
+                break
+        return mejor
@@ -0,0 +1,114 @@
+# core/utils/glosario_indice.py
+from bisect import bisect_left
+
+from core.utils.catalogos import version_catalogo
+from core.utils.texto import palabras, raiz, sin_acentos
+
+# =========================================================
+# ÍNDICE INVERTIDO DEL GLOSARIO (búsqueda y autocompletar)
+# - raíz de cada palabra -> {id: peso}; el peso depende del campo
+# - Se construye en memoria una vez por proceso y por versión del
+#   catálogo "glosario" (importación o edición desde la UI)
+# - Consulta: todas las palabras deben coincidir (AND); cada una por
+#   raíz exacta o como prefijo de otra raíz (vale la mitad)
+# - Consulta sin palabras: si son símbolos ("φ", "√", "%") se buscan
+#   como texto en nombre y fórmula; si son palabras vacías ("de"),
+#   no hay resultados
+# =========================================================
+PESOS = {
+    "nombre_concepto": 8,
+    "categoria": 3,
+    "formula": 2,
+    "descripcion": 1,
+}
+PESO_PREFIJO = 0.5
+BONO_NOMBRE_EXACTO = 20
+
+
+class IndiceGlosario:
+    def __init__(self, conceptos):
+        """conceptos: iterable de dicts con id, clave_orden y los campos de PESOS."""
+        self.terminos = {}
+        self.docs = {}
+        for c in conceptos:
+            self.docs[c["id"]] = {
+                "id": c["id"],
+                "nombre": c["nombre_concepto"],
+                "categoria": c["categoria"] or "",
+                "categoria_norm": sin_acentos(c["categoria"] or "").strip(),
+                "nombre_norm": " ".join(palabras(c["nombre_concepto"])),
+                "orden": c["clave_orden"],
+                "simbolos": sin_acentos(f"{c['nombre_concepto']} {c['formula'] or ''}"),
+            }
+            for campo, peso in PESOS.items():
+                for p in palabras(c[campo] or ""):
+                    postings = self.terminos.setdefault(raiz(p), {})
+                    # Un término pesa lo de su mejor campo (no se suma por repetición)
+                    postings[c["id"]] = max(postings.get(c["id"], 0), peso)
+        self._ordenados = sorted(self.terminos)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _coincidencias(self, palabra: str) -> dict:
+        """{id: puntaje} de una palabra de la consulta."""
+        r = raiz(palabra)
+        out = dict(self.terminos.get(r, {}))
+        i = bisect_left(self._ordenados, r)
+        while i < len(self._ordenados) and self._ordenados[i].startswith(r):
+            termino = self._ordenados[i]
+            i += 1
+            if termino == r:
+                continue
+            for doc, peso in self.terminos[termino].items():
+                out[doc] = max(out.get(doc, 0), peso * PESO_PREFIJO)
+        return out
+
+    def buscar(self, q: str, categoria: str = "", limite: int = None) -> list:
+        """Ids ordenados por relevancia (y alfabético en empates)."""
+        consulta = palabras(q)
+        categoria_norm = sin_acentos(categoria).strip()
+
+        if consulta:
+            puntajes = None
+            for palabra in consulta:
+                coincidencias = self._coincidencias(palabra)
+                if puntajes is None:
+                    puntajes = coincidencias
+                else:
+                    puntajes = {d: s + coincidencias[d] for d, s in puntajes.items() if d in coincidencias}
+                if not puntajes:
+                    return []
+            frase = " ".join(consulta)
+            for doc in puntajes:
+                if self.docs[doc]["nombre_norm"] == frase:
+                    puntajes[doc] += BONO_NOMBRE_EXACTO
+        elif q.strip():
+            texto = sin_acentos(q).strip()
+            if any(ch.isascii() and ch.isalnum() for ch in texto):
+                # Solo palabras vacías: coincidirían con casi todo
+                return []
+            puntajes = {d: 0 for d, doc in self.docs.items() if texto in doc["simbolos"]}
+        else:
+            puntajes = dict.fromkeys(self.docs, 0)
+
+        if categoria_norm:
+            puntajes = {d: s for d, s in puntajes.items() if self.docs[d]["categoria_norm"] == categoria_norm}
+
+        ids = sorted(puntajes, key=lambda d: (-puntajes[d], self.docs[d]["orden"]))
+        return ids[:limite] if limite else ids
+
+
+_indice = {"version": None, "indice": None}
+
+
+def indice_glosario() -> IndiceGlosario:
+    from core.models import GlosarioConcepto
+
+    version = version_catalogo("glosario")
+    if _indice["indice"] is None or _indice["version"] != version:
+        _indice["indice"] = IndiceGlosario(
+            GlosarioConcepto.objects.values("id", "clave_orden", *PESOS).iterator(chunk_size=2000)
+        )
+        _indice["version"] = version
+    return _indice["indice"]
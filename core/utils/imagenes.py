@@ -0,0 +1,119 @@
+# core/utils/imagenes.py
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# =========================================================
+# DERIVADOS DE LAS IMÁGENES DE TABLAS NOM
+# - miniatura: vista previa en listas / modificación
+# - web: ancho de pantalla en WebP (lo que normalmente se descarga)
+# - original: solo para el visor con zoom
+# Los nombres llevan el hash del contenido original: dos tablas con la
+# misma imagen comparten archivos y regenerar no duplica nada.
+# =========================================================
+DERIVADOS_DIR = "tablas_nom/derivados"
+MINIATURA_ANCHO = 320
+WEB_ANCHO = 1600
+WEBP_CALIDAD = 80
+
+# Ancho de la imagen en recursos_tablas (col-lg-5 de la página)
+SIZES_TABLA = "(min-width: 992px) 40vw, 100vw"
+
+
+def _para_webp(img):
+    if img.mode in ("RGB", "RGBA"):
+        return img
+    alfa = "A" in img.getbands() or (img.mode == "P" and "transparency" in img.info)
+    return img.convert("RGBA" if alfa else "RGB")
+
+
+def _webp(img, ancho: int) -> bytes:
+    if img.width > ancho:
+        img = img.resize((ancho, max(1, round(img.height * ancho / img.width))), Image.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, "WEBP", quality=WEBP_CALIDAD)
+    return buf.getvalue()
+
+
+def nombre_derivado(digest: str, ancho: int) -> str:
+    return f"{DERIVADOS_DIR}/{digest[:24]}_{ancho}.webp"
+
+
+def generar_derivados(tabla, forzar: bool = False) -> bool:
+    """
+    Crea (o reutiliza) miniatura y WebP de tabla.imagen y guarda sus nombres.
+    Devuelve False si la imagen no cambió desde la última vez.
+    Se guarda con update() para no disparar las señales del catálogo.
+    """
+    if not tabla.imagen:
+        return False
+
+    with tabla.imagen.open("rb") as f:
+        datos = f.read()
+    digest = hashlib.sha256(datos).hexdigest()
+
+    if not forzar and digest == tabla.imagen_hash and tabla.imagen_web and tabla.imagen_miniatura:
+        return False
+
+    with Image.open(BytesIO(datos)) as img:
+        # Fotos de teléfono: la orientación viene en EXIF
+        img = _para_webp(ImageOps.exif_transpose(img))
+        campos = {"imagen_hash": digest, "imagen_ancho": img.width}
+
+        for campo, ancho in (("imagen_miniatura", MINIATURA_ANCHO), ("imagen_web", WEB_ANCHO)):
+            nombre = nombre_derivado(digest, ancho)
+            if forzar and default_storage.exists(nombre):
+                default_storage.delete(nombre)
+            if not default_storage.exists(nombre):
+                nombre = default_storage.save(nombre, ContentFile(_webp(img, ancho)))
+            campos[campo] = nombre
+
+    type(tabla).objects.filter(pk=tabla.pk).update(**campos)
+    for campo, valor in campos.items():
+        setattr(tabla, campo, valor)
+    return True
+
+
+def _url(archivo) -> str:
+    try:
+        return archivo.url if archivo else ""
+    except Exception:
+        return ""
+
+
+def fuentes_tabla(tabla) -> dict:
+    """
+    URLs para <img>: src (WebP), srcset por ancho, miniatura y original.
+    Si la tabla aún no tiene derivados todo apunta al original.
+    """
+    original = _url(tabla.imagen)
+    if not original:
+        return {}
+
+    web = _url(tabla.imagen_web)
+    miniatura = _url(tabla.imagen_miniatura)
+    ancho = tabla.imagen_ancho or 0
+    if not (web and miniatura and ancho):
+        return {"src": original, "srcset": "", "miniatura": original, "original": original}
+
+    por_ancho = {min(ancho, MINIATURA_ANCHO): miniatura, min(ancho, WEB_ANCHO): web}
+    if ancho > WEB_ANCHO:
+        por_ancho[ancho] = original
+
+    return {
+        "src": web,
+        "srcset": ", ".join(f"{url} {w}w" for w, url in sorted(por_ancho.items())),
+        "sizes": SIZES_TABLA,
+        "miniatura": miniatura,
+        "original": original,
+    }
+
+
+def derivados_en_uso(modelo) -> set:
+    nombres = set()
+    for mini, web in modelo.objects.values_list("imagen_miniatura", "imagen_web"):
+        nombres.update(n for n in (mini, web) if n)
+    return nombres
@@ -0,0 +1,652 @@
+# core/utils/importacion.py
+import codecs
+import csv
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import ProtectedError
+
+from core.utils.catalogos import carga_masiva, registrar_version
+
+# =========================================================
+# CARGA DE CATÁLOGOS DESDE CSV
+# - Cada catálogo se declara con sus columnas (encabezados aceptados
+#   + conversión) y su llave natural (campos únicos)
+# - Escritura con bulk_create(update_conflicts=True) en lotes
+# - --dry-run: diff contra la BD (nuevos / cambiados / eliminados)
+# - Tiempo por fase: lectura, comparación, escritura
+# - Delta: cada fila guarda content_hash; solo se escriben las filas
+#   nuevas o cambiadas y cada carga registra un CatalogVersion
+# - --stream (catálogos grandes): lotes fijos, conversión en procesos
+#   de trabajo, memoria acotada y checkpoint para reanudar
+# =========================================================
+
+
+class ErrorImportacion(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# Reparación de codificación
+# - Archivo: si no es UTF-8 válido se lee como cp1252 (exportado de Excel)
+# - Texto: UTF-8 que alguien guardó como Latin-1 ("mÃ¡ximo" -> "máximo")
+# ---------------------------------------------------------
+_MOJIBAKE = ("Ã", "Â")
+
+
+def reparar_mojibake(s: str) -> str:
+    if not s or not any(m in s for m in _MOJIBAKE):
+        return s
+    for enc in ("cp1252", "latin-1"):
+        try:
+            return s.encode(enc).decode("utf-8")
+        except UnicodeError:
+            continue
+    return s
+
+
+def detectar_encoding(path: Path, muestra: int = 1 << 20) -> str:
+    with open(path, "rb") as f:
+        data = f.read(muestra)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def abrir_csv(path: Path, encoding: str = None):
+    encoding = encoding or detectar_encoding(path)
+    errors = "strict" if encoding.startswith("utf-8") else "replace"
+    return open(path, "r", encoding=encoding, errors=errors, newline="")
+
+
+def norm_header(s: str) -> str:
+    """Encabezado comparable: sin acentos, minúsculas y solo letras/números."""
+    s = unicodedata.normalize("NFKD", reparar_mojibake((s or "").strip()).lower())
+    return "".join(ch for ch in s if ch.isalnum() and not unicodedata.combining(ch))
+
+
+# ---------------------------------------------------------
+# Conversiones: None si viene vacío, ValueError si es inválido
+# ---------------------------------------------------------
+def texto(val):
+    return reparar_mojibake((val or "").strip())
+
+
+def entero(val):
+    val = (val or "").strip()
+    if val == "":
+        return None
+    try:
+        return int(Decimal(val.replace(",", ".")))  # tolera "1.0"
+    except InvalidOperation:
+        raise ValueError(f"no es un entero: {val!r}")
+
+
+def decimal_coma(val):
+    val = (val or "").strip().replace(",", ".")
+    if val == "":
+        return None
+    try:
+        return Decimal(val)
+    except InvalidOperation:
+        raise ValueError(f"no es un número: {val!r}")
+
+
+class Columna:
+    def __init__(self, campo: str, *encabezados, convertir=texto, requerido: bool = False, default=None):
+        self.campo = campo
+        self.encabezados = encabezados or (campo,)
+        self.convertir = convertir
+        self.requerido = requerido
+        self.default = default
+
+
+class CatalogoCSV:
+    def __init__(
+        self,
+        nombre: str,
+        modelo,
+        columnas: list,
+        claves: list,
+        archivo: str,
+        sincronizar: bool = False,
+        campos_actualizar: list = None,
+        encoding: str = None,
+        stream: bool = False,
+    ):
+        self.nombre = nombre
+        self.modelo = modelo
+        self.columnas = columnas
+        self.claves = claves
+        self.archivo = archivo
+        # sincronizar: lo que no esté en el CSV se elimina de la tabla
+        self.sincronizar = sincronizar
+        self.campos_actualizar = campos_actualizar or [
+            c.campo for c in columnas if c.campo not in claves
+        ]
+        # None: se detecta (UTF-8 o cp1252)
+        self.encoding = encoding
+        # stream: admite el modo masivo (--stream)
+        self.stream = stream
+        # Nombre en CATALOGOS_CSV / CatalogVersion (lo asigna catalogos_csv)
+        self.clave = ""
+
+    def resolver_columnas(self, fieldnames) -> dict:
+        """{campo: encabezado real del CSV}. Error si falta una columna requerida."""
+        por_norm = {norm_header(h): h for h in fieldnames or []}
+        mapa = {}
+        for col in self.columnas:
+            for enc in col.encabezados:
+                real = por_norm.get(norm_header(enc))
+                if real is not None:
+                    mapa[col.campo] = real
+                    break
+        faltan = [c.encabezados[0] for c in self.columnas if c.requerido and c.campo not in mapa]
+        if faltan:
+            raise ErrorImportacion(
+                f"El CSV no tiene las columnas esperadas: {faltan}. Encontradas: {list(fieldnames or [])}"
+            )
+        return mapa
+
+    def convertir_fila(self, raw: dict, mapa: dict) -> dict:
+        return convertir_fila(self.columnas, raw, mapa)
+
+    def llave(self, fila: dict) -> tuple:
+        return tuple(fila[c] for c in self.claves)
+
+    def formato_hash(self) -> list:
+        return formato_hash(self.modelo, self.claves + self.campos_actualizar)
+
+
+def convertir_fila(columnas: list, raw: dict, mapa: dict) -> dict:
+    fila = {}
+    for col in columnas:
+        encabezado = mapa.get(col.campo)
+        valor = col.convertir(raw.get(encabezado)) if encabezado else None
+        if valor in (None, "") and col.requerido:
+            raise ValueError(f"sin {col.encabezados[0]}")
+        fila[col.campo] = col.default if valor is None else valor
+    return fila
+
+
+# ---------------------------------------------------------
+# Hash de contenido: mismo valor venga del CSV o de la BD
+# (decimales con los decimal_places del campo, None == "")
+# ---------------------------------------------------------
+def formato_hash(modelo, campos: list) -> list:
+    """[(campo, decimal_places o None)] en el orden del hash."""
+    out = []
+    for campo in campos:
+        field = modelo._meta.get_field(campo)
+        out.append((campo, getattr(field, "decimal_places", None)))
+    return out
+
+
+def hash_fila(formato: list, fila: dict) -> str:
+    partes = []
+    for campo, dp in formato:
+        v = fila.get(campo)
+        if v is None or v == "":
+            partes.append("")
+        elif dp is not None:
+            partes.append(format(Decimal(str(v)).quantize(Decimal(1).scaleb(-dp)), "f"))
+        else:
+            partes.append(str(v))
+    return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+
+def hash_instancia(spec, obj) -> str:
+    formato = spec.formato_hash()
+    return hash_fila(formato, {c: getattr(obj, c) for c, _ in formato})
+
+
+class ResultadoImportacion:
+    def __init__(self, catalogo: str):
+        self.catalogo = catalogo
+        self.nuevos = 0
+        self.actualizados = 0
+        self.sin_cambios = 0
+        self.eliminados = 0
+        self.omitidos = 0
+        self.ausentes = 0    # en BD pero no en el CSV (catálogos sin sincronizar)
+        self.version = None
+        self.errores = []    # (fila, mensaje)
+        self.cambios = []    # (llave, {campo: (antes, después)}) solo en dry-run
+        self.tiempos = {}
+        self.reanudado_desde = 0  # fila del checkpoint (--stream)
+
+    def resumen(self) -> str:
+        partes = [f"Nuevos: {self.nuevos}", f"Actualizados: {self.actualizados}"]
+        if self.sin_cambios:
+            partes.append(f"Sin cambios: {self.sin_cambios}")
+        partes += [f"Eliminados: {self.eliminados}", f"Omitidos: {self.omitidos}"]
+        if self.ausentes:
+            partes.append(f"No están en el CSV: {self.ausentes}")
+        return " | ".join(partes)
+
+    @property
+    def hubo_cambios(self) -> bool:
+        return bool(self.nuevos or self.actualizados or self.eliminados)
+
+    def resumen_tiempos(self) -> str:
+        return " | ".join(f"{fase}: {seg * 1000:.0f} ms" for fase, seg in self.tiempos.items())
+
+
+class _fase:
+    """Suma el tiempo del bloque a resultado.tiempos[nombre]."""
+
+    def __init__(self, resultado: ResultadoImportacion, nombre: str):
+        self.resultado = resultado
+        self.nombre = nombre
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        t = self.resultado.tiempos
+        t[self.nombre] = t.get(self.nombre, 0.0) + time.perf_counter() - self._start
+        return False
+
+
+def leer_csv(spec: CatalogoCSV, path: Path, resultado: ResultadoImportacion) -> dict:
+    """{llave: fila convertida}. Si una llave se repite gana la última fila."""
+    filas = {}
+    with abrir_csv(path, spec.encoding) as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames:
+            raise ErrorImportacion("El CSV no tiene encabezados (fila 1).")
+        mapa = spec.resolver_columnas(reader.fieldnames)
+
+        for i, raw in enumerate(reader, start=2):
+            try:
+                fila = spec.convertir_fila(raw, mapa)
+            except (ValueError, ArithmeticError) as e:
+                resultado.omitidos += 1
+                resultado.errores.append((i, str(e)))
+                continue
+            llave = spec.llave(fila)
+            if llave in filas:
+                resultado.errores.append((i, f"llave repetida {llave}: se usa esta fila"))
+            filas[llave] = fila
+    return filas
+
+
+def _diff(spec: CatalogoCSV, filas: dict, resultado: ResultadoImportacion):
+    campos = spec.claves + spec.campos_actualizar
+    actuales = {
+        spec.llave(r): r for r in spec.modelo.objects.values(*campos).iterator(chunk_size=2000)
+    }
+    for llave, fila in filas.items():
+        antes = actuales.get(llave)
+        if antes is None:
+            resultado.nuevos += 1
+            continue
+        cambios = {
+            c: (antes[c], fila[c]) for c in spec.campos_actualizar if antes[c] != fila[c]
+        }
+        if cambios:
+            resultado.actualizados += 1
+            resultado.cambios.append((llave, cambios))
+        else:
+            resultado.sin_cambios += 1
+    if spec.sincronizar:
+        resultado.eliminados = sum(1 for k in actuales if k not in filas)
+
+
+def cargar_catalogo(
+    spec: CatalogoCSV,
+    path: Path,
+    dry_run: bool = False,
+    batch_size: int = 500,
+    limpiar: bool = False,
+) -> ResultadoImportacion:
+    resultado = ResultadoImportacion(spec.nombre)
+
+    with _fase(resultado, "lectura"):
+        filas = leer_csv(spec, path, resultado)
+
+    if dry_run:
+        with _fase(resultado, "comparacion"):
+            if limpiar:
+                resultado.nuevos = len(filas)
+                resultado.eliminados = spec.modelo.objects.count()
+            else:
+                _diff(spec, filas, resultado)
+        return resultado
+
+    modelo = spec.modelo
+    formato = spec.formato_hash()
+    with _fase(resultado, "comparacion"):
+        existentes = {}
+        if not limpiar:
+            campos = ("pk", "content_hash", *spec.claves)
+            for row in modelo.objects.values_list(*campos).iterator(chunk_size=5000):
+                existentes[tuple(row[2:])] = (row[0], row[1])
+
+        escribir = []
+        for llave, fila in filas.items():
+            fila["content_hash"] = hash_fila(formato, fila)
+            actual = existentes.get(llave)
+            if actual is None:
+                resultado.nuevos += 1
+            elif actual[1] != fila["content_hash"]:
+                resultado.actualizados += 1
+            else:
+                resultado.sin_cambios += 1
+                continue
+            escribir.append(fila)
+
+        ausentes = [pk for k, (pk, _) in existentes.items() if k not in filas]
+        borrar = ausentes if spec.sincronizar else []
+        if not spec.sincronizar:
+            resultado.ausentes = len(ausentes)
+
+    with _fase(resultado, "escritura"), carga_masiva(), transaction.atomic():
+        if limpiar:
+            resultado.eliminados, _ = modelo.objects.all().delete()
+
+        for i in range(0, len(borrar), batch_size):
+            n, _ = modelo.objects.filter(pk__in=borrar[i:i + batch_size]).delete()
+            resultado.eliminados += n
+
+        if escribir:
+            modelo.objects.bulk_create(
+                [modelo(**fila) for fila in escribir],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=spec.claves,
+                update_fields=spec.campos_actualizar + ["content_hash"],
+            )
+
+        resultado.version = registrar_version(spec.clave, resultado, path.name, len(filas))
+
+    return resultado
+
+
+# =========================================================
+# MODO MASIVO (--stream)
+# - El proceso principal lee lotes de `chunk` filas y guarda el offset
+#   del archivo al final de cada lote
+# - Los procesos de trabajo solo convierten (sin BD)
+# - Se escribe en orden, un lote por transacción; tras cada lote se
+#   actualiza el checkpoint -> si se interrumpe, se reanuda desde ahí
+# - Como máximo 2 lotes por proceso en vuelo (memoria acotada)
+# =========================================================
+def _convertir_lote(columnas, claves, formato, mapa, header, lote):
+    filas, errores = {}, []
+    for fila_no, valores in lote:
+        try:
+            fila = convertir_fila(columnas, dict(zip(header, valores)), mapa)
+        except (ValueError, ArithmeticError) as e:
+            errores.append((fila_no, str(e)))
+            continue
+        fila["content_hash"] = hash_fila(formato, fila)
+        # Dentro de un INSERT ... ON CONFLICT la llave no puede repetirse
+        filas[tuple(fila[c] for c in claves)] = fila
+    return list(filas.values()), errores
+
+
+def _hashes_existentes(spec: CatalogoCSV, filas: list) -> dict:
+    """{llave: content_hash} de las filas del lote que ya están en la BD."""
+    filtro = {
+        f"{c}__in": {f[c] for f in filas} for c in spec.claves
+    }
+    # Con llave compuesta el filtro trae de más; se cruza por llave completa
+    return {
+        tuple(row[1:]): row[0]
+        for row in spec.modelo.objects.filter(**filtro).values_list("content_hash", *spec.claves)
+    }
+
+
+def _leer_lotes(f, chunk: int, fila_inicial: int):
+    """(lote, offset al terminar el lote, siguiente número de fila)."""
+    # readline (no next(f)) para poder usar f.tell() entre registros
+    reader = csv.reader(iter(f.readline, ""))
+    lote, fila_no = [], fila_inicial
+    for valores in reader:
+        if valores:
+            lote.append((fila_no, valores))
+        fila_no += 1
+        if len(lote) >= chunk:
+            yield lote, f.tell(), fila_no
+            lote = []
+    if lote:
+        yield lote, f.tell(), fila_no
+
+
+def _firma_archivo(path: Path) -> dict:
+    st = path.stat()
+    return {"archivo": str(path), "tamano": st.st_size, "mtime": st.st_mtime}
+
+
+def _leer_checkpoint(checkpoint: Path, spec: CatalogoCSV, firma: dict):
+    if not checkpoint.exists():
+        return None
+    try:
+        data = json.loads(checkpoint.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("catalogo") != spec.nombre or any(data.get(k) != v for k, v in firma.items()):
+        # Otro archivo u otra versión del mismo: se empieza de cero
+        return None
+    return data
+
+
+def _guardar_checkpoint(checkpoint: Path, data: dict):
+    tmp = checkpoint.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, checkpoint)
+
+
+def cargar_catalogo_stream(
+    spec: CatalogoCSV,
+    path: Path,
+    chunk: int = 5000,
+    workers: int = 0,
+    checkpoint: Path = None,
+    reiniciar: bool = False,
+    batch_size: int = 1000,
+) -> ResultadoImportacion:
+    resultado = ResultadoImportacion(spec.nombre)
+    modelo = spec.modelo
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    checkpoint = checkpoint or path.with_name(path.name + ".checkpoint.json")
+
+    firma = _firma_archivo(path)
+    estado = None if reiniciar else _leer_checkpoint(checkpoint, spec, firma)
+    encoding = (estado or {}).get("encoding") or spec.encoding or detectar_encoding(path)
+    formato = spec.formato_hash()
+    total = 0
+    if estado:
+        total = estado.get("filas", 0)
+        for k in ("nuevos", "actualizados", "sin_cambios"):
+            setattr(resultado, k, estado.get(k, 0))
+
+    def escribir(filas, errores, offset, fila_no):
+        nonlocal total
+        resultado.omitidos += len(errores)
+        resultado.errores.extend(errores)
+        total += len(filas)
+
+        with _fase(resultado, "comparacion"):
+            actuales = _hashes_existentes(spec, filas) if filas else {}
+            cambiadas = []
+            for fila in filas:
+                h = actuales.get(spec.llave(fila))
+                if h is None:
+                    resultado.nuevos += 1
+                elif h != fila["content_hash"]:
+                    resultado.actualizados += 1
+                else:
+                    resultado.sin_cambios += 1
+                    continue
+                cambiadas.append(fila)
+
+        with _fase(resultado, "escritura"), carga_masiva(), transaction.atomic():
+            if cambiadas:
+                modelo.objects.bulk_create(
+                    [modelo(**fila) for fila in cambiadas],
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=spec.claves,
+                    update_fields=spec.campos_actualizar + ["content_hash"],
+                )
+        _guardar_checkpoint(checkpoint, {
+            **firma,
+            "catalogo": spec.nombre,
+            "encoding": encoding,
+            "offset": offset,
+            "fila": fila_no,
+            "filas": total,
+            "nuevos": resultado.nuevos,
+            "actualizados": resultado.actualizados,
+            "sin_cambios": resultado.sin_cambios,
+        })
+
+    # Los procesos hijos no deben heredar conexiones abiertas
+    connections.close_all()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    en_vuelo = deque()
+
+    try:
+        with abrir_csv(path, encoding) as f:
+            header = next(csv.reader([f.readline()]), [])
+            if not header:
+                raise ErrorImportacion("El CSV no tiene encabezados (fila 1).")
+            mapa = spec.resolver_columnas(header)
+            fila_inicial = 2
+            if estado:
+                f.seek(estado["offset"])
+                fila_inicial = resultado.reanudado_desde = estado["fila"]
+
+            lotes = _leer_lotes(f, max(1, chunk), fila_inicial)
+            while True:
+                with _fase(resultado, "lectura"):
+                    siguiente = next(lotes, None)
+                if siguiente is None:
+                    break
+                lote, offset, fila_no = siguiente
+                args = (spec.columnas, spec.claves, formato, mapa, header, lote)
+
+                if pool is None:
+                    with _fase(resultado, "conversion"):
+                        filas, errores = _convertir_lote(*args)
+                    escribir(filas, errores, offset, fila_no)
+                    continue
+
+                en_vuelo.append((pool.submit(_convertir_lote, *args), offset, fila_no))
+                if len(en_vuelo) >= workers * 2:
+                    fut, off, fno = en_vuelo.popleft()
+                    with _fase(resultado, "conversion"):
+                        filas, errores = fut.result()
+                    escribir(filas, errores, off, fno)
+
+            while en_vuelo:
+                fut, off, fno = en_vuelo.popleft()
+                with _fase(resultado, "conversion"):
+                    filas, errores = fut.result()
+                escribir(filas, errores, off, fno)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # Terminó completo: el checkpoint ya no sirve
+    checkpoint.unlink(missing_ok=True)
+
+    # En modo masivo no se buscan filas ausentes (haría falta todo el CSV en memoria)
+    resultado.version = registrar_version(spec.clave, resultado, path.name, total)
+    return resultado
+
+
+# =========================================================
+# Comando base: los import_* solo declaran qué catálogos cargan
+# =========================================================
+class ImportarCSVCommand(BaseCommand):
+    catalogos = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", nargs="?", type=str, default="", help="Ruta del CSV relativa al proyecto.")
+        parser.add_argument("--file", type=str, default="", help="Igual que csv_path.")
+        parser.add_argument("--clear", action="store_true", help="Borra la tabla antes de importar.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo muestra el diff contra la BD.")
+        parser.add_argument("--batch", type=int, default=500, help="Filas por INSERT (default 500).")
+        parser.add_argument("--stream", action="store_true", help="Modo masivo por lotes con checkpoint (catálogos grandes).")
+        parser.add_argument("--chunk", type=int, default=5000, help="Filas por lote en --stream (default 5000).")
+        parser.add_argument("--workers", type=int, default=0, help="Procesos de conversión en --stream (default CPUs-1).")
+        parser.add_argument("--reiniciar", action="store_true", help="Ignora el checkpoint y empieza desde la fila 1.")
+
+    def rutas(self, options) -> dict:
+        """{catálogo: ruta indicada}. Los comandos de varios archivos la redefinen."""
+        ruta = (options["csv_path"] or options["file"] or "").strip()
+        if ruta and len(self.catalogos) > 1:
+            raise CommandError("Este comando importa varios archivos; no acepta una ruta.")
+        return {nombre: ruta for nombre in self.catalogos}
+
+    def handle(self, *args, **options):
+        from core.utils.catalogos_csv import CATALOGOS_CSV
+
+        rutas = self.rutas(options)
+        for nombre in self.catalogos:
+            spec = CATALOGOS_CSV[nombre]
+            path = (Path(settings.BASE_DIR) / (rutas.get(nombre) or spec.archivo)).resolve()
+            if not path.exists():
+                raise CommandError(f"No existe el archivo: {path}")
+
+            try:
+                if options["stream"]:
+                    if not spec.stream or options["dry_run"] or options["clear"]:
+                        raise CommandError(f"{spec.nombre}: --stream no aplica a este catálogo ni con --dry-run/--clear.")
+                    resultado = cargar_catalogo_stream(
+                        spec,
+                        path,
+                        chunk=options["chunk"],
+                        workers=max(0, options["workers"]),
+                        reiniciar=options["reiniciar"],
+                        batch_size=max(1, options["batch"]),
+                    )
+                else:
+                    resultado = cargar_catalogo(
+                        spec,
+                        path,
+                        dry_run=options["dry_run"],
+                        batch_size=max(1, options["batch"]),
+                        limpiar=options["clear"],
+                    )
+            except ErrorImportacion as e:
+                raise CommandError(f"{spec.nombre}: {e}")
+            except ProtectedError:
+                raise CommandError(
+                    f"{spec.nombre}: hay registros en uso por proyectos; no se puede borrar la tabla (--clear)."
+                )
+
+            self.reportar(resultado, options["dry_run"])
+
+    def reportar(self, resultado: ResultadoImportacion, dry_run: bool):
+        for fila, msg in resultado.errores:
+            self.stdout.write(self.style.WARNING(f"Fila {fila}: {msg}"))
+
+        if dry_run:
+            for llave, cambios in resultado.cambios:
+                detalle = ", ".join(f"{c}: {a!r} -> {d!r}" for c, (a, d) in cambios.items())
+                self.stdout.write(f"  ~ {llave}: {detalle}")
+
+        if resultado.version is not None:
+            self.stdout.write(f"   Versión del catálogo: {resultado.version}")
+        if resultado.reanudado_desde:
+            self.stdout.write(f"   Reanudado desde la fila {resultado.reanudado_desde} (checkpoint)")
+
+        prefijo = "[dry-run] " if dry_run else "✅ "
+        self.stdout.write(self.style.SUCCESS(f"{prefijo}{resultado.catalogo} -> {resultado.resumen()}"))
+        self.stdout.write(f"   Tiempos: {resultado.resumen_tiempos()}")
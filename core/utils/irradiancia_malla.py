@@ -0,0 +1,234 @@
+# core/utils/irradiancia_malla.py
+import calendar
+import json
+import logging
+import math
+import os
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+from core.utils.geo import parsear_coordenadas
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional: sin numpy solo se usa el catálogo por ciudad
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# MALLAS DE IRRADIANCIA (GHI) EN DISCO
+# <SWGFV_IRRADIANCIA_MALLA_DIR>/<nombre>/
+#   ghi-<versión>.npy  float32 (nlat, nlon, nt); nt = 12 (mensual) o 8760 (horario)
+#   meta.json          origen de la malla (lat0/lon0 = centro de la celda 0,0), paso,
+#                      unidades y "archivo" = el .npy de esa versión
+# - meta.json es el único puntero: al reemplazarlo se publican juntos el
+#   arreglo y su origen (nunca un ghi nuevo con el origen anterior)
+# - Mensual: kWh/m²/día (mismas unidades que Irradiancia.ene..dic)
+# - Horario: W/m² promedio de cada hora de un año típico (365 días)
+# Cada proceso abre el .npy con np.load(mmap_mode="r"): no hay lecturas a
+# la BD por request y el sistema operativo comparte las páginas del archivo
+# entre workers. Celdas sin dato = NaN.
+# =========================================================
+MESES = ["ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"]
+DIAS_MES = [calendar.monthrange(2023, m)[1] for m in range(1, 13)]
+HORAS_ANIO = 24 * sum(DIAS_MES)
+PASOS_VALIDOS = (12, HORAS_ANIO)
+
+
+def disponible() -> bool:
+    return np is not None
+
+
+def directorio() -> Path:
+    return Path(settings.SWGFV_IRRADIANCIA_MALLA_DIR)
+
+
+def malla_activa() -> str:
+    """Nombre de la malla configurada si se puede usar en este proceso."""
+    nombre = settings.SWGFV_IRRADIANCIA_MALLA
+    return nombre if nombre and obtener_malla(nombre) else ""
+
+
+def _indice(meta: dict, lat: float, lon: float):
+    if math.isnan(lat) or math.isnan(lon):
+        return None
+    i = round((lat - meta["lat0"]) / meta["dlat"])
+    j = round((lon - meta["lon0"]) / meta["dlon"])
+    if 0 <= i < meta["nlat"] and 0 <= j < meta["nlon"]:
+        return i, j
+    return None
+
+
+def _mensual_desde_horario(serie) -> list:
+    out = []
+    inicio = 0
+    for dias in DIAS_MES:
+        fin = inicio + dias * 24
+        # Wh/m² del mes -> kWh/m²/día
+        out.append(float(np.nansum(serie[inicio:fin])) / dias / 1000.0)
+        inicio = fin
+    return out
+
+
+class CeldaIrradiancia:
+    """Celda de la malla con la misma interfaz que una fila de Irradiancia (ene..dic, promedio)."""
+
+    def __init__(self, malla: str, lat: float, lon: float, mensual: list):
+        for mes, valor in zip(MESES, mensual):
+            setattr(self, mes, round(valor, 3))
+        self.promedio = round(sum(mensual) / 12.0, 3)
+        self.lat = lat
+        self.lon = lon
+        self.ciudad = f"Malla {malla}"
+        self.estado = f"{lat:.4f}, {lon:.4f}"
+
+    def __str__(self):
+        return f"{self.ciudad} ({self.estado})"
+
+
+def _firma(archivo: Path):
+    """Identifica una publicación de meta.json (os.replace crea un inodo nuevo)."""
+    st = archivo.stat()
+    return st.st_ino, st.st_mtime_ns
+
+
+class Malla:
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.ruta = directorio() / nombre
+        archivo_meta = self.ruta / "meta.json"
+        self.firma = _firma(archivo_meta)
+        self.meta = json.loads(archivo_meta.read_text(encoding="utf-8"))
+        # Mallas publicadas antes de versionar el archivo: ghi.npy
+        archivo = self.ruta / self.meta.get("archivo", "ghi.npy")
+        self.ghi = np.load(archivo, mmap_mode="r")
+        if list(self.ghi.shape) != [self.meta["nlat"], self.meta["nlon"], self.meta["nt"]]:
+            raise ValueError(f"malla {nombre}: meta.json no corresponde a {archivo.name}")
+
+    def celda(self, lat: float, lon: float):
+        idx = _indice(self.meta, lat, lon)
+        if idx is None:
+            return None
+        serie = np.asarray(self.ghi[idx], dtype="float64")
+        if np.isnan(serie).all():
+            return None
+        mensual = serie.tolist() if self.meta["nt"] == 12 else _mensual_desde_horario(serie)
+        i, j = idx
+        return CeldaIrradiancia(
+            self.nombre,
+            self.meta["lat0"] + i * self.meta["dlat"],
+            self.meta["lon0"] + j * self.meta["dlon"],
+            mensual,
+        )
+
+
+_abiertas = {}
+
+
+def obtener_malla(nombre: str):
+    """Malla abierta (una vez por proceso; se reabre si se importó de nuevo)."""
+    if np is None or not nombre:
+        return None
+    try:
+        firma = _firma(directorio() / nombre / "meta.json")
+    except OSError:
+        return None
+
+    malla = _abiertas.get(nombre)
+    if malla is None or malla.firma != firma:
+        try:
+            malla = Malla(nombre)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("No se pudo abrir la malla de irradiancia %s: %s", nombre, e)
+            return None
+        _abiertas[nombre] = malla
+    return malla
+
+
+def celda_proyecto(proyecto, nombre: str):
+    coords = parsear_coordenadas(proyecto.Coordenadas)
+    malla = obtener_malla(nombre)
+    if not coords or not malla:
+        return None
+    return malla.celda(*coords)
+
+
+def irradiancia_para_calculo(np_registro):
+    """
+    Lo que usa el cálculo de módulos: la celda de la malla en las coordenadas
+    del proyecto si el registro la pidió y hay dato; si no, la fila de ciudad.
+    """
+    if np_registro.malla_irradiancia:
+        celda = celda_proyecto(np_registro.proyecto, np_registro.malla_irradiancia)
+        if celda:
+            return celda
+    return np_registro.irradiancia
+
+
+# =========================================================
+# ESCRITURA (importar_irradiancia_malla)
+# =========================================================
+class EscrituraMalla:
+    """
+    Crea ghi-<versión>.npy (memmap, sin cargar la malla en RAM) y lo publica
+    reemplazando meta.json: los workers siguen leyendo la versión anterior
+    hasta que termina la importación.
+    """
+
+    def __init__(self, nombre: str, lat0: float, lon0: float, dlat: float, dlon: float,
+                 nlat: int, nlon: int, nt: int, origen: str = ""):
+        if nt not in PASOS_VALIDOS:
+            raise ValueError(f"la malla debe tener 12 valores mensuales o {HORAS_ANIO} horarios (tiene {nt})")
+        self.ruta = directorio() / nombre
+        self.ruta.mkdir(parents=True, exist_ok=True)
+        self.meta = {
+            "nombre": nombre,
+            "lat0": lat0, "lon0": lon0, "dlat": dlat, "dlon": dlon,
+            "nlat": nlat, "nlon": nlon, "nt": nt,
+            "unidades": "kWh/m2/dia" if nt == 12 else "W/m2",
+            "origen": origen,
+        }
+        self.archivo = f"ghi-{uuid.uuid4().hex[:12]}.npy"
+        self.meta["archivo"] = self.archivo
+        self._tmp = self.ruta / f"{self.archivo}.tmp"
+        self.ghi = np.lib.format.open_memmap(self._tmp, mode="w+", dtype="float32", shape=(nlat, nlon, nt))
+        self.ghi[:] = np.nan
+
+    def indice(self, lat: float, lon: float):
+        return _indice(self.meta, lat, lon)
+
+    def publicar(self) -> Path:
+        self.ghi.flush()
+        # Por filas de latitud: no materializar la malla completa en RAM
+        self.meta["celdas_con_dato"] = sum(
+            int((~np.isnan(self.ghi[i]).all(axis=1)).sum()) for i in range(self.meta["nlat"])
+        )
+        del self.ghi
+
+        destino = self.ruta / self.archivo
+        os.replace(self._tmp, destino)
+
+        archivo_meta = self.ruta / "meta.json"
+        try:
+            anterior = json.loads(archivo_meta.read_text(encoding="utf-8")).get("archivo", "ghi.npy")
+        except (OSError, ValueError):
+            anterior = ""
+
+        # Publicación: un solo os.replace de meta.json
+        meta_tmp = self.ruta / "meta.json.tmp"
+        meta_tmp.write_text(json.dumps(self.meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(meta_tmp, archivo_meta)
+
+        # Se conserva la versión anterior (un worker pudo leer el meta.json
+        # viejo justo antes del cambio); las más antiguas se borran
+        for viejo in [*self.ruta.glob("ghi-*.npy"), self.ruta / "ghi.npy"]:
+            if viejo.name in (self.archivo, anterior) or not viejo.exists():
+                continue
+            try:
+                viejo.unlink()
+            except OSError as e:
+                logger.warning("No se pudo borrar %s: %s", viejo, e)
+        return destino
@@ -0,0 +1,118 @@
+# core/utils/pdf_sections.py
+import hashlib
+import json
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas as rl_canvas
+
+from core import perf
+from core.utils.cache_utils import CacheNamespace
+from core.utils.pdf_utils import build_fortia_doc, build_fortia_pdf, get_pdf_profile, get_pdf_profile_name
+
+# =========================================================
+# PDF POR SECCIONES
+# - Cada sección se renderiza como un PDF independiente (fragmento)
+#   y se cachea con el hash de los datos de esa etapa y el perfil de
+#   PDF activo (membrete y compresión cambian los bytes del fragmento).
+# - El documento final se arma concatenando páginas; la numeración
+#   y los datos de generación se estampan al ensamblar.
+# =========================================================
+PDF_SECTION_CACHE_VERSION = 1
+PDF_SECTION_TIMEOUT = 60 * 60 * 24 * 7  # 7 días
+
+fragment_cache = CacheNamespace("pdf_section", timeout=PDF_SECTION_TIMEOUT)
+
+
+def model_snapshot(obj) -> dict:
+    """Valores de los campos concretos de un modelo (None si no hay objeto)."""
+    if obj is None:
+        return None
+    return {f.attname: getattr(obj, f.attname) for f in obj._meta.concrete_fields}
+
+
+def stage_hash(*parts) -> str:
+    """Hash estable de los datos de entrada de una etapa (modelos, listas, valores)."""
+    def _norm(x):
+        if hasattr(x, "_meta"):
+            return [x._meta.label, model_snapshot(x)]
+        if isinstance(x, (list, tuple)):
+            return [_norm(v) for v in x]
+        return x
+
+    payload = {"v": PDF_SECTION_CACHE_VERSION, "parts": _norm(list(parts))}
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def render_pdf_fragment(section: str, data_hash, build_elements, title: str) -> bytes:
+    """
+    Devuelve los bytes del PDF de una sección.
+    - Si data_hash es None la sección no se cachea.
+    - build_elements() solo se ejecuta si no hay fragmento en caché.
+    """
+    key = f"{section}:{get_pdf_profile_name()}:{data_hash}" if data_hash else None
+    if key:
+        cached = fragment_cache.get(key)
+        if cached is not None:
+            return cached
+
+    buffer = BytesIO()
+    doc = build_fortia_doc(buffer, title)
+    build_fortia_pdf(doc, build_elements(), "seccion_pdf")
+    pdf = buffer.getvalue()
+
+    if key:
+        fragment_cache.set(key, pdf)
+    return pdf
+
+
+def _stamp_overlay(total_pages: int, footer_text: str = "") -> PdfReader:
+    buffer = BytesIO()
+    c = rl_canvas.Canvas(buffer, pagesize=letter)
+    width, _ = letter
+
+    for n in range(1, total_pages + 1):
+        c.setFont("Helvetica", 7.5)
+        c.setFillColor(colors.HexColor("#555555"))
+        if footer_text:
+            c.drawString(1.8 * cm, 1.3 * cm, footer_text)
+        c.drawRightString(width - 1.8 * cm, 1.3 * cm, f"Página {n} de {total_pages}")
+        c.showPage()
+
+    c.save()
+    buffer.seek(0)
+    return PdfReader(buffer)
+
+
+def assemble_pdf(fragments, output, title: str, footer_text: str = "", author: str = "SWGFV"):
+    """
+    Concatena los fragmentos (bytes) página por página, estampa la
+    numeración "Página X de N" y escribe el PDF final en output.
+    Devuelve el número de páginas.
+    """
+    with perf.timed("pdf"):
+        return _assemble(fragments, output, title, footer_text, author)
+
+
+def _assemble(fragments, output, title, footer_text, author):
+    writer = PdfWriter()
+    for frag in fragments:
+        writer.append(PdfReader(BytesIO(frag)))
+
+    total = len(writer.pages)
+    overlay = _stamp_overlay(total, footer_text)
+    compress = bool(get_pdf_profile()["page_compression"])
+    for i, page in enumerate(writer.pages):
+        page.merge_page(overlay.pages[i])
+        if compress:
+            page.compress_content_streams()
+
+    writer.add_metadata({"/Title": title, "/Author": author})
+    # La hoja membretada viene repetida en cada fragmento: la dejamos una sola vez
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    writer.write(output)
+    return total
@@ -1,3 +1,13 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from core import perf
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import cm
 from reportlab.lib import colors
@@ -6,6 +16,115 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from django.contrib.staticfiles import finders
 
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# PERFILES DE SALIDA PDF
+# - estandar: hoja membretada PNG original (≈360 KB por documento)
+# - compacto: hoja membretada reducida a JPEG (se incrusta una vez)
+#             y flujos de página comprimidos
+# Se elige con settings.SWGFV_PDF_PROFILE
+# =========================================================
+PDF_PROFILES = {
+    "estandar": {
+        "page_compression": 1,
+        "letterhead": "original",
+    },
+    "compacto": {
+        "page_compression": 1,
+        "letterhead": "jpeg",
+        "letterhead_width_px": 850,  # ≈100 dpi en carta
+        "letterhead_quality": 70,
+    },
+}
+
+LETTERHEAD_STATIC_PATH = "core/img/hoja_membretada.png"
+
+_letterhead_lock = threading.Lock()
+_letterhead_paths = {}
+
+_metrics_lock = threading.Lock()
+_pdf_metrics = {}
+
+
+DEFAULT_PDF_PROFILE = "compacto"
+_perfiles_invalidos = set()
+
+
+def get_pdf_profile_name() -> str:
+    name = getattr(settings, "SWGFV_PDF_PROFILE", DEFAULT_PDF_PROFILE)
+    if name in PDF_PROFILES:
+        return name
+    # Valor mal escrito: se usa el perfil por defecto y se avisa una vez
+    if name not in _perfiles_invalidos:
+        _perfiles_invalidos.add(name)
+        logger.warning(
+            "SWGFV_PDF_PROFILE=%r no existe (opciones: %s); se usa %r",
+            name, ", ".join(PDF_PROFILES), DEFAULT_PDF_PROFILE,
+        )
+    return DEFAULT_PDF_PROFILE
+
+
+def get_pdf_profile() -> dict:
+    return PDF_PROFILES[get_pdf_profile_name()]
+
+
+def _build_letterhead_jpeg(src_path: str, width_px: int, quality: int) -> str:
+    from PIL import Image
+
+    with open(src_path, "rb") as fh:
+        digest = hashlib.sha1(fh.read()).hexdigest()[:12]
+
+    out_path = os.path.join(
+        tempfile.gettempdir(),
+        f"swgfv_hoja_membretada_{digest}_{width_px}_{quality}.jpg",
+    )
+    if os.path.exists(out_path):
+        return out_path
+
+    with Image.open(src_path) as im:
+        im = im.convert("RGB")
+        if im.width > width_px:
+            height_px = round(im.height * width_px / im.width)
+            im = im.resize((width_px, height_px), Image.LANCZOS)
+
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        im.save(tmp_path, "JPEG", quality=quality, optimize=True)
+        os.replace(tmp_path, out_path)
+
+    return out_path
+
+
+def get_letterhead_path():
+    """
+    Ruta de la imagen de la hoja membretada según el perfil activo.
+    La versión JPEG se genera una sola vez por proceso; ReportLab la
+    incrusta tal cual (DCTDecode) y una sola vez por documento.
+    """
+    profile_name = get_pdf_profile_name()
+    with _letterhead_lock:
+        if profile_name in _letterhead_paths:
+            return _letterhead_paths[profile_name]
+
+    src_path = finders.find(LETTERHEAD_STATIC_PATH)
+    path = src_path
+    profile = PDF_PROFILES[profile_name]
+
+    if src_path and profile["letterhead"] == "jpeg":
+        try:
+            path = _build_letterhead_jpeg(
+                src_path,
+                profile["letterhead_width_px"],
+                profile["letterhead_quality"],
+            )
+        except Exception:
+            logger.exception("No se pudo generar la hoja membretada compacta; se usa la original.")
+            path = src_path
+
+    with _letterhead_lock:
+        _letterhead_paths[profile_name] = path
+    return path
+
 
 def build_fortia_doc(response, title: str, author: str = "SWGFV"):
     return SimpleDocTemplate(
@@ -17,9 +136,62 @@ def build_fortia_doc(response, title: str, author: str = "SWGFV"):
         bottomMargin=2.0 * cm,
         title=title,
         author=author,
+        pageCompression=get_pdf_profile()["page_compression"],
     )
 
 
+def _output_size(output) -> int:
+    if hasattr(output, "getbuffer"):
+        return output.getbuffer().nbytes
+    if hasattr(output, "content"):
+        return len(output.content)
+    return 0
+
+
+def record_pdf_metrics(report: str, size_bytes: int, seconds: float, pages: int = 0):
+    """Registra tamaño y tiempo de render de un reporte (log + acumulado en memoria)."""
+    profile_name = get_pdf_profile_name()
+    logger.info(
+        "PDF %s perfil=%s bytes=%d paginas=%d ms=%.1f",
+        report, profile_name, size_bytes, pages, seconds * 1000.0,
+    )
+
+    with _metrics_lock:
+        m = _pdf_metrics.setdefault(report, {
+            "count": 0,
+            "bytes_total": 0,
+            "seconds_total": 0.0,
+            "last_bytes": 0,
+            "last_seconds": 0.0,
+            "profile": profile_name,
+        })
+        m["count"] += 1
+        m["bytes_total"] += int(size_bytes)
+        m["seconds_total"] += float(seconds)
+        m["last_bytes"] = int(size_bytes)
+        m["last_seconds"] = float(seconds)
+        m["profile"] = profile_name
+
+
+def get_pdf_metrics() -> dict:
+    """Copia de las métricas acumuladas por reporte en este proceso."""
+    with _metrics_lock:
+        return {k: dict(v) for k, v in _pdf_metrics.items()}
+
+
+def build_fortia_pdf(doc, elements, report: str, on_page=None):
+    """
+    doc.build() con la hoja membretada en todas las páginas, midiendo
+    tamaño y tiempo de render del reporte.
+    """
+    on_page = on_page or draw_fortia_letterhead
+    start = time.perf_counter()
+    doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+    elapsed = time.perf_counter() - start
+    perf.add("pdf", elapsed)
+    record_pdf_metrics(report, _output_size(doc.filename), elapsed, doc.page)
+
+
 def get_fortia_styles():
     styles = getSampleStyleSheet()
 
@@ -124,7 +296,7 @@ def get_fortia_styles():
 def draw_fortia_letterhead(canvas, doc):
     width, height = letter
 
-    bg_path = finders.find("core/img/hoja_membretada.png")
+    bg_path = get_letterhead_path()
     if bg_path:
         try:
             canvas.drawImage(
@@ -0,0 +1,385 @@
+# core/utils/proyectos_jsonl.py
+import gzip
+import json
+import sys
+from pathlib import Path
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from core.models import (
+    CalculoAC,
+    CalculoDC,
+    CalculoTension,
+    Condulet,
+    Conductor,
+    Dimensionamiento,
+    DimensionamientoDetalle,
+    Inversor,
+    Irradiancia,
+    MicroInversor,
+    NumeroPaneles,
+    PanelSolar,
+    Proyecto,
+    ResultadoCalculoAC,
+    ResultadoCalculoDC,
+    ResultadoPaneles,
+    ResultadoTension,
+    Usuario,
+)
+from core.utils.geo import parsear_coordenadas
+
+# =========================================================
+# PROYECTOS EN JSON LINES (exportar_proyectos / importar_proyectos)
+# Una línea = un proyecto con todo su grafo:
+#   {"v": 1, "id": <id origen>, "usuario": <correo>, "proyecto": {...},
+#    "numero_paneles": {...}, "dimensionamiento": {...},
+#    "calculos_dc": [...], "calculos_ac": [...], "calculos_tension": [...]}
+# - Catálogos por llave natural: irradiancia.no, panel.id_modulo,
+#   inversor/micro [marca, modelo], conductor.id_conductor; usuario por correo
+# - "ref" = id de origen; solo sirve para enlazar filas dentro de la línea
+#   (detalle -> cálculo DC/AC -> tensión). Al importar se crean ids nuevos
+# =========================================================
+FORMATO = 1
+
+
+class ErrorRegistro(Exception):
+    """La línea no se puede importar (se omite y se informa)."""
+
+
+def abrir(ruta: str, modo: str):
+    """Archivo de texto UTF-8; .gz comprimido; "-" = stdin/stdout."""
+    if ruta == "-":
+        return open(sys.stdout.fileno() if "w" in modo else sys.stdin.fileno(), modo,
+                    encoding="utf-8", closefd=False)
+    if Path(ruta).suffix == ".gz":
+        return gzip.open(ruta, modo + "t", encoding="utf-8")
+    return open(ruta, modo, encoding="utf-8", newline="\n")
+
+
+def _datos(obj, excluir=()) -> dict:
+    """Campos propios (sin pk ni FKs) tal como se guardan en la BD."""
+    if obj is None:
+        return None
+    return {
+        f.name: f.value_from_object(obj)
+        for f in obj._meta.concrete_fields
+        if not f.primary_key and not f.is_relation and f.name not in excluir
+    }
+
+
+def _instancia(modelo, datos: dict, **fks):
+    """Instancia sin guardar; los campos que no trae la línea quedan con su default."""
+    kwargs = {
+        f.name: f.to_python(datos[f.name])
+        for f in modelo._meta.concrete_fields
+        if not f.primary_key and not f.is_relation and f.name in datos
+    }
+    kwargs.update(fks)
+    return modelo(**kwargs)
+
+
+def _relacionado(obj, campo: str):
+    """Reverse OneToOne con select_related: None si no existe."""
+    try:
+        return getattr(obj, campo)
+    except ObjectDoesNotExist:
+        return None
+
+
+# =========================================================
+# EXPORTAR
+# =========================================================
+def exportar(proyectos, salida, chunk: int = 500) -> int:
+    """
+    Escribe una línea por proyecto. Recorre por pk en lotes de `chunk`
+    (unas 6 consultas por lote), así la memoria no depende del total.
+    """
+    total = 0
+    ultimo = 0
+    base = proyectos.select_related("ID_Usuario").order_by("pk")
+    while True:
+        lote = list(base.filter(pk__gt=ultimo)[:chunk])
+        if not lote:
+            return total
+        ultimo = lote[-1].pk
+        ids = [p.pk for p in lote]
+
+        numeros = {
+            n.proyecto_id: n
+            for n in NumeroPaneles.objects.filter(proyecto_id__in=ids)
+            .select_related("irradiancia", "panel", "resultado")
+        }
+        dims = {d.proyecto_id: d for d in Dimensionamiento.objects.filter(proyecto_id__in=ids)}
+        detalles = {}
+        for d in (
+            DimensionamientoDetalle.objects.filter(dimensionamiento__proyecto_id__in=ids)
+            .select_related("dimensionamiento", "inversor", "micro_inversor")
+            .order_by("dimensionamiento_id", "indice")
+        ):
+            detalles.setdefault(d.dimensionamiento.proyecto_id, []).append(d)
+        dcs, acs, tensiones = {}, {}, {}
+        for c in CalculoDC.objects.filter(proyecto_id__in=ids).select_related("condulet", "resultado_dc"):
+            dcs.setdefault(c.proyecto_id, []).append(c)
+        for c in CalculoAC.objects.filter(proyecto_id__in=ids).select_related("condulet", "resultado_ac"):
+            acs.setdefault(c.proyecto_id, []).append(c)
+        for t in CalculoTension.objects.filter(proyecto_id__in=ids).select_related("resultado_tension"):
+            tensiones.setdefault(t.proyecto_id, []).append(t)
+
+        for p in lote:
+            registro = _registro(
+                p, numeros.get(p.pk), dims.get(p.pk), detalles.get(p.pk, []),
+                dcs.get(p.pk, []), acs.get(p.pk, []), tensiones.get(p.pk, []),
+            )
+            salida.write(json.dumps(registro, default=str, ensure_ascii=False, separators=(",", ":")) + "\n")
+            total += 1
+
+
+def _registro(p, numero, dim, detalles, dcs, acs, tensiones) -> dict:
+    registro = {
+        "v": FORMATO,
+        "id": p.pk,
+        "usuario": p.ID_Usuario.Correo_electronico,
+        # latitud/longitud se derivan de Coordenadas al importar
+        "proyecto": _datos(p, excluir=("latitud", "longitud")),
+        "numero_paneles": None,
+        "dimensionamiento": None,
+        "calculos_dc": [],
+        "calculos_ac": [],
+        "calculos_tension": [],
+    }
+    if numero:
+        registro["numero_paneles"] = {
+            "datos": _datos(numero),
+            "irradiancia": numero.irradiancia.no,
+            "panel": numero.panel.id_modulo,
+            "resultado": _datos(_relacionado(numero, "resultado")),
+        }
+    if dim:
+        registro["dimensionamiento"] = {
+            "datos": _datos(dim),
+            "detalles": [
+                {
+                    "ref": d.pk,
+                    "datos": _datos(d),
+                    "inversor": [d.inversor.marca, d.inversor.modelo] if d.inversor else None,
+                    "micro_inversor": [d.micro_inversor.marca, d.micro_inversor.modelo] if d.micro_inversor else None,
+                }
+                for d in detalles
+            ],
+        }
+    for c in dcs:
+        registro["calculos_dc"].append({
+            "ref": c.pk,
+            "datos": _datos(c),
+            "detalle": c.dimensionamiento_detalle_id,
+            "conductor": c.conductor_id,
+            "condulet": _datos(c.condulet),
+            "resultado": _datos(c.resultado_dc),
+        })
+    for c in acs:
+        registro["calculos_ac"].append({
+            "ref": c.pk,
+            "datos": _datos(c),
+            "detalle": c.dimensionamiento_detalle_id,
+            "conductor": c.conductor_id,
+            "condulet": _datos(c.condulet),
+            "resultado": _datos(c.resultado_ac),
+        })
+    for t in tensiones:
+        registro["calculos_tension"].append({
+            "datos": _datos(t),
+            "tension_dc": t.tension_dc_id,
+            "tension_ac": t.tension_ac_id,
+            "resultado": _datos(t.resultado_tension),
+        })
+    return registro
+
+
+# =========================================================
+# IMPORTAR
+# =========================================================
+class ImportadorProyectos:
+    """
+    Crea proyectos nuevos a partir de lotes de líneas ya parseadas.
+    Por lote: un bulk_create por tabla en orden de dependencia y remapeo
+    de FKs con los ids devueltos (PostgreSQL / SQLite >= 3.35).
+    Los catálogos se resuelven por llave natural (mapas cargados una vez).
+    """
+
+    def __init__(self, usuario_defecto: str = "", batch_size: int = 500):
+        self.usuario_defecto = (usuario_defecto or "").strip().lower()
+        self.batch_size = batch_size
+        self.creados = 0
+        self.omitidos = []  # (línea, motivo)
+        self._mapas = {}
+
+    def _mapa(self, nombre: str) -> dict:
+        if nombre not in self._mapas:
+            if nombre == "usuarios":
+                filas = Usuario.objects.values_list("Correo_electronico", "pk")
+                self._mapas[nombre] = {correo.lower(): pk for correo, pk in filas}
+            elif nombre == "irradiancias":
+                self._mapas[nombre] = dict(Irradiancia.objects.values_list("no", "pk"))
+            elif nombre == "paneles":
+                self._mapas[nombre] = dict(PanelSolar.objects.values_list("id_modulo", "pk"))
+            elif nombre == "conductores":
+                self._mapas[nombre] = set(Conductor.objects.values_list("pk", flat=True))
+            else:
+                modelo = Inversor if nombre == "inversores" else MicroInversor
+                self._mapas[nombre] = {(m, mo): pk for m, mo, pk in modelo.objects.values_list("marca", "modelo", "pk")}
+        return self._mapas[nombre]
+
+    def _buscar(self, nombre: str, llave, etiqueta: str):
+        if llave is None:
+            return None
+        valor = self._mapa(nombre).get(tuple(llave) if isinstance(llave, list) else llave)
+        if valor is None:
+            raise ErrorRegistro(f"{etiqueta} {llave} no existe en esta BD")
+        return valor
+
+    def _conductor(self, llave):
+        if llave is not None and llave not in self._mapa("conductores"):
+            raise ErrorRegistro(f"conductor {llave} no existe en esta BD")
+        return llave
+
+    def _resolver(self, r: dict) -> dict:
+        """Ids locales de usuario y catálogos; ErrorRegistro si falta alguno."""
+        if r.get("v") != FORMATO:
+            raise ErrorRegistro(f"formato {r.get('v')!r} no soportado (se espera {FORMATO})")
+        usuarios = self._mapa("usuarios")
+        usuario = usuarios.get((r.get("usuario") or "").lower()) or usuarios.get(self.usuario_defecto)
+        if usuario is None:
+            raise ErrorRegistro(f"usuario {r.get('usuario')!r} no existe (usa --usuario)")
+
+        ids = {"usuario": usuario, "detalles": [], "dc": [], "ac": []}
+        numero = r.get("numero_paneles")
+        if numero:
+            ids["irradiancia"] = self._buscar("irradiancias", numero["irradiancia"], "irradiancia")
+            ids["panel"] = self._buscar("paneles", numero["panel"], "panel")
+        for d in (r.get("dimensionamiento") or {}).get("detalles", []):
+            ids["detalles"].append((
+                self._buscar("inversores", d.get("inversor"), "inversor"),
+                self._buscar("micro_inversores", d.get("micro_inversor"), "micro inversor"),
+            ))
+        for c in r.get("calculos_dc", []):
+            ids["dc"].append(self._conductor(c.get("conductor")))
+        for c in r.get("calculos_ac", []):
+            ids["ac"].append(self._conductor(c.get("conductor")))
+        return ids
+
+    def cargar(self, lote: list):
+        """lote: [(número de línea, dict)]. Un lote = una transacción."""
+        validos = []
+        for linea, r in lote:
+            try:
+                validos.append((r, self._resolver(r)))
+            except (ErrorRegistro, KeyError, TypeError) as e:
+                self.omitidos.append((linea, str(e) if isinstance(e, ErrorRegistro) else f"línea incompleta: {e!r}"))
+        if not validos:
+            return
+
+        bs = self.batch_size
+        with transaction.atomic():
+            # 1) Proyectos
+            proyectos = []
+            for r, ids in validos:
+                p = _instancia(Proyecto, r["proyecto"], ID_Usuario_id=ids["usuario"])
+                # bulk_create no pasa por Proyecto.save()
+                coords = parsear_coordenadas(p.Coordenadas)
+                p.latitud, p.longitud = (round(coords[0], 6), round(coords[1], 6)) if coords else (None, None)
+                proyectos.append(p)
+            Proyecto.objects.bulk_create(proyectos, batch_size=bs)
+
+            # 2) Número de paneles + resultado
+            numeros, resultados = [], []
+            for (r, ids), p in zip(validos, proyectos):
+                n = r.get("numero_paneles")
+                if n:
+                    numeros.append((n, _instancia(
+                        NumeroPaneles, n["datos"],
+                        proyecto_id=p.pk, irradiancia_id=ids["irradiancia"], panel_id=ids["panel"],
+                    )))
+            NumeroPaneles.objects.bulk_create([o for _, o in numeros], batch_size=bs)
+            for n, obj in numeros:
+                if n.get("resultado"):
+                    resultados.append(_instancia(ResultadoPaneles, n["resultado"], numero_paneles_id=obj.pk))
+            ResultadoPaneles.objects.bulk_create(resultados, batch_size=bs)
+
+            # 3) Dimensionamiento + detalles (ref -> detalle nuevo)
+            dims = []
+            for (r, ids), p in zip(validos, proyectos):
+                d = r.get("dimensionamiento")
+                if d:
+                    dims.append((d, ids, p, _instancia(Dimensionamiento, d["datos"], proyecto_id=p.pk)))
+            Dimensionamiento.objects.bulk_create([o for *_, o in dims], batch_size=bs)
+            detalles_por_proyecto = {}
+            nuevos_detalles = []
+            for d, ids, p, dim in dims:
+                refs = detalles_por_proyecto.setdefault(p.pk, {})
+                for det, (inv, micro) in zip(d.get("detalles", []), ids["detalles"]):
+                    obj = _instancia(
+                        DimensionamientoDetalle, det["datos"],
+                        dimensionamiento_id=dim.pk, inversor_id=inv, micro_inversor_id=micro,
+                    )
+                    refs[det["ref"]] = obj
+                    nuevos_detalles.append(obj)
+            DimensionamientoDetalle.objects.bulk_create(nuevos_detalles, batch_size=bs)
+
+            # 4) Cálculos DC / AC con condulet y resultado
+            refs_dc = self._calculos(
+                validos, proyectos, detalles_por_proyecto, "calculos_dc", "dc",
+                CalculoDC, ResultadoCalculoDC, "resultado_dc",
+            )
+            refs_ac = self._calculos(
+                validos, proyectos, detalles_por_proyecto, "calculos_ac", "ac",
+                CalculoAC, ResultadoCalculoAC, "resultado_ac",
+            )
+
+            # 5) Caída de tensión
+            tensiones = []
+            for (r, _), p in zip(validos, proyectos):
+                for t in r.get("calculos_tension", []):
+                    dc = refs_dc.get(p.pk, {}).get(t.get("tension_dc"))
+                    ac = refs_ac.get(p.pk, {}).get(t.get("tension_ac"))
+                    res = _instancia(ResultadoTension, t["resultado"]) if t.get("resultado") else None
+                    tensiones.append((res, _instancia(
+                        CalculoTension, t["datos"],
+                        proyecto_id=p.pk,
+                        tension_dc_id=dc.pk if dc else None,
+                        tension_ac_id=ac.pk if ac else None,
+                    )))
+            ResultadoTension.objects.bulk_create([res for res, _ in tensiones if res], batch_size=bs)
+            for res, obj in tensiones:
+                obj.resultado_tension_id = res.pk if res else None
+            CalculoTension.objects.bulk_create([obj for _, obj in tensiones], batch_size=bs)
+
+        self.creados += len(proyectos)
+
+    def _calculos(self, validos, proyectos, detalles_por_proyecto, clave, tipo,
+                  modelo, modelo_resultado, campo_resultado) -> dict:
+        """bulk_create de condulets, resultados y cálculos; {proyecto: {ref: cálculo}}."""
+        filas = []
+        for (r, ids), p in zip(validos, proyectos):
+            detalles = detalles_por_proyecto.get(p.pk, {})
+            for c, conductor in zip(r.get(clave, []), ids[tipo]):
+                detalle = detalles.get(c.get("detalle"))
+                obj = _instancia(
+                    modelo, c["datos"],
+                    proyecto_id=p.pk,
+                    dimensionamiento_detalle_id=detalle.pk if detalle else None,
+                    conductor_id=conductor,
+                )
+                condulet = _instancia(Condulet, c["condulet"]) if c.get("condulet") else None
+                resultado = _instancia(modelo_resultado, c["resultado"]) if c.get("resultado") else None
+                filas.append((p.pk, c["ref"], obj, condulet, resultado))
+
+        Condulet.objects.bulk_create([f[3] for f in filas if f[3]], batch_size=self.batch_size)
+        modelo_resultado.objects.bulk_create([f[4] for f in filas if f[4]], batch_size=self.batch_size)
+        refs = {}
+        for proyecto_id, ref, obj, condulet, resultado in filas:
+            obj.condulet_id = condulet.pk if condulet else None
+            setattr(obj, f"{campo_resultado}_id", resultado.pk if resultado else None)
+            refs.setdefault(proyecto_id, {})[ref] = obj
+        modelo.objects.bulk_create([f[2] for f in filas], batch_size=self.batch_size)
+        return refs
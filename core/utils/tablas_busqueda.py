@@ -0,0 +1,145 @@
+# core/utils/tablas_busqueda.py
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, CharField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# =========================================================
+# BÚSQUEDA DE TEXTO EN tablas_nom (migración 0036)
+# - PostgreSQL: índice GIN sobre tsvector con la configuración
+#   swgfv_es (spanish + unaccent); ts_headline para el fragmento
+# - SQLite: tabla FTS5 tablas_nom_fts (unicode61 sin diacríticos);
+#   bm25 con más peso al nombre y snippet() para el fragmento
+# - El fragmento se arma en la BD: la lista no trae las notas completas
+# =========================================================
+TABLAS_TABLE = "tablas_nom"
+TABLAS_FTS_TABLE = "tablas_nom_fts"
+
+PG_CONFIG = "swgfv_es"
+PG_VECTOR = (
+    f"setweight(to_tsvector('{PG_CONFIG}'::regconfig, coalesce(nombre_tabla, '')), 'A') || "
+    f"setweight(to_tsvector('{PG_CONFIG}'::regconfig, coalesce(notas, '')), 'B')"
+)
+
+# Marcas de uso privado: el texto se escapa completo y luego se cambian por <mark>
+INICIO_MARCA = "\ue000"
+FIN_MARCA = "\ue001"
+PALABRAS_FRAGMENTO = 24
+BM25_PESOS = (10.0, 1.0)  # nombre_tabla, notas
+PREFIJO_MIN = 3  # "°C" o "a" no se expanden a todas las palabras que empiezan igual
+
+_PALABRA_RE = re.compile(r"[^\W_]+")
+_fts_available = None
+
+
+def search_backend() -> str:
+    """"postgresql", "fts5" o "" (sin índice de texto)."""
+    global _fts_available
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite":
+        if _fts_available is None:
+            _fts_available = TABLAS_FTS_TABLE in connection.introspection.table_names()
+        return "fts5" if _fts_available else ""
+    return ""
+
+
+def _fts5_query(texto: str) -> str:
+    # Cada palabra entre comillas (sin operadores del usuario) y con prefijo
+    return " ".join(
+        f'"{w}"*' if len(w) >= PREFIJO_MIN else f'"{w}"' for w in _PALABRA_RE.findall(texto)
+    )
+
+
+def _pg_query(texto: str) -> str:
+    # to_tsquery con prefijo por palabra; las palabras vacías las descarta Postgres
+    return " & ".join(
+        f"{w}:*" if len(w) >= PREFIJO_MIN else w for w in _PALABRA_RE.findall(texto)
+    )
+
+
+def _anotar(qs, texto: str):
+    texto = (texto or "").strip()
+    backend = search_backend()
+
+    if backend == "postgresql":
+        tsq = _pg_query(texto)
+        if not tsq:
+            return qs.none()
+        query = f"to_tsquery('{PG_CONFIG}', %s)"
+        opciones = (
+            f"StartSel={INICIO_MARCA}, StopSel={FIN_MARCA}, "
+            f"MaxWords={PALABRAS_FRAGMENTO}, MinWords={PALABRAS_FRAGMENTO // 2}, "
+            f'MaxFragments=2, FragmentDelimiter=" … "'
+        )
+        return qs.filter(
+            RawSQL(f"{PG_VECTOR} @@ {query}", [tsq], output_field=BooleanField())
+        ).annotate(
+            rank=RawSQL(f"ts_rank({PG_VECTOR}, {query})", [tsq], output_field=FloatField()),
+            nombre_resaltado=RawSQL(
+                f"ts_headline('{PG_CONFIG}', nombre_tabla, {query}, %s)",
+                [tsq, f"StartSel={INICIO_MARCA}, StopSel={FIN_MARCA}, HighlightAll=true"],
+                output_field=CharField(),
+            ),
+            fragmento=RawSQL(
+                f"ts_headline('{PG_CONFIG}', notas, {query}, %s)", [tsq, opciones], output_field=CharField()
+            ),
+        )
+
+    if backend == "fts5":
+        fts_q = _fts5_query(texto)
+        if not fts_q:
+            return qs.none()
+        marcas = [INICIO_MARCA, FIN_MARCA]
+        # Join directo con la tabla FTS: bm25/snippet se calculan solo para las coincidencias
+        return qs.extra(
+            tables=[TABLAS_FTS_TABLE],
+            where=[f"{TABLAS_FTS_TABLE}.rowid = {TABLAS_TABLE}.id", f"{TABLAS_FTS_TABLE} MATCH %s"],
+            params=[fts_q],
+        ).annotate(
+            rank=RawSQL(
+                f"-bm25({TABLAS_FTS_TABLE}, {BM25_PESOS[0]}, {BM25_PESOS[1]})", [], output_field=FloatField()
+            ),
+            nombre_resaltado=RawSQL(
+                f"highlight({TABLAS_FTS_TABLE}, 0, %s, %s)", marcas, output_field=CharField()
+            ),
+            fragmento=RawSQL(
+                f"snippet({TABLAS_FTS_TABLE}, 1, %s, %s, '…', {PALABRAS_FRAGMENTO})",
+                marcas,
+                output_field=CharField(),
+            ),
+        )
+
+    return qs.filter(
+        Q(nombre_tabla__icontains=texto) |
+        Q(notas__icontains=texto)
+    ).annotate(
+        rank=Value(0.0, output_field=FloatField()),
+        nombre_resaltado=Value("", output_field=CharField()),
+        fragmento=Value("", output_field=CharField()),
+    )
+
+
+def resaltar(texto: str) -> str:
+    """Escapa el texto y convierte las marcas de la BD en <mark>."""
+    html = escape(texto or "").replace(INICIO_MARCA, "<mark>").replace(FIN_MARCA, "</mark>")
+    return mark_safe(html)
+
+
+def buscar_tablas(qs, texto: str) -> list:
+    """
+    Tablas de qs que coinciden con texto, de la más a la menos relevante.
+    Cada una trae nombre_html y fragmento_html (vacío si las notas no coinciden);
+    solo se leen id y nombre_tabla del modelo.
+    """
+    if not _PALABRA_RE.findall(texto or ""):
+        # Solo signos ("-", "%", "°"): no hay palabras que buscar
+        return []
+    filas = list(_anotar(qs.only("id", "nombre_tabla"), texto).order_by("-rank", "nombre_tabla"))
+    for t in filas:
+        t.nombre_html = resaltar(t.nombre_resaltado) if t.nombre_resaltado else escape(t.nombre_tabla)
+        t.fragmento_html = resaltar(t.fragmento) if INICIO_MARCA in (t.fragmento or "") else ""
+    return filas
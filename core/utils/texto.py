@@ -0,0 +1,59 @@
+# core/utils/texto.py
+import re
+import unicodedata
+
+_NO_ALNUM_RE = re.compile(r"[^0-9a-z{]+")
+
+
+def sin_acentos(texto: str) -> str:
+    """Minúsculas sin acentos ni diéresis ("Módulo Ñandú" -> "modulo nandu")."""
+    s = unicodedata.normalize("NFKD", (texto or "").casefold())
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+
+# =========================================================
+# CLAVE DE ORDEN ALFABÉTICO (español)
+# - Sin mayúsculas ni acentos: "Ángulo" junto a "angulo"
+# - La ñ va después de la n ("n{": "{" es el siguiente ASCII tras "z")
+# - Signos de puntuación = espacio; espacios colapsados
+# Se guarda en hexadecimal: solo [0-9a-f], así el orden del índice es el
+# mismo con cualquier collation de la BD (en_US ignora espacios y signos)
+# =========================================================
+CLAVE_ORDEN_MAX = 255
+
+
+def clave_orden(texto: str) -> str:
+    s = unicodedata.normalize("NFC", (texto or "").casefold()).replace("ñ", "n{")
+    s = sin_acentos(s)
+    s = _NO_ALNUM_RE.sub(" ", s).strip()
+    # Recorte en número par de dígitos: los empates se resuelven por nombre
+    return s.encode("ascii", "ignore").hex()[: CLAVE_ORDEN_MAX - CLAVE_ORDEN_MAX % 2]
+
+
+# =========================================================
+# PALABRAS PARA BÚSQUEDA (español)
+# - Sin acentos ni mayúsculas; se descartan palabras vacías
+# - raiz(): "stemming" ligero; quita plural y vocal final para que
+#   "inversores" = "inversor" y "fotovoltaica" = "fotovoltaico"
+# =========================================================
+_PALABRA_RE = re.compile(r"[0-9a-z]+")
+PALABRAS_VACIAS = frozenset(
+    "a al con de del el en es la las lo los o para por que se sin su sus u un una y".split()
+)
+_VOCALES = "aeiou"
+
+
+def palabras(texto: str) -> list:
+    return [p for p in _PALABRA_RE.findall(sin_acentos(texto)) if p not in PALABRAS_VACIAS]
+
+
+def raiz(palabra: str) -> str:
+    if len(palabra) <= 4 or palabra.isdigit():
+        return palabra
+    if palabra.endswith("es") and palabra[-3] not in _VOCALES:
+        palabra = palabra[:-2]  # inversores, paneles, tensiones
+    elif palabra.endswith("s"):
+        palabra = palabra[:-1]  # cadenas, módulos
+    if len(palabra) > 4 and palabra[-1] in "aeo":
+        palabra = palabra[:-1]
+    return palabra
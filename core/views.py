@@ -1,25 +1,21 @@
 # core/views.py
 import random
 import csv
-from datetime import timedelta
+import time
 import logging
-import requests
 from django.conf import settings
 from django.shortcuts import render, redirect
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.core import signing
-from django.core.mail import send_mail
 from django.conf import settings
-from django.db.models import Q
 
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import cm
-from django.contrib.staticfiles import finders
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, KeepTogether, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, KeepTogether
 from reportlab.platypus import Image as RLImage
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
@@ -34,11 +30,27 @@ from django.templatetags.static import static
 from core.utils.pdf_utils import (
     build_fortia_doc,
     get_fortia_styles,
-    draw_fortia_letterhead,
     add_fortia_header,
     make_info_table,
     make_data_table,
     add_fortia_footer,
+    build_fortia_pdf,
+    record_pdf_metrics,
+    get_pdf_metrics,
+)
+from core.utils.bitacora import keyset_page, search_logs
+from core.utils.catalogos import get_catalogo, irradiancia_cercana
+from core.utils.glosario_indice import indice_glosario
+from core.utils.tablas_busqueda import buscar_tablas
+from core.utils.cache_utils import get_cache_stats
+from core.utils.imagenes import fuentes_tabla, generar_derivados
+from core.utils.irradiancia_malla import celda_proyecto, irradiancia_para_calculo, malla_activa
+from core.utils.pdf_sections import stage_hash, render_pdf_fragment, assemble_pdf
+from core.utils.chart_utils import (
+    drawing_generacion,
+    drawing_generacion_vs_consumo,
+    svg_generacion,
+    svg_generacion_vs_consumo,
 )
 
 from .forms import (
@@ -59,9 +71,13 @@ from .forms import (
 )
 
 from .auth_local import authenticate_local
+from . import login_throttle
+from . import recaptcha
+from . import perf
+from .audit_buffer import audit_buffer
 from .decorators import require_session_login, require_admin
 from .models import (
-    Usuario, Proyecto, LoginLock, AuditLog,
+    Usuario, Proyecto, AuditLog, EmailOutbox,
     Irradiancia, PanelSolar, NumeroPaneles, ResultadoPaneles,
     Inversor, MicroInversor,
     Dimensionamiento, DimensionamientoDetalle,
@@ -182,6 +198,9 @@ def _project_completion_status(proyecto: Proyecto):
 def log_event(request, action: str, message: str, target_model: str = "", target_id=None):
     """
     Guarda evento en bitácora (AuditLog).
+    El evento se agrega al buffer de core.audit_buffer y se escribe en
+    lote al terminar el request (AuditFlushMiddleware); dentro de una
+    transacción solo se registra si esta hace commit.
     IMPORTANTE: Está blindada para que NUNCA cause error 500.
     """
     try:
@@ -189,17 +208,18 @@ def log_event(request, action: str, message: str, target_model: str = "", target
         actor_tipo = (request.session.get("tipo") or "").strip()
         actor_user_id = request.session.get("id_usuario")
 
-        AuditLog.objects.create(
-            actor_email=actor_email,
-            actor_tipo=actor_tipo,
-            actor_user_id=actor_user_id if actor_user_id else None,
-            action=(action or "").strip()[:80],
-            message=(message or "").strip()[:255],
-            target_model=(target_model or "").strip()[:50],
-            target_id=str(target_id) if target_id is not None else "",
-        )
+        audit_buffer.add({
+            "created_at": timezone.now(),
+            "actor_email": actor_email,
+            "actor_tipo": actor_tipo,
+            "actor_user_id": actor_user_id if actor_user_id else None,
+            "action": (action or "").strip()[:80],
+            "message": (message or "").strip()[:255],
+            "target_model": (target_model or "").strip()[:50],
+            "target_id": str(target_id) if target_id is not None else "",
+        })
     except Exception:
-        return
+        logger.exception("No se pudo registrar el evento de bitácora %s", action)
 
 
 # =========================================================
@@ -230,27 +250,14 @@ def _read_captcha_token(token: str):
 def verificar_recaptcha_google(request) -> bool:
     """
     Valida el Google reCAPTCHA v2 checkbox.
-    Retorna True si Google lo valida correctamente.
+    Retorna True si Google lo valida correctamente (ver core.recaptcha).
     """
     recaptcha_response = (request.POST.get("g-recaptcha-response") or "").strip()
 
     if not recaptcha_response:
         return False
 
-    try:
-        data = {
-            "secret": settings.RECAPTCHA_PRIVATE_KEY,
-            "response": recaptcha_response,
-        }
-        r = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=data,
-            timeout=10,
-        )
-        result = r.json()
-        return bool(result.get("success", False))
-    except Exception:
-        return False
+    return recaptcha.verify(recaptcha_response, request.META.get("REMOTE_ADDR"))
 
 # =========================================================
 # Password reset token helpers (firma + expiración)
@@ -297,7 +304,7 @@ def _read_reset_token(token: str):
 @require_http_methods(["GET", "POST"])
 def login_view(request):
     """
-    Login con Google reCAPTCHA + lock por usuario (LoginLock en BD).
+    Login con Google reCAPTCHA + lock por usuario (core.login_throttle).
     El reCAPTCHA NO cuenta como intento fallido.
     Solo usuario/contraseña incorrectos cuentan para bloqueo.
     """
@@ -307,41 +314,7 @@ def login_view(request):
 
         form = LoginForm(request.POST or None)
 
-        LOCK_MINUTES = 30
-        MAX_FAILS = 3
-
-        def _norm_user_key(usuario: str) -> str:
-            return (usuario or "").strip().lower()
-
-        def _get_lock(usuario: str) -> LoginLock:
-            key = _norm_user_key(usuario)
-            obj, _ = LoginLock.objects.get_or_create(usuario_key=key)
-            return obj
-
-        def _is_locked(usuario: str):
-            lk = _get_lock(usuario)
-            if lk.is_locked():
-                return True, int(lk.remaining_minutes())
-            return False, 0
-
-        def _register_fail(usuario: str) -> int:
-            lk = _get_lock(usuario)
-
-            if lk.is_locked():
-                return int(lk.fails or 0)
-
-            lk.fails = int(lk.fails or 0) + 1
-            if lk.fails >= MAX_FAILS:
-                lk.locked_until = timezone.now() + timedelta(minutes=LOCK_MINUTES)
-
-            lk.save(update_fields=["fails", "locked_until"])
-            return int(lk.fails or 0)
-
-        def _reset_lock(usuario: str):
-            lk = _get_lock(usuario)
-            lk.fails = 0
-            lk.locked_until = None
-            lk.save(update_fields=["fails", "locked_until"])
+        MAX_FAILS = login_throttle.MAX_FAILS
 
         def _render_login():
             return render(
@@ -360,7 +333,7 @@ def login_view(request):
                 messages.error(request, "Ingresa tu usuario/correo.")
                 return _render_login()
 
-            locked, minutes = _is_locked(usuario_input)
+            locked, minutes = login_throttle.is_locked(usuario_input)
             if locked:
                 messages.error(request, f"Cuenta bloqueada temporalmente. Intenta de nuevo en {minutes} minuto(s).")
                 return _render_login()
@@ -385,7 +358,7 @@ def login_view(request):
             u = authenticate_local(usuario_input, password)
 
             if u:
-                _reset_lock(usuario_input)
+                login_throttle.reset(usuario_input)
 
                 request.session["usuario"] = u.Correo_electronico
                 request.session["tipo"] = u.Tipo
@@ -394,10 +367,10 @@ def login_view(request):
 
                 return redirect("core:menu_principal")
 
-            fails = _register_fail(usuario_input)
+            fails = login_throttle.register_fail(usuario_input)
 
             if fails >= MAX_FAILS:
-                messages.error(request, "Cuenta bloqueada por 30 minutos (demasiados intentos).")
+                messages.error(request, f"Cuenta bloqueada por {login_throttle.LOCK_MINUTES} minutos (demasiados intentos).")
             else:
                 messages.error(request, f"Usuario o contraseña incorrectos. Intento {fails}/{MAX_FAILS}.")
 
@@ -470,17 +443,17 @@ def recuperar_view(request):
                     "Si tú no lo solicitaste, ignora este correo."
                 )
 
+                # Solo se encola; el envío lo hace "manage.py send_outbox"
                 try:
-                    send_mail(
-                        subject,
-                        body,
-                        getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@swgfv.local"),
-                        [email],
-                        fail_silently=False,
+                    EmailOutbox.objects.create(
+                        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@swgfv.local"),
+                        to_email=email,
+                        subject=subject,
+                        body=body,
                     )
                 except Exception:
                     # No rompemos el flujo aunque falle el correo
-                    pass
+                    logger.exception("No se pudo encolar el correo de recuperación")
 
                 # Bitácora (no debe romper si falla)
                 log_event(
@@ -1234,6 +1207,20 @@ def _render_menu_page(request, template_path: str, title: str):
         return render(request, "core/menu_principal.html", {"title": title, "messages": []})
 
 
+def _sugerencia_irradiancia(proyecto):
+    """Sitio de Irradiancia más cercano a las coordenadas del proyecto (y celda de la malla activa)."""
+    cercana = irradiancia_cercana(proyecto.latitud, proyecto.longitud)
+    if not cercana:
+        return None
+    irradiancia, km = cercana
+    malla = malla_activa()
+    return {
+        "irradiancia": irradiancia,
+        "distancia_km": round(km, 1),
+        "celda": celda_proyecto(proyecto, malla) if malla else None,
+    }
+
+
 # =========================================================
 # VISTA: Dimensionamiento - Cálculo de Módulos (calculo)
 # Archivo: core/views.py
@@ -1253,8 +1240,8 @@ def dimensionamiento_calculo_modulos(request):
         proyectos = Proyecto.objects.filter(ID_Usuario_id=session_id_usuario).order_by("-id")
 
     # ✅ Catálogos
-    irradiancias = Irradiancia.objects.all().order_by("estado", "ciudad")
-    paneles = PanelSolar.objects.all().order_by("marca", "modelo")
+    irradiancias = get_catalogo("irradiancias")
+    paneles = get_catalogo("paneles")
 
     # =========================================================
     # LISTAS PARA EL TEMPLATE
@@ -1291,7 +1278,8 @@ def dimensionamiento_calculo_modulos(request):
             return None
 
         panel = np_registro.panel
-        irradiancia = np_registro.irradiancia
+        # Fila de ciudad o celda de la malla en las coordenadas del proyecto
+        irradiancia = irradiancia_para_calculo(np_registro)
         eff = float(np_registro.eficiencia or 0)
 
         resultado_obj, _ = ResultadoPaneles.objects.get_or_create(
@@ -1370,6 +1358,7 @@ def dimensionamiento_calculo_modulos(request):
     proyecto_actual = None
 
     # Precarga para el template
+    sugerencia = None
     form_tipo_facturacion = ""
     form_irradiancia_id = None
     form_panel_id = None
@@ -1399,6 +1388,11 @@ def dimensionamiento_calculo_modulos(request):
                 # ✅ Si ya existe registro guardado, reconstruir/asegurar resultado
                 resultado = recalcular_resultado(np_obj)
 
+            # Sitio más cercano a las coordenadas; sin cálculo previo queda preseleccionado
+            sugerencia = _sugerencia_irradiancia(proyecto_actual)
+            if sugerencia and not np_obj:
+                form_irradiancia_id = sugerencia["irradiancia"].id
+
     # =========================
     # POST: Guardar + Calcular
     # =========================
@@ -1458,11 +1452,20 @@ def dimensionamiento_calculo_modulos(request):
                 messages.error(request, "Panel inválido.")
                 return redirect(reverse("core:dimensionamiento_calculo_modulos"))
 
+            malla = malla_activa() if request.POST.get("usar_malla") == "1" else ""
+            if malla and not celda_proyecto(proyecto, malla):
+                messages.warning(
+                    request,
+                    "Las coordenadas del proyecto no tienen dato en la malla de irradiancia; se usó la ciudad seleccionada."
+                )
+                malla = ""
+
             obj, created = NumeroPaneles.objects.update_or_create(
                 proyecto=proyecto,
                 defaults={
                     "tipo_facturacion": tipo_fact_db,
                     "irradiancia": irradiancia,
+                    "malla_irradiancia": malla,
                     "panel": panel,
                     "eficiencia": eff,
                     "consumos": consumos,
@@ -1512,6 +1515,13 @@ def dimensionamiento_calculo_modulos(request):
 
     puede_descargar_pdf = bool(np_obj and resultado)
 
+    # ✅ Gráficas pre-renderizadas en SVG (cacheadas por hash de datos)
+    chart_svg_gen = ""
+    chart_svg_gen_vs_cons = ""
+    if chart_labels:
+        chart_svg_gen = svg_generacion(chart_labels, chart_generacion)
+        chart_svg_gen_vs_cons = svg_generacion_vs_consumo(chart_labels, chart_consumo, chart_generacion)
+
     context = {
         "proyectos": proyectos,
         "irradiancias": irradiancias,
@@ -1519,6 +1529,11 @@ def dimensionamiento_calculo_modulos(request):
         "meses": meses,
         "bimestres": bimestres,
 
+        # Malla de irradiancia (opcional, SWGFV_IRRADIANCIA_MALLA)
+        "malla_irradiancia": malla_activa(),
+        "sugerencia": sugerencia,
+        "celda_malla": celda_proyecto(np_obj.proyecto, np_obj.malla_irradiancia) if np_obj and np_obj.malla_irradiancia else None,
+
         "np_obj": np_obj,
         "resultado": resultado,
         "selected_proyecto_id": selected_proyecto_id,
@@ -1534,6 +1549,8 @@ def dimensionamiento_calculo_modulos(request):
         "chart_labels": chart_labels,
         "chart_consumo": chart_consumo,
         "chart_generacion": chart_generacion,
+        "chart_svg_gen": chart_svg_gen,
+        "chart_svg_gen_vs_cons": chart_svg_gen_vs_cons,
 
         "puede_descargar_pdf": puede_descargar_pdf,
     }
@@ -1614,8 +1631,8 @@ def dimensionamiento_dimensionamiento(request):
     dim = None
     detalles = []
 
-    inversores = Inversor.objects.all().order_by("marca", "modelo")
-    micro_inversores = MicroInversor.objects.all().order_by("marca", "modelo")
+    inversores = get_catalogo("inversores")
+    micro_inversores = get_catalogo("micro_inversores")
 
     def to_decimal_or_none(value):
         try:
@@ -2649,17 +2666,7 @@ def calculo_dc_pdf(request, proyecto_id: int):
     # =========================================================
     # FONDO / MEMBRETE
     # =========================================================
-    def draw_page_background(canvas, doc):
-        width, height = letter
-
-        bg_path = finders.find("core/img/hoja_membretada.png")
-        if bg_path:
-            try:
-                canvas.drawImage(bg_path, 0, 0, width=width, height=height, preserveAspectRatio=False, mask='auto')
-            except Exception:
-                pass
-
-    doc.build(elements, onFirstPage=draw_page_background, onLaterPages=draw_page_background)
+    build_fortia_pdf(doc, elements, "calculo_dc")
     return response
 
 @require_session_login
@@ -2849,7 +2856,7 @@ def calculo_ac_pdf(request, proyecto_id: int):
         elements.append(Spacer(1, 0.2 * cm))
 
     add_fortia_footer(elements, pdfs)
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
+    build_fortia_pdf(doc, elements, "calculo_ac")
     return response
 
 @require_session_login
@@ -3837,7 +3844,7 @@ def calculo_caida_tension_pdf(request, proyecto_id: int):
         elements.append(Spacer(1, 0.18 * cm))
 
     add_fortia_footer(elements, pdfs)
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
+    build_fortia_pdf(doc, elements, "caida_tension")
     return response
 
 @require_session_login
@@ -3846,18 +3853,13 @@ def recursos_conceptos(request):
     q = (request.GET.get("q") or "").strip()
     categoria = (request.GET.get("categoria") or "").strip()
 
-    conceptos = GlosarioConcepto.objects.all().order_by("nombre_concepto")
-
-    if q:
-        conceptos = conceptos.filter(
-            Q(nombre_concepto__icontains=q) |
-            Q(descripcion__icontains=q) |
-            Q(formula__icontains=q) |
-            Q(categoria__icontains=q)
-        )
-
-    if categoria:
-        conceptos = conceptos.filter(categoria__iexact=categoria)
+    if q or categoria:
+        # Índice invertido en memoria: sin acentos, por raíz/prefijo y ordenado por relevancia
+        ids = indice_glosario().buscar(q, categoria)
+        por_id = GlosarioConcepto.objects.in_bulk(ids)
+        conceptos = [por_id[i] for i in ids if i in por_id]
+    else:
+        conceptos = GlosarioConcepto.objects.order_by("clave_orden", "nombre_concepto")
 
     categorias = list(
         GlosarioConcepto.objects.exclude(categoria__exact="")
@@ -3875,6 +3877,26 @@ def recursos_conceptos(request):
     return render(request, "core/pages/recursos_conceptos.html", context)
 
 
+@require_session_login
+@require_http_methods(["GET"])
+def recursos_conceptos_autocompletar(request):
+    q = (request.GET.get("q") or "").strip()
+    try:
+        limite = min(max(int(request.GET.get("limite") or 8), 1), 20)
+    except ValueError:
+        limite = 8
+
+    if len(q) < 2:
+        return JsonResponse({"ok": True, "q": q, "resultados": []})
+
+    indice = indice_glosario()
+    resultados = []
+    for concepto_id in indice.buscar(q, limite=limite):
+        doc = indice.docs[concepto_id]
+        resultados.append({"id": concepto_id, "nombre": doc["nombre"], "categoria": doc["categoria"]})
+    return JsonResponse({"ok": True, "q": q, "resultados": resultados})
+
+
 @require_admin
 @require_http_methods(["GET", "POST"])
 def recursos_alta_concepto(request):
@@ -3946,11 +3968,11 @@ def recursos_modificacion_concepto(request):
     # ==========================
     if mostrar_todos and not search_submitted and not any([q_id, q_nombre]):
         mostrar_lista = True
-        conceptos = GlosarioConcepto.objects.all().order_by("nombre_concepto")
+        conceptos = GlosarioConcepto.objects.order_by("clave_orden", "nombre_concepto")
 
     elif search_submitted:
         mostrar_lista = True
-        qs = GlosarioConcepto.objects.all().order_by("nombre_concepto")
+        qs = GlosarioConcepto.objects.order_by("clave_orden", "nombre_concepto")
 
         if q_id:
             if not q_id.isdigit():
@@ -4050,37 +4072,42 @@ def recursos_modificacion_concepto(request):
     }
     return render(request, "core/pages/recursos_modificacion_concepto.html", context)
 
+def _derivados_tabla(obj):
+    # Si Pillow no puede con el archivo se sigue sirviendo el original
+    try:
+        generar_derivados(obj)
+    except Exception:
+        logger.exception("No se pudieron generar los derivados de la tabla NOM %s", obj.pk)
+
 @require_session_login
 @require_http_methods(["GET"])
 def recursos_tablas(request):
     q = (request.GET.get("q") or "").strip()
     tabla_id = (request.GET.get("tabla") or "").strip()
 
-    tablas = TablaNOM.objects.all().order_by("nombre_tabla")
-
     if q:
-        tablas = tablas.filter(
-            Q(nombre_tabla__icontains=q) |
-            Q(notas__icontains=q)
-        )
+        # Índice de texto (tsvector / FTS5): relevancia y fragmentos resaltados desde la BD
+        tablas = buscar_tablas(TablaNOM.objects.all(), q)
+    else:
+        # La lista solo muestra id y nombre; las notas se leen al seleccionar
+        tablas = TablaNOM.objects.only("id", "nombre_tabla").order_by("nombre_tabla")
 
     seleccionada = None
-    imagen_url = ""
+    imagen = {}
 
     if tabla_id.isdigit():
         seleccionada = TablaNOM.objects.filter(id=int(tabla_id)).first()
 
-        if seleccionada and seleccionada.imagen:
-            try:
-                imagen_url = seleccionada.imagen.url
-            except Exception:
-                imagen_url = ""
+        if seleccionada:
+            imagen = fuentes_tabla(seleccionada)
 
     context = {
         "tablas": tablas,
         "q": q,
         "seleccionada": seleccionada,
-        "imagen_url": imagen_url,
+        # src/srcset con los derivados WebP; el original solo lo pide el visor
+        "imagen": imagen,
+        "imagen_url": imagen.get("src", ""),
     }
     return render(request, "core/pages/recursos_tablas.html", context)
 
@@ -4100,6 +4127,7 @@ def recursos_alta_tabla(request):
 
         if form.is_valid():
             obj = form.save()
+            _derivados_tabla(obj)
 
             log_event(
                 request,
@@ -4221,6 +4249,7 @@ def recursos_modificacion_tabla(request):
 
         if form.is_valid():
             obj = form.save()
+            _derivados_tabla(obj)
 
             log_event(
                 request,
@@ -4260,6 +4289,7 @@ def recursos_modificacion_tabla(request):
         "mostrar_todos": mostrar_todos,
         "tablas": tablas,
         "seleccionada": seleccionada,
+        "imagen": fuentes_tabla(seleccionada) if seleccionada else {},
         "form": form,
         "edit_mode": edit_mode,
         "show_edit_popup": show_edit_popup,
@@ -4290,6 +4320,7 @@ def proyecto_pdf(request, proyecto_id: int):
 
     numero_paneles = NumeroPaneles.objects.select_related("irradiancia", "panel").filter(proyecto=proyecto).first()
     resultado_paneles = ResultadoPaneles.objects.filter(numero_paneles=numero_paneles).first() if numero_paneles else None
+    irradiancia_calculo = irradiancia_para_calculo(numero_paneles) if numero_paneles else None
 
     dimensionamiento = Dimensionamiento.objects.filter(proyecto=proyecto).first()
     detalles_dimensionamiento = list(
@@ -4370,261 +4401,18 @@ def proyecto_pdf(request, proyecto_id: int):
     response = HttpResponse(content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
-    doc = build_fortia_doc(response, f"Proyecto completo {proyecto.id}")
     pdfs = get_fortia_styles()
-    elements = []
+    titulo_pdf = f"Proyecto completo {proyecto.id}"
 
     generado_por = request.session.get("usuario", "")
     tipo = request.session.get("tipo", "")
     fecha = timezone.localtime().strftime("%d/%m/%Y %H:%M")
 
-    add_fortia_header(
-        elements,
-        "Memoria técnica integral del proyecto",
-        "Sistema Web de Gestión de Proyectos Fotovoltaicos",
-        pdfs
-    )
-
-    # =========================================================
-    # DATOS GENERALES
-    # =========================================================
-    elements.append(Paragraph("Datos generales del proyecto", pdfs["section"]))
-
-    data = [
-        [
-            Paragraph("<b>ID</b>", pdfs["label"]),
-            Paragraph(str(proyecto.id), pdfs["value"]),
-            Paragraph("<b>Fecha de generación</b>", pdfs["label"]),
-            Paragraph(fecha, pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Nombre del proyecto</b>", pdfs["label"]),
-            Paragraph(proyecto.Nombre_Proyecto or "—", pdfs["value"]),
-            Paragraph("<b>Generado por</b>", pdfs["label"]),
-            Paragraph(f"{generado_por} ({tipo})", pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Empresa</b>", pdfs["label"]),
-            Paragraph(proyecto.Nombre_Empresa or "—", pdfs["value"]),
-            Paragraph("<b>Usuario asociado</b>", pdfs["label"]),
-            Paragraph(getattr(proyecto.ID_Usuario, "Correo_electronico", "—") or "—", pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Dirección</b>", pdfs["label"]),
-            Paragraph(proyecto.Direccion or "—", pdfs["value"]),
-            Paragraph("<b>Coordenadas</b>", pdfs["label"]),
-            Paragraph(proyecto.Coordenadas or "—", pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
-            Paragraph(proyecto.Voltaje_Nominal or "—", pdfs["value"]),
-            Paragraph("<b>Número de fases</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Numero_Fases), pdfs["value"]),
-        ],
-    ]
-    elements.append(make_info_table(data, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
-
-    # =========================================================
-    # NÚMERO DE MÓDULOS
-    # =========================================================
-    elements.append(Paragraph("Cálculo de número de módulos", pdfs["section"]))
-
-    resumen_modulos = [
-        [
-            Paragraph("<b>Tipo de facturación</b>", pdfs["label"]),
-            Paragraph(numero_paneles.tipo_facturacion or "—", pdfs["value"]),
-            Paragraph("<b>Eficiencia</b>", pdfs["label"]),
-            Paragraph(str(numero_paneles.eficiencia or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Módulo seleccionado</b>", pdfs["label"]),
-            Paragraph(
-                f"{numero_paneles.panel.marca} - {numero_paneles.panel.modelo} ({numero_paneles.panel.potencia} W)"
-                if numero_paneles and numero_paneles.panel else "—",
-                pdfs["value"]
-            ),
-            Paragraph("<b>Número de módulos</b>", pdfs["label"]),
-            Paragraph(str(resultado_paneles.no_modulos or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Potencia total (kW)</b>", pdfs["label"]),
-            Paragraph(str(resultado_paneles.potencia_total or "—"), pdfs["value"]),
-            Paragraph("<b>Generación anual (kWh)</b>", pdfs["label"]),
-            Paragraph(str(resultado_paneles.generacion_anual or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Irradiancia</b>", pdfs["label"]),
-            Paragraph(
-                f"{numero_paneles.irradiancia.ciudad}, {numero_paneles.irradiancia.estado}"
-                if numero_paneles and numero_paneles.irradiancia else "—",
-                pdfs["value"]
-            ),
-            Paragraph("<b>Panel</b>", pdfs["label"]),
-            Paragraph(
-                f"Voc: {numero_paneles.panel.voc} / Isc: {numero_paneles.panel.isc}"
-                if numero_paneles and numero_paneles.panel else "—",
-                pdfs["value"]
-            ),
-        ],
-    ]
-    elements.append(make_info_table(resumen_modulos, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
-    elements.append(Spacer(1, 0.2 * cm))
-
-    cons = numero_paneles.consumos or {}
-    genp = resultado_paneles.generacion_por_periodo or {}
-
-    if numero_paneles.tipo_facturacion == "MENSUAL":
-        orden = [
-            ("ene", "Ene"), ("feb", "Feb"), ("mar", "Mar"), ("abr", "Abr"),
-            ("may", "May"), ("jun", "Jun"), ("jul", "Jul"), ("ago", "Ago"),
-            ("sep", "Sep"), ("oct", "Oct"), ("nov", "Nov"), ("dic", "Dic"),
-        ]
-    else:
-        orden = [
-            ("bim1", "Bim 1"), ("bim2", "Bim 2"), ("bim3", "Bim 3"),
-            ("bim4", "Bim 4"), ("bim5", "Bim 5"), ("bim6", "Bim 6"),
-        ]
-
-    labels = [lbl for _, lbl in orden]
-    consumo_vals = [float(cons.get(k, 0) or 0) for k, _ in orden]
-    gen_vals = [float(genp.get(k, 0) or 0) for k, _ in orden]
-
-    tabla_periodos = [["Periodo", "Consumo (kWh)", "Generación (kWh)"]]
-    for i in range(len(labels)):
-        tabla_periodos.append([
-            labels[i],
-            f"{consumo_vals[i]:.3f}",
-            f"{gen_vals[i]:.3f}",
-        ])
-
-    elements.append(make_data_table(tabla_periodos, [4.0 * cm, 6.0 * cm, 6.0 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
-
-    from reportlab.graphics.shapes import Drawing
-    from reportlab.graphics.charts.barcharts import VerticalBarChart
-    from reportlab.graphics.charts.legends import Legend
-    from reportlab.lib.colors import HexColor
-
-    # Gráfica 1
-    d1 = Drawing(500, 220)
-    chart1 = VerticalBarChart()
-    chart1.x = 30
-    chart1.y = 30
-    chart1.height = 150
-    chart1.width = 440
-    chart1.data = [gen_vals]
-    chart1.categoryAxis.categoryNames = labels
-    chart1.valueAxis.valueMin = 0
-    chart1.bars[0].fillColor = HexColor("#2E86DE")
-    d1.add(chart1)
-
-    elements.append(Paragraph("Gráfica 1: Generación por periodo (kWh)", pdfs["block_title"]))
-    elements.append(d1)
-    elements.append(Spacer(1, 0.2 * cm))
-
-    # Gráfica 2
-    d2 = Drawing(500, 240)
-    chart2 = VerticalBarChart()
-    chart2.x = 30
-    chart2.y = 30
-    chart2.height = 160
-    chart2.width = 440
-    chart2.data = [consumo_vals, gen_vals]
-    chart2.categoryAxis.categoryNames = labels
-    chart2.valueAxis.valueMin = 0
-    chart2.bars[0].fillColor = HexColor("#E67E22")
-    chart2.bars[1].fillColor = HexColor("#2ECC71")
-
-    legend = Legend()
-    legend.x = 360
-    legend.y = 200
-    legend.alignment = "right"
-    legend.colorNamePairs = [
-        (HexColor("#E67E22"), "Consumo (kWh)"),
-        (HexColor("#2ECC71"), "Generación (kWh)"),
-    ]
-
-    d2.add(chart2)
-    d2.add(legend)
-
-    elements.append(Paragraph("Gráfica 2: Generación vs consumo", pdfs["block_title"]))
-    elements.append(d2)
-    elements.append(PageBreak())
-
-    # =========================================================
-    # DIMENSIONAMIENTO
-    # =========================================================
-    elements.append(Paragraph("Dimensionamiento", pdfs["section"]))
-
-    modelo_modulo = "—"
-    if numero_paneles and numero_paneles.panel:
-        modelo_modulo = f"{numero_paneles.panel.marca} - {numero_paneles.panel.modelo} ({numero_paneles.panel.potencia} W)"
-
-    resumen_dim = [
-        [
-            Paragraph("<b>Proyecto</b>", pdfs["label"]),
-            Paragraph(proyecto.Nombre_Proyecto or "—", pdfs["value"]),
-            Paragraph("<b>Tipo de instalación</b>", pdfs["label"]),
-            Paragraph(dimensionamiento.tipo_inversor if dimensionamiento else "—", pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Número de inversores</b>", pdfs["label"]),
-            Paragraph(str(dimensionamiento.no_inversores if dimensionamiento else "—"), pdfs["value"]),
-            Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Número de módulos</b>", pdfs["label"]),
-            Paragraph(str(resultado_paneles.no_modulos or "—"), pdfs["value"]),
-            Paragraph("<b>Potencia total (kW)</b>", pdfs["label"]),
-            Paragraph(str(resultado_paneles.potencia_total or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Módulo seleccionado</b>", pdfs["label"]),
-            Paragraph(modelo_modulo, pdfs["value"]),
-            Paragraph("<b>Número de fases</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
-        ],
-    ]
-    elements.append(make_info_table(resumen_dim, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
-
-    for d in detalles_dimensionamiento:
-        modelo = d.inversor or d.micro_inversor
-        mods = d.modulos_por_cadena_lista or []
-
-        if mods:
-            mods_txt = "<br/>".join([f"Cad {idx + 1}: {val}" for idx, val in enumerate(mods)])
-            total_modulos_inversor = sum(int(v or 0) for v in mods)
-        else:
-            mods_txt = str(d.modulos_por_cadena or "—")
-            total_modulos_inversor = int(d.no_cadenas or 0) * int(d.modulos_por_cadena or 0)
-
-        elements.append(Paragraph(f"Inversor {d.indice} — {modelo}", pdfs["block_title"]))
-
-        bloque_dim = [
-            [
-                Paragraph("<b>Cadenas</b>", pdfs["label"]),
-                Paragraph(str(d.no_cadenas), pdfs["value"]),
-                Paragraph("<b>Módulos por inversor</b>", pdfs["label"]),
-                Paragraph(str(total_modulos_inversor), pdfs["value"]),
-            ],
-            [
-                Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
-                Paragraph(mods_txt, pdfs["wrap"]),
-                Paragraph("<b>Tipo de equipo</b>", pdfs["label"]),
-                Paragraph("Micro inversor" if d.micro_inversor_id else "Inversor", pdfs["value"]),
-            ],
-        ]
-        elements.append(make_info_table(bloque_dim, [3.2 * cm, 5.8 * cm, 3.3 * cm, 4.2 * cm]))
-        elements.append(Spacer(1, 0.18 * cm))
-
-    # =========================================================
-    # CÁLCULO DC
-    # =========================================================
-    elements.append(PageBreak())
-    elements.append(Paragraph("Cálculo DC", pdfs["section"]))
+    def _fecha_calculo(registros):
+        fechas = [x.created_at for x in registros if x.created_at]
+        if not fechas:
+            return "—"
+        return timezone.localtime(max(fechas)).strftime("%d/%m/%Y %H:%M")
 
     np_obj = numero_paneles
     resultado_paneles_local = resultado_paneles
@@ -4647,307 +4435,598 @@ def proyecto_pdf(request, proyecto_id: int):
     if dim_local:
         no_inversores = str(dim_local.no_inversores or "—")
 
-    general_dc = [
-        [
-            Paragraph("<b>Proyecto</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
-            Paragraph("<b>Empresa</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Nombre_Empresa or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
-            Paragraph("<b>Número de fases</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Número de módulos</b>", pdfs["label"]),
-            Paragraph(no_modulos, pdfs["value"]),
-            Paragraph("<b>Número de inversores</b>", pdfs["label"]),
-            Paragraph(no_inversores, pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Voc del módulo</b>", pdfs["label"]),
-            Paragraph(voc_modulo, pdfs["value"]),
-            Paragraph("<b>Isc del módulo</b>", pdfs["label"]),
-            Paragraph(isc_modulo, pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Modelo del módulo</b>", pdfs["label"]),
-            Paragraph(modelo_modulo_dc, pdfs["value"]),
-            Paragraph("<b>Fecha</b>", pdfs["label"]),
-            Paragraph(fecha, pdfs["value"]),
-        ],
-    ]
-    elements.append(make_info_table(general_dc, [3.0 * cm, 5.5 * cm, 3.0 * cm, 5.2 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
-
-    for r in calculos_dc:
-        det = r.dimensionamiento_detalle
-        modelo = str((det.inversor if det else None) or (det.micro_inversor if det else None) or "—")
-        tipo_equipo = "Micro inversor" if det and det.micro_inversor_id else "Inversor"
-
-        lista_modulos = det.modulos_por_cadena_lista if det else []
-        if lista_modulos:
-            modulos_por_inversor = sum(int(v or 0) for v in lista_modulos)
-            modulos_cadena_txt = "<br/>".join([f"Cad {i + 1}: {v}" for i, v in enumerate(lista_modulos)])
-        else:
-            modulos_por_inversor = int((det.no_cadenas or 0) * (det.modulos_por_cadena or 0)) if det else 0
-            modulos_cadena_txt = str(det.modulos_por_cadena or "—") if det else "—"
-
-        res = r.resultado_dc
-        con = r.condulet
+    # =========================================================
+    # SECCIONES
+    # Cada una se renderiza como fragmento PDF independiente y se
+    # cachea con el hash de los datos de su etapa. La fecha y el
+    # usuario que genera el PDF se estampan al ensamblar.
+    # =========================================================
+    def _seccion_modulos():
+        elements = []
+
+        add_fortia_header(
+            elements,
+            "Memoria técnica integral del proyecto",
+            "Sistema Web de Gestión de Proyectos Fotovoltaicos",
+            pdfs
+        )
 
-        elements.append(Paragraph(f"{tipo_equipo} {r.indice} — {modelo}", pdfs["block_title"]))
+        # =========================================================
+        # DATOS GENERALES
+        # =========================================================
+        elements.append(Paragraph("Datos generales del proyecto", pdfs["section"]))
 
-        data_dc = [
+        data = [
             [
-                Paragraph("<b>Número de series</b>", pdfs["label"]),
-                Paragraph(str(det.no_cadenas if det else "—"), pdfs["value"]),
-                Paragraph("<b>Número de módulos por inversor</b>", pdfs["label"]),
-                Paragraph(str(modulos_por_inversor), pdfs["value"]),
+                Paragraph("<b>ID</b>", pdfs["label"]),
+                Paragraph(str(proyecto.id), pdfs["value"]),
+                Paragraph("<b>Usuario asociado</b>", pdfs["label"]),
+                Paragraph(getattr(proyecto.ID_Usuario, "Correo_electronico", "—") or "—", pdfs["value"]),
             ],
             [
-                Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
-                Paragraph(modulos_cadena_txt, pdfs["wrap"]),
-                Paragraph("<b>Metros lineales</b>", pdfs["label"]),
-                Paragraph(str(r.metros_lineales or "—"), pdfs["value"]),
+                Paragraph("<b>Nombre del proyecto</b>", pdfs["label"]),
+                Paragraph(proyecto.Nombre_Proyecto or "—", pdfs["value"]),
+                Paragraph("<b>Empresa</b>", pdfs["label"]),
+                Paragraph(proyecto.Nombre_Empresa or "—", pdfs["value"]),
             ],
             [
-                Paragraph("<b>Calibre cable solar</b>", pdfs["label"]),
-                Paragraph(str(r.calibre_cable_solar or "—"), pdfs["value"]),
-                Paragraph("<b>Hilos por tubería</b>", pdfs["label"]),
-                Paragraph(str(r.hilos_tuberia or "—"), pdfs["value"]),
+                Paragraph("<b>Dirección</b>", pdfs["label"]),
+                Paragraph(proyecto.Direccion or "—", pdfs["value"]),
+                Paragraph("<b>Coordenadas</b>", pdfs["label"]),
+                Paragraph(proyecto.Coordenadas or "—", pdfs["value"]),
             ],
             [
-                Paragraph("<b>Amperaje protección</b>", pdfs["label"]),
-                Paragraph(f"{getattr(res, 'amperaje_fusible', '—')} A" if res else "—", pdfs["value"]),
-                Paragraph("<b>Total de cadenas</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_de_cadenas", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
+                Paragraph(proyecto.Voltaje_Nominal or "—", pdfs["value"]),
+                Paragraph("<b>Número de fases</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Numero_Fases), pdfs["value"]),
             ],
+        ]
+        elements.append(make_info_table(data, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
+
+        # =========================================================
+        # NÚMERO DE MÓDULOS
+        # =========================================================
+        elements.append(Paragraph("Cálculo de número de módulos", pdfs["section"]))
+
+        resumen_modulos = [
             [
-                Paragraph("<b>Total fusibles</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_fusibles", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>Metros totales cable</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "metros_totales_cable", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Tipo de facturación</b>", pdfs["label"]),
+                Paragraph(numero_paneles.tipo_facturacion or "—", pdfs["value"]),
+                Paragraph("<b>Eficiencia</b>", pdfs["label"]),
+                Paragraph(str(numero_paneles.eficiencia or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Calibre tubería</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "calibre_tuberia", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>Total tubos</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_tubos", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Módulo seleccionado</b>", pdfs["label"]),
+                Paragraph(
+                    f"{numero_paneles.panel.marca} - {numero_paneles.panel.modelo} ({numero_paneles.panel.potencia} W)"
+                    if numero_paneles and numero_paneles.panel else "—",
+                    pdfs["value"]
+                ),
+                Paragraph("<b>Número de módulos</b>", pdfs["label"]),
+                Paragraph(str(resultado_paneles.no_modulos or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Condulets LL / LR / LB / T / C</b>", pdfs["label"]),
+                Paragraph("<b>Potencia total (kW)</b>", pdfs["label"]),
+                Paragraph(str(resultado_paneles.potencia_total or "—"), pdfs["value"]),
+                Paragraph("<b>Generación anual (kWh)</b>", pdfs["label"]),
+                Paragraph(str(resultado_paneles.generacion_anual or "—"), pdfs["value"]),
+            ],
+            [
+                Paragraph("<b>Irradiancia</b>", pdfs["label"]),
                 Paragraph(
-                    f"{con.tipo_ll if con else 0} / {con.tipo_lr if con else 0} / {con.tipo_lb if con else 0} / {con.tipo_t if con else 0} / {con.tipo_c if con else 0}",
+                    f"{irradiancia_calculo.ciudad}, {irradiancia_calculo.estado}"
+                    if irradiancia_calculo else "—",
+                    pdfs["value"]
+                ),
+                Paragraph("<b>Panel</b>", pdfs["label"]),
+                Paragraph(
+                    f"Voc: {numero_paneles.panel.voc} / Isc: {numero_paneles.panel.isc}"
+                    if numero_paneles and numero_paneles.panel else "—",
                     pdfs["value"]
                 ),
-                Paragraph("<b>Total condulets</b>", pdfs["label"]),
-                Paragraph(str(con.total() if con else 0), pdfs["value"]),
             ],
         ]
-        elements.append(make_info_table(data_dc, [3.6 * cm, 4.6 * cm, 3.8 * cm, 4.8 * cm]))
-        elements.append(Spacer(1, 0.18 * cm))
+        elements.append(make_info_table(resumen_modulos, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
+        elements.append(Spacer(1, 0.2 * cm))
 
-    # =========================================================
-    # CÁLCULO AC
-    # =========================================================
-    elements.append(PageBreak())
-    elements.append(Paragraph("Cálculo AC", pdfs["section"]))
+        cons = numero_paneles.consumos or {}
+        genp = resultado_paneles.generacion_por_periodo or {}
 
-    general_ac = [
-        [
-            Paragraph("<b>Proyecto</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
-            Paragraph("<b>Empresa</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Nombre_Empresa or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
-            Paragraph("<b>Número de fases</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Número de módulos</b>", pdfs["label"]),
-            Paragraph(no_modulos, pdfs["value"]),
-            Paragraph("<b>Número de inversores</b>", pdfs["label"]),
-            Paragraph(no_inversores, pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Voc del módulo</b>", pdfs["label"]),
-            Paragraph(voc_modulo, pdfs["value"]),
-            Paragraph("<b>Isc del módulo</b>", pdfs["label"]),
-            Paragraph(isc_modulo, pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Modelo del módulo</b>", pdfs["label"]),
-            Paragraph(modelo_modulo_dc, pdfs["value"]),
-            Paragraph("<b>Fecha</b>", pdfs["label"]),
-            Paragraph(fecha, pdfs["value"]),
-        ],
-    ]
-    elements.append(make_info_table(general_ac, [3.0 * cm, 5.5 * cm, 3.0 * cm, 5.2 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
+        if numero_paneles.tipo_facturacion == "MENSUAL":
+            orden = [
+                ("ene", "Ene"), ("feb", "Feb"), ("mar", "Mar"), ("abr", "Abr"),
+                ("may", "May"), ("jun", "Jun"), ("jul", "Jul"), ("ago", "Ago"),
+                ("sep", "Sep"), ("oct", "Oct"), ("nov", "Nov"), ("dic", "Dic"),
+            ]
+        else:
+            orden = [
+                ("bim1", "Bim 1"), ("bim2", "Bim 2"), ("bim3", "Bim 3"),
+                ("bim4", "Bim 4"), ("bim5", "Bim 5"), ("bim6", "Bim 6"),
+            ]
 
-    for r in calculos_ac:
-        det = r.dimensionamiento_detalle
-        modelo = str((det.inversor if det else None) or (det.micro_inversor if det else None) or "—")
-        tipo_equipo = "Micro inversor" if det and det.micro_inversor_id else "Inversor"
+        labels = [lbl for _, lbl in orden]
+        consumo_vals = [float(cons.get(k, 0) or 0) for k, _ in orden]
+        gen_vals = [float(genp.get(k, 0) or 0) for k, _ in orden]
 
-        lista_modulos = det.modulos_por_cadena_lista if det else []
-        if lista_modulos:
-            modulos_por_inversor = sum(int(v or 0) for v in lista_modulos)
-            modulos_cadena_txt = "<br/>".join([f"Cad {i + 1}: {v}" for i, v in enumerate(lista_modulos)])
-        else:
-            modulos_por_inversor = int((det.no_cadenas or 0) * (det.modulos_por_cadena or 0)) if det else 0
-            modulos_cadena_txt = str(det.modulos_por_cadena or "—") if det else "—"
+        tabla_periodos = [["Periodo", "Consumo (kWh)", "Generación (kWh)"]]
+        for i in range(len(labels)):
+            tabla_periodos.append([
+                labels[i],
+                f"{consumo_vals[i]:.3f}",
+                f"{gen_vals[i]:.3f}",
+            ])
 
-        res = r.resultado_ac
-        con = r.condulet
+        elements.append(make_data_table(tabla_periodos, [4.0 * cm, 6.0 * cm, 6.0 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
 
-        elements.append(Paragraph(f"{tipo_equipo} {r.indice} — {modelo}", pdfs["block_title"]))
+        # Gráfica 1
+        d1 = drawing_generacion(labels, gen_vals)
 
-        corriente_salida = "—"
-        if det:
-            if det.inversor_id and det.inversor and det.inversor.corriente_salida is not None:
-                corriente_salida = f"{det.inversor.corriente_salida} A"
-            elif det.micro_inversor_id and det.micro_inversor and det.micro_inversor.corriente_salida is not None:
-                corriente_salida = f"{det.micro_inversor.corriente_salida} A"
+        elements.append(Paragraph("Gráfica 1: Generación por periodo (kWh)", pdfs["block_title"]))
+        elements.append(d1)
+        elements.append(Spacer(1, 0.2 * cm))
+
+        # Gráfica 2
+        d2 = drawing_generacion_vs_consumo(labels, consumo_vals, gen_vals)
+
+        elements.append(Paragraph("Gráfica 2: Generación vs consumo", pdfs["block_title"]))
+        elements.append(d2)
+        return elements
+
+    def _seccion_dimensionamiento():
+        elements = []
+
+        # =========================================================
+        # DIMENSIONAMIENTO
+        # =========================================================
+        elements.append(Paragraph("Dimensionamiento", pdfs["section"]))
+
+        modelo_modulo = "—"
+        if numero_paneles and numero_paneles.panel:
+            modelo_modulo = f"{numero_paneles.panel.marca} - {numero_paneles.panel.modelo} ({numero_paneles.panel.potencia} W)"
 
-        data_ac = [
+        resumen_dim = [
             [
-                Paragraph("<b>Número de series</b>", pdfs["label"]),
-                Paragraph(str(det.no_cadenas if det else "—"), pdfs["value"]),
-                Paragraph("<b>Número de módulos por inversor</b>", pdfs["label"]),
-                Paragraph(str(modulos_por_inversor), pdfs["value"]),
+                Paragraph("<b>Proyecto</b>", pdfs["label"]),
+                Paragraph(proyecto.Nombre_Proyecto or "—", pdfs["value"]),
+                Paragraph("<b>Tipo de instalación</b>", pdfs["label"]),
+                Paragraph(dimensionamiento.tipo_inversor if dimensionamiento else "—", pdfs["value"]),
             ],
             [
-                Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
-                Paragraph(modulos_cadena_txt, pdfs["wrap"]),
-                Paragraph("<b>Corriente de salida</b>", pdfs["label"]),
-                Paragraph(corriente_salida, pdfs["value"]),
+                Paragraph("<b>Número de inversores</b>", pdfs["label"]),
+                Paragraph(str(dimensionamiento.no_inversores if dimensionamiento else "—"), pdfs["value"]),
+                Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Metros lineales por fase</b>", pdfs["label"]),
-                Paragraph(str(r.metros_lineales_ac or "—"), pdfs["value"]),
-                Paragraph("<b>Calibre cable THHW</b>", pdfs["label"]),
-                Paragraph(str(r.calibre_cable_thhw or "—"), pdfs["value"]),
+                Paragraph("<b>Número de módulos</b>", pdfs["label"]),
+                Paragraph(str(resultado_paneles.no_modulos or "—"), pdfs["value"]),
+                Paragraph("<b>Potencia total (kW)</b>", pdfs["label"]),
+                Paragraph(str(resultado_paneles.potencia_total or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Hilos por tubería</b>", pdfs["label"]),
-                Paragraph(str(r.hilos_tuberia_ac or "—"), pdfs["value"]),
-                Paragraph("<b>Amperaje protección</b>", pdfs["label"]),
-                Paragraph(f"{getattr(res, 'amperaje_proteccion', '—')} A" if res else "—", pdfs["value"]),
+                Paragraph("<b>Módulo seleccionado</b>", pdfs["label"]),
+                Paragraph(modelo_modulo, pdfs["value"]),
+                Paragraph("<b>Número de fases</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
             ],
+        ]
+        elements.append(make_info_table(resumen_dim, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
+
+        for d in detalles_dimensionamiento:
+            modelo = d.inversor or d.micro_inversor
+            mods = d.modulos_por_cadena_lista or []
+
+            if mods:
+                mods_txt = "<br/>".join([f"Cad {idx + 1}: {val}" for idx, val in enumerate(mods)])
+                total_modulos_inversor = sum(int(v or 0) for v in mods)
+            else:
+                mods_txt = str(d.modulos_por_cadena or "—")
+                total_modulos_inversor = int(d.no_cadenas or 0) * int(d.modulos_por_cadena or 0)
+
+            elements.append(Paragraph(f"Inversor {d.indice} — {modelo}", pdfs["block_title"]))
+
+            bloque_dim = [
+                [
+                    Paragraph("<b>Cadenas</b>", pdfs["label"]),
+                    Paragraph(str(d.no_cadenas), pdfs["value"]),
+                    Paragraph("<b>Módulos por inversor</b>", pdfs["label"]),
+                    Paragraph(str(total_modulos_inversor), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
+                    Paragraph(mods_txt, pdfs["wrap"]),
+                    Paragraph("<b>Tipo de equipo</b>", pdfs["label"]),
+                    Paragraph("Micro inversor" if d.micro_inversor_id else "Inversor", pdfs["value"]),
+                ],
+            ]
+            elements.append(make_info_table(bloque_dim, [3.2 * cm, 5.8 * cm, 3.3 * cm, 4.2 * cm]))
+            elements.append(Spacer(1, 0.18 * cm))
+        return elements
+
+    def _seccion_dc():
+        elements = []
+
+        # =========================================================
+        # CÁLCULO DC
+        # =========================================================
+        elements.append(Paragraph("Cálculo DC", pdfs["section"]))
+
+        general_dc = [
             [
-                Paragraph("<b>Total de cadenas</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_de_cadenas_ac", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>Total protecciones</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_protecciones", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Proyecto</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
+                Paragraph("<b>Empresa</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Nombre_Empresa or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Metros totales cable</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "metros_totales_cable_ac", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>Calibre tubería</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "calibre_tuberia_ac", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
+                Paragraph("<b>Número de fases</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Total tubos</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "total_tubos_ac", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>Condulets LL / LR / LB / T / C</b>", pdfs["label"]),
-                Paragraph(
-                    f"{con.tipo_ll if con else 0} / {con.tipo_lr if con else 0} / {con.tipo_lb if con else 0} / {con.tipo_t if con else 0} / {con.tipo_c if con else 0}",
-                    pdfs["value"]
-                ),
+                Paragraph("<b>Número de módulos</b>", pdfs["label"]),
+                Paragraph(no_modulos, pdfs["value"]),
+                Paragraph("<b>Número de inversores</b>", pdfs["label"]),
+                Paragraph(no_inversores, pdfs["value"]),
+            ],
+            [
+                Paragraph("<b>Voc del módulo</b>", pdfs["label"]),
+                Paragraph(voc_modulo, pdfs["value"]),
+                Paragraph("<b>Isc del módulo</b>", pdfs["label"]),
+                Paragraph(isc_modulo, pdfs["value"]),
+            ],
+            [
+                Paragraph("<b>Modelo del módulo</b>", pdfs["label"]),
+                Paragraph(modelo_modulo_dc, pdfs["value"]),
+                Paragraph("<b>Fecha de cálculo</b>", pdfs["label"]),
+                Paragraph(_fecha_calculo(calculos_dc), pdfs["value"]),
             ],
         ]
-        elements.append(make_info_table(data_ac, [3.6 * cm, 4.6 * cm, 3.8 * cm, 4.8 * cm]))
-        elements.append(Spacer(1, 0.18 * cm))
+        elements.append(make_info_table(general_dc, [3.0 * cm, 5.5 * cm, 3.0 * cm, 5.2 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
 
-    # =========================================================
-    # CAÍDA DE TENSIÓN
-    # =========================================================
-    elements.append(PageBreak())
-    elements.append(Paragraph("Caída de tensión", pdfs["section"]))
+        for r in calculos_dc:
+            det = r.dimensionamiento_detalle
+            modelo = str((det.inversor if det else None) or (det.micro_inversor if det else None) or "—")
+            tipo_equipo = "Micro inversor" if det and det.micro_inversor_id else "Inversor"
 
-    general_tension = [
-        [
-            Paragraph("<b>Proyecto</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
-            Paragraph("<b>Voltaje del sitio</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
-        ],
-        [
-            Paragraph("<b>Número de fases</b>", pdfs["label"]),
-            Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
-            Paragraph("<b>Fecha</b>", pdfs["label"]),
-            Paragraph(fecha, pdfs["value"]),
-        ],
-    ]
-    elements.append(make_info_table(general_tension, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
-    elements.append(Spacer(1, 0.25 * cm))
+            lista_modulos = det.modulos_por_cadena_lista if det else []
+            if lista_modulos:
+                modulos_por_inversor = sum(int(v or 0) for v in lista_modulos)
+                modulos_cadena_txt = "<br/>".join([f"Cad {i + 1}: {v}" for i, v in enumerate(lista_modulos)])
+            else:
+                modulos_por_inversor = int((det.no_cadenas or 0) * (det.modulos_por_cadena or 0)) if det else 0
+                modulos_cadena_txt = str(det.modulos_por_cadena or "—") if det else "—"
+
+            res = r.resultado_dc
+            con = r.condulet
+
+            elements.append(Paragraph(f"{tipo_equipo} {r.indice} — {modelo}", pdfs["block_title"]))
+
+            data_dc = [
+                [
+                    Paragraph("<b>Número de series</b>", pdfs["label"]),
+                    Paragraph(str(det.no_cadenas if det else "—"), pdfs["value"]),
+                    Paragraph("<b>Número de módulos por inversor</b>", pdfs["label"]),
+                    Paragraph(str(modulos_por_inversor), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
+                    Paragraph(modulos_cadena_txt, pdfs["wrap"]),
+                    Paragraph("<b>Metros lineales</b>", pdfs["label"]),
+                    Paragraph(str(r.metros_lineales or "—"), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Calibre cable solar</b>", pdfs["label"]),
+                    Paragraph(str(r.calibre_cable_solar or "—"), pdfs["value"]),
+                    Paragraph("<b>Hilos por tubería</b>", pdfs["label"]),
+                    Paragraph(str(r.hilos_tuberia or "—"), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Amperaje protección</b>", pdfs["label"]),
+                    Paragraph(f"{getattr(res, 'amperaje_fusible', '—')} A" if res else "—", pdfs["value"]),
+                    Paragraph("<b>Total de cadenas</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_de_cadenas", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Total fusibles</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_fusibles", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>Metros totales cable</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "metros_totales_cable", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Calibre tubería</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "calibre_tuberia", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>Total tubos</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_tubos", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Condulets LL / LR / LB / T / C</b>", pdfs["label"]),
+                    Paragraph(
+                        f"{con.tipo_ll if con else 0} / {con.tipo_lr if con else 0} / {con.tipo_lb if con else 0} / {con.tipo_t if con else 0} / {con.tipo_c if con else 0}",
+                        pdfs["value"]
+                    ),
+                    Paragraph("<b>Total condulets</b>", pdfs["label"]),
+                    Paragraph(str(con.total() if con else 0), pdfs["value"]),
+                ],
+            ]
+            elements.append(make_info_table(data_dc, [3.6 * cm, 4.6 * cm, 3.8 * cm, 4.8 * cm]))
+            elements.append(Spacer(1, 0.18 * cm))
+        return elements
 
-    for r in calculos_tension:
-        res = r.resultado_tension
-        titulo = f"{r.tipo_calculo} - Inversor {r.indice}"
-        if r.tipo_calculo == "DC" and r.serie:
-            titulo += f" - Serie {r.serie}"
+    def _seccion_ac():
+        elements = []
 
-        elements.append(Paragraph(titulo, pdfs["block_title"]))
+        # =========================================================
+        # CÁLCULO AC
+        # =========================================================
+        elements.append(Paragraph("Cálculo AC", pdfs["section"]))
 
-        data_tension = [
+        general_ac = [
             [
-                Paragraph("<b>Temperatura AC</b>", pdfs["label"]),
-                Paragraph(str(r.temperatura_ac or "—"), pdfs["value"]),
-                Paragraph("<b>Temperatura DC</b>", pdfs["label"]),
-                Paragraph(str(r.temperatura_dc or "—"), pdfs["value"]),
+                Paragraph("<b>Proyecto</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
+                Paragraph("<b>Empresa</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Nombre_Empresa or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Factor potencia AC</b>", pdfs["label"]),
-                Paragraph(str(r.factor_potencia_ac or "—"), pdfs["value"]),
-                Paragraph("<b>Longitud AC</b>", pdfs["label"]),
-                Paragraph(str(r.longitud_ac or "—"), pdfs["value"]),
+                Paragraph("<b>Voltaje nominal</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
+                Paragraph("<b>Número de fases</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
             ],
             [
-                Paragraph("<b>Longitud DC</b>", pdfs["label"]),
-                Paragraph(str(r.longitud_dc or "—"), pdfs["value"]),
-                Paragraph("<b>Corriente corregida</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "corriente_corregida", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Número de módulos</b>", pdfs["label"]),
+                Paragraph(no_modulos, pdfs["value"]),
+                Paragraph("<b>Número de inversores</b>", pdfs["label"]),
+                Paragraph(no_inversores, pdfs["value"]),
             ],
             [
-                Paragraph("<b>Voltaje caída AC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "voltaje_tension_ac", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>% caída AC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "porcentaje_voltaje_tension_ac", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Voc del módulo</b>", pdfs["label"]),
+                Paragraph(voc_modulo, pdfs["value"]),
+                Paragraph("<b>Isc del módulo</b>", pdfs["label"]),
+                Paragraph(isc_modulo, pdfs["value"]),
             ],
             [
-                Paragraph("<b>Voltaje caída DC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "voltaje_tension_dc", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>% caída DC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "porcentaje_voltaje_tension_dc", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Modelo del módulo</b>", pdfs["label"]),
+                Paragraph(modelo_modulo_dc, pdfs["value"]),
+                Paragraph("<b>Fecha de cálculo</b>", pdfs["label"]),
+                Paragraph(_fecha_calculo(calculos_ac), pdfs["value"]),
             ],
+        ]
+        elements.append(make_info_table(general_ac, [3.0 * cm, 5.5 * cm, 3.0 * cm, 5.2 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
+
+        for r in calculos_ac:
+            det = r.dimensionamiento_detalle
+            modelo = str((det.inversor if det else None) or (det.micro_inversor if det else None) or "—")
+            tipo_equipo = "Micro inversor" if det and det.micro_inversor_id else "Inversor"
+
+            lista_modulos = det.modulos_por_cadena_lista if det else []
+            if lista_modulos:
+                modulos_por_inversor = sum(int(v or 0) for v in lista_modulos)
+                modulos_cadena_txt = "<br/>".join([f"Cad {i + 1}: {v}" for i, v in enumerate(lista_modulos)])
+            else:
+                modulos_por_inversor = int((det.no_cadenas or 0) * (det.modulos_por_cadena or 0)) if det else 0
+                modulos_cadena_txt = str(det.modulos_por_cadena or "—") if det else "—"
+
+            res = r.resultado_ac
+            con = r.condulet
+
+            elements.append(Paragraph(f"{tipo_equipo} {r.indice} — {modelo}", pdfs["block_title"]))
+
+            corriente_salida = "—"
+            if det:
+                if det.inversor_id and det.inversor and det.inversor.corriente_salida is not None:
+                    corriente_salida = f"{det.inversor.corriente_salida} A"
+                elif det.micro_inversor_id and det.micro_inversor and det.micro_inversor.corriente_salida is not None:
+                    corriente_salida = f"{det.micro_inversor.corriente_salida} A"
+
+            data_ac = [
+                [
+                    Paragraph("<b>Número de series</b>", pdfs["label"]),
+                    Paragraph(str(det.no_cadenas if det else "—"), pdfs["value"]),
+                    Paragraph("<b>Número de módulos por inversor</b>", pdfs["label"]),
+                    Paragraph(str(modulos_por_inversor), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Módulos por cadena</b>", pdfs["label"]),
+                    Paragraph(modulos_cadena_txt, pdfs["wrap"]),
+                    Paragraph("<b>Corriente de salida</b>", pdfs["label"]),
+                    Paragraph(corriente_salida, pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Metros lineales por fase</b>", pdfs["label"]),
+                    Paragraph(str(r.metros_lineales_ac or "—"), pdfs["value"]),
+                    Paragraph("<b>Calibre cable THHW</b>", pdfs["label"]),
+                    Paragraph(str(r.calibre_cable_thhw or "—"), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Hilos por tubería</b>", pdfs["label"]),
+                    Paragraph(str(r.hilos_tuberia_ac or "—"), pdfs["value"]),
+                    Paragraph("<b>Amperaje protección</b>", pdfs["label"]),
+                    Paragraph(f"{getattr(res, 'amperaje_proteccion', '—')} A" if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Total de cadenas</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_de_cadenas_ac", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>Total protecciones</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_protecciones", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Metros totales cable</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "metros_totales_cable_ac", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>Calibre tubería</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "calibre_tuberia_ac", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Total tubos</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "total_tubos_ac", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>Condulets LL / LR / LB / T / C</b>", pdfs["label"]),
+                    Paragraph(
+                        f"{con.tipo_ll if con else 0} / {con.tipo_lr if con else 0} / {con.tipo_lb if con else 0} / {con.tipo_t if con else 0} / {con.tipo_c if con else 0}",
+                        pdfs["value"]
+                    ),
+                ],
+            ]
+            elements.append(make_info_table(data_ac, [3.6 * cm, 4.6 * cm, 3.8 * cm, 4.8 * cm]))
+            elements.append(Spacer(1, 0.18 * cm))
+        return elements
+
+    def _seccion_tension():
+        elements = []
+
+        # =========================================================
+        # CAÍDA DE TENSIÓN
+        # =========================================================
+        elements.append(Paragraph("Caída de tensión", pdfs["section"]))
+
+        general_tension = [
             [
-                Paragraph("<b>RT AC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "calculo_rt_ac", "—")) if res else "—", pdfs["value"]),
-                Paragraph("<b>RT DC</b>", pdfs["label"]),
-                Paragraph(str(getattr(res, "calculo_rt_dc", "—")) if res else "—", pdfs["value"]),
+                Paragraph("<b>Proyecto</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Nombre_Proyecto or "—"), pdfs["value"]),
+                Paragraph("<b>Voltaje del sitio</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Voltaje_Nominal or "—"), pdfs["value"]),
+            ],
+            [
+                Paragraph("<b>Número de fases</b>", pdfs["label"]),
+                Paragraph(str(proyecto.Numero_Fases or "—"), pdfs["value"]),
+                Paragraph("<b>Fecha de cálculo</b>", pdfs["label"]),
+                Paragraph(_fecha_calculo(calculos_tension), pdfs["value"]),
             ],
         ]
+        elements.append(make_info_table(general_tension, [3.2 * cm, 5.2 * cm, 3.3 * cm, 4.8 * cm]))
+        elements.append(Spacer(1, 0.25 * cm))
 
-        elements.append(make_info_table(data_tension, [3.2 * cm, 5.0 * cm, 3.2 * cm, 5.1 * cm]))
-        elements.append(Spacer(1, 0.18 * cm))
+        for r in calculos_tension:
+            res = r.resultado_tension
+            titulo = f"{r.tipo_calculo} - Inversor {r.indice}"
+            if r.tipo_calculo == "DC" and r.serie:
+                titulo += f" - Serie {r.serie}"
+
+            elements.append(Paragraph(titulo, pdfs["block_title"]))
+
+            data_tension = [
+                [
+                    Paragraph("<b>Temperatura AC</b>", pdfs["label"]),
+                    Paragraph(str(r.temperatura_ac or "—"), pdfs["value"]),
+                    Paragraph("<b>Temperatura DC</b>", pdfs["label"]),
+                    Paragraph(str(r.temperatura_dc or "—"), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Factor potencia AC</b>", pdfs["label"]),
+                    Paragraph(str(r.factor_potencia_ac or "—"), pdfs["value"]),
+                    Paragraph("<b>Longitud AC</b>", pdfs["label"]),
+                    Paragraph(str(r.longitud_ac or "—"), pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Longitud DC</b>", pdfs["label"]),
+                    Paragraph(str(r.longitud_dc or "—"), pdfs["value"]),
+                    Paragraph("<b>Corriente corregida</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "corriente_corregida", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Voltaje caída AC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "voltaje_tension_ac", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>% caída AC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "porcentaje_voltaje_tension_ac", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>Voltaje caída DC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "voltaje_tension_dc", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>% caída DC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "porcentaje_voltaje_tension_dc", "—")) if res else "—", pdfs["value"]),
+                ],
+                [
+                    Paragraph("<b>RT AC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "calculo_rt_ac", "—")) if res else "—", pdfs["value"]),
+                    Paragraph("<b>RT DC</b>", pdfs["label"]),
+                    Paragraph(str(getattr(res, "calculo_rt_dc", "—")) if res else "—", pdfs["value"]),
+                ],
+            ]
 
-    add_fortia_footer(elements, pdfs)
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
-    return response
+            elements.append(make_info_table(data_tension, [3.2 * cm, 5.0 * cm, 3.2 * cm, 5.1 * cm]))
+            elements.append(Spacer(1, 0.18 * cm))
 
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.legends import Legend
-from reportlab.graphics import renderPDF
-from reportlab.lib.colors import HexColor
+        add_fortia_footer(elements, pdfs)
+        return elements
+
+    datos_resumen = [
+        proyecto,
+        numero_paneles.panel if numero_paneles else None,
+        resultado_paneles,
+        dimensionamiento,
+    ]
+
+    secciones = [
+        (
+            "modulos",
+            stage_hash(
+                proyecto, proyecto.ID_Usuario, numero_paneles,
+                numero_paneles.panel, numero_paneles.irradiancia, resultado_paneles,
+            ),
+            _seccion_modulos,
+        ),
+        (
+            "dimensionamiento",
+            stage_hash(
+                datos_resumen,
+                [[d, d.inversor, d.micro_inversor] for d in detalles_dimensionamiento],
+            ),
+            _seccion_dimensionamiento,
+        ),
+        (
+            "dc",
+            stage_hash(
+                datos_resumen,
+                [
+                    [r, r.dimensionamiento_detalle, r.dimensionamiento_detalle.inversor if r.dimensionamiento_detalle else None,
+                     r.dimensionamiento_detalle.micro_inversor if r.dimensionamiento_detalle else None,
+                     r.resultado_dc, r.condulet]
+                    for r in calculos_dc
+                ],
+            ),
+            _seccion_dc,
+        ),
+        (
+            "ac",
+            stage_hash(
+                datos_resumen,
+                [
+                    [r, r.dimensionamiento_detalle, r.dimensionamiento_detalle.inversor if r.dimensionamiento_detalle else None,
+                     r.dimensionamiento_detalle.micro_inversor if r.dimensionamiento_detalle else None,
+                     r.resultado_ac, r.condulet]
+                    for r in calculos_ac
+                ],
+            ),
+            _seccion_ac,
+        ),
+        (
+            "tension",
+            stage_hash(proyecto, [[r, r.resultado_tension] for r in calculos_tension]),
+            _seccion_tension,
+        ),
+    ]
+
+    inicio = time.perf_counter()
+    fragments = [
+        render_pdf_fragment(f"proyecto_{proyecto.id}_{nombre}", data_hash, build, titulo_pdf)
+        for nombre, data_hash, build in secciones
+    ]
+
+    paginas = assemble_pdf(
+        fragments,
+        response,
+        titulo_pdf,
+        footer_text=f"Generado por {generado_por} ({tipo}) · {fecha}",
+    )
+    record_pdf_metrics("proyecto_completo", len(response.content), time.perf_counter() - inicio, paginas)
+    return response
 
 @require_session_login
 @require_http_methods(["GET"])
@@ -4975,6 +5054,8 @@ def numero_modulos_pdf(request, proyecto_id: int):
         messages.error(request, "No hay resultado calculado para este proyecto.")
         return redirect("core:numero_modulos")
 
+    irradiancia_calculo = irradiancia_para_calculo(np_obj)
+
     if np_obj.tipo_facturacion == "MENSUAL":
         orden = [
             ("ene", "Ene"), ("feb", "Feb"), ("mar", "Mar"), ("abr", "Abr"),
@@ -5034,7 +5115,7 @@ def numero_modulos_pdf(request, proyecto_id: int):
             Paragraph("<b>Generación anual (kWh)</b>", pdfs["label"]),
             Paragraph(str(resultado.generacion_anual), pdfs["value"]),
             Paragraph("<b>Irradiancia</b>", pdfs["label"]),
-            Paragraph(f"{np_obj.irradiancia.ciudad}, {np_obj.irradiancia.estado}", pdfs["value"]),
+            Paragraph(f"{irradiancia_calculo.ciudad}, {irradiancia_calculo.estado}", pdfs["value"]),
         ],
     ]
 
@@ -5050,24 +5131,10 @@ def numero_modulos_pdf(request, proyecto_id: int):
     elements.append(make_data_table(data, [4.0 * cm, 6.0 * cm, 6.0 * cm]))
     elements.append(Spacer(1, 0.35 * cm))
 
-    def make_bar_chart(title, series, cat_names):
-        d = Drawing(500, 220)
-        chart = VerticalBarChart()
-        chart.x = 30
-        chart.y = 30
-        chart.height = 150
-        chart.width = 440
-        chart.data = [series]
-        chart.categoryAxis.categoryNames = cat_names
-        chart.valueAxis.valueMin = 0
-        chart.bars[0].fillColor = HexColor("#2E86DE")
-        d.add(chart)
-        return Paragraph(f"<b>{title}</b>", pdfs["value"]), d
-
-    t1, g1 = make_bar_chart("Gráfica 1: Generación por periodo (kWh)", gen_vals, labels)
+    g1 = drawing_generacion(labels, gen_vals)
 
     grafica1 = [
-        t1,
+        Paragraph("<b>Gráfica 1: Generación por periodo (kWh)</b>", pdfs["value"]),
         Spacer(1, 0.1 * cm),
         g1,
     ]
@@ -5075,29 +5142,7 @@ def numero_modulos_pdf(request, proyecto_id: int):
     elements.append(KeepTogether(grafica1))
     elements.append(Spacer(1, 0.25 * cm))
 
-    d2 = Drawing(500, 240)
-    chart2 = VerticalBarChart()
-    chart2.x = 30
-    chart2.y = 30
-    chart2.height = 160
-    chart2.width = 440
-    chart2.data = [consumo_vals, gen_vals]
-    chart2.categoryAxis.categoryNames = labels
-    chart2.valueAxis.valueMin = 0
-    chart2.bars[0].fillColor = HexColor("#E67E22")
-    chart2.bars[1].fillColor = HexColor("#2ECC71")
-
-    legend = Legend()
-    legend.x = 360
-    legend.y = 200
-    legend.alignment = "right"
-    legend.colorNamePairs = [
-        (HexColor("#E67E22"), "Consumo (kWh)"),
-        (HexColor("#2ECC71"), "Generación (kWh)"),
-    ]
-
-    d2.add(chart2)
-    d2.add(legend)
+    d2 = drawing_generacion_vs_consumo(labels, consumo_vals, gen_vals)
 
     grafica2 = [
         Paragraph("<b>Gráfica 2: Generación vs consumo</b>", pdfs["value"]),
@@ -5109,7 +5154,7 @@ def numero_modulos_pdf(request, proyecto_id: int):
 
     add_fortia_footer(elements, pdfs)
 
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
+    build_fortia_pdf(doc, elements, "numero_modulos")
     return response
 
 # ==========================
@@ -5187,7 +5232,7 @@ def usuarios_export_pdf(request):
 
     add_fortia_footer(elements, pdfs)
 
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
+    build_fortia_pdf(doc, elements, "usuarios")
 
     log_event(request, "USERS_EXPORT_PDF", "Descargó listado de usuarios en PDF", "Usuario", "")
     return response
@@ -5321,19 +5366,16 @@ def dimensionamiento_pdf(request, proyecto_id):
         elements.append(Spacer(1, 0.2 * cm))
 
     add_fortia_footer(elements, pdfs)
-    doc.build(elements, onFirstPage=draw_fortia_letterhead, onLaterPages=draw_fortia_letterhead)
+    build_fortia_pdf(doc, elements, "dimensionamiento")
     return response
 
 # ==========================
 # ACTIVIDAD / BITÁCORA
 # ==========================
-@require_admin
-@require_http_methods(["GET"])
-def usuarios_actividad(request):
-    q_user = (request.GET.get("user") or "").strip()
-    q_action = (request.GET.get("action") or "").strip()
-    q_text = (request.GET.get("q") or "").strip()
+ACTIVIDAD_PAGE_SIZE = 50
 
+
+def _filtrar_bitacora(q_user: str, q_action: str, q_text: str):
     logs = AuditLog.objects.all()
 
     if q_user:
@@ -5342,18 +5384,109 @@ def usuarios_actividad(request):
     if q_action:
         logs = logs.filter(action__icontains=q_action)
 
-    if q_text:
-        logs = logs.filter(
-            Q(message__icontains=q_text) |
-            Q(target_model__icontains=q_text) |
-            Q(target_id__icontains=q_text)
-        )
+    # Texto libre con índice (tsvector en PostgreSQL / FTS5 en SQLite)
+    return search_logs(logs, q_text)
+
+
+@require_admin
+@require_http_methods(["GET"])
+def usuarios_actividad(request):
+    q_user = (request.GET.get("user") or "").strip()
+    q_action = (request.GET.get("action") or "").strip()
+    q_text = (request.GET.get("q") or "").strip()
+    orden = (request.GET.get("orden") or "").strip()
+    after = (request.GET.get("after") or "").strip()
+
+    por_relevancia = bool(q_text) and orden == "relevancia"
+    logs, siguiente = keyset_page(
+        _filtrar_bitacora(q_user, q_action, q_text),
+        por_relevancia,
+        after=after,
+        size=ACTIVIDAD_PAGE_SIZE,
+    )
 
-    logs = logs.order_by("-created_at")[:300]
+    # Filtros actuales (sin cursor) para los links de paginación y export
+    filtros = request.GET.copy()
+    filtros.pop("after", None)
 
-    context = {"logs": logs, "q_user": q_user, "q_action": q_action, "q_text": q_text}
+    context = {
+        "logs": logs,
+        "q_user": q_user,
+        "q_action": q_action,
+        "q_text": q_text,
+        "orden": "relevancia" if por_relevancia else "recientes",
+        "siguiente": siguiente,
+        "es_primera": not after,
+        "filtros_qs": filtros.urlencode(),
+        "page_size": ACTIVIDAD_PAGE_SIZE,
+    }
     return render(request, "core/pages/usuarios_actividad.html", context)
 
+
+@require_admin
+@require_http_methods(["GET"])
+def usuarios_actividad_csv(request):
+    """Exporta la bitácora filtrada en CSV, en streaming desde el cursor de BD."""
+    q_user = (request.GET.get("user") or "").strip()
+    q_action = (request.GET.get("action") or "").strip()
+    q_text = (request.GET.get("q") or "").strip()
+
+    columnas = ["created_at", "actor_email", "actor_tipo", "action", "message", "target_model", "target_id"]
+    filas = (
+        _filtrar_bitacora(q_user, q_action, q_text)
+        .order_by("-created_at", "-id")
+        .values_list(*columnas)
+        .iterator(chunk_size=2000)
+    )
+
+    class _Echo:
+        def write(self, value):
+            return value
+
+    writer = csv.writer(_Echo())
+
+    def _rows():
+        yield "\ufeff"
+        yield writer.writerow(["Fecha", "Usuario", "Tipo", "Acción", "Detalle", "Target", "Target ID"])
+        for r in filas:
+            fecha = timezone.localtime(r[0]).strftime("%d/%m/%Y %H:%M:%S") if r[0] else ""
+            yield writer.writerow([fecha, *r[1:]])
+
+    log_event(request, "AUDIT_EXPORT_CSV", "Descargó la bitácora en CSV", "AuditLog", "")
+
+    response = StreamingHttpResponse(_rows(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = 'attachment; filename="SWGFV_Bitacora.csv"'
+    return response
+
+
+# ==========================================
+# VISTA: Tablero de rendimiento (solo admin)
+# Datos en memoria del proceso (core/perf.py)
+# ==========================================
+@require_admin
+@require_http_methods(["GET"])
+def rendimiento_view(request):
+    pdf_metrics = []
+    for nombre, m in sorted(get_pdf_metrics().items()):
+        pdf_metrics.append({
+            "nombre": nombre,
+            "count": m["count"],
+            "kb_avg": m["bytes_total"] / m["count"] / 1024 if m["count"] else 0,
+            "ms_avg": m["seconds_total"] / m["count"] * 1000 if m["count"] else 0,
+            "profile": m["profile"],
+        })
+
+    context = {
+        "urls": perf.snapshot(),
+        "hist_labels": perf.hist_labels(),
+        "nplus1_threshold": getattr(settings, "SWGFV_PERF_NPLUS1_THRESHOLD", 10),
+        "window": getattr(settings, "SWGFV_PERF_WINDOW", 500),
+        "cache_stats": sorted(get_cache_stats().items()),
+        "pdf_metrics": pdf_metrics,
+        "recaptcha": recaptcha.get_recaptcha_metrics(),
+    }
+    return render(request, "core/pages/rendimiento.html", context)
+
 # ==========================================
 # VISTA: Número de módulos (SOLO interfaz)
 # Archivo: core/views.py
@@ -5377,8 +5510,8 @@ def numero_modulos_view(request):
     else:
         proyectos = Proyecto.objects.filter(ID_Usuario_id=user_id).order_by("-id")
 
-    irradiancias = Irradiancia.objects.all().order_by("estado", "ciudad")
-    paneles = PanelSolar.objects.all().order_by("marca", "modelo")
+    irradiancias = get_catalogo("irradiancias")
+    paneles = get_catalogo("paneles")
 
     meses = [
         {"label": "Ene", "name": "consumo_ene", "key": "ene"},
@@ -5486,6 +5619,7 @@ def numero_modulos_view(request):
 
             # resultado
             resultado_obj, _ = ResultadoPaneles.objects.get_or_create(numero_paneles=obj)
+            irradiancia = irradiancia_para_calculo(obj)
 
             # ====== CÁLCULO REAL (el que ya te funciona) ======
             pot_kw = float(panel.potencia) / 1000.0
@@ -5604,14 +5738,27 @@ def numero_modulos_data(request):
     if not is_admin and int(proyecto.ID_Usuario_id) != int(session_id_usuario):
         return JsonResponse({"ok": False, "error": "Sin permisos"}, status=403)
 
+    sugerencia = _sugerencia_irradiancia(proyecto)
+    sugerencia_json = None
+    if sugerencia:
+        celda = sugerencia["celda"]
+        sugerencia_json = {
+            "irradiancia_id": sugerencia["irradiancia"].id,
+            "ciudad": sugerencia["irradiancia"].ciudad,
+            "estado": sugerencia["irradiancia"].estado,
+            "distancia_km": sugerencia["distancia_km"],
+            "malla": {"lat": round(celda.lat, 4), "lon": round(celda.lon, 4), "promedio": celda.promedio} if celda else None,
+        }
+
     np = NumeroPaneles.objects.filter(proyecto=proyecto).select_related("irradiancia", "panel").first()
     if not np:
         # No existe aún registro para ese proyecto => ok pero vacío
-        return JsonResponse({"ok": True, "exists": False})
+        return JsonResponse({"ok": True, "exists": False, "sugerencia": sugerencia_json})
 
     return JsonResponse({
         "ok": True,
         "exists": True,
+        "sugerencia": sugerencia_json,
         "data": {
             "tipo_facturacion": (np.tipo_facturacion or "").lower(),  # "mensual" / "bimestral"
             "eficiencia": str(np.eficiencia) if np.eficiencia is not None else "",
@@ -48,6 +48,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Después de WhiteNoise: los estáticos no cuentan como "(sin ruta)"
+    "core.middleware.PerfMiddleware",
+    "core.middleware.AuditFlushMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "core.middleware.SessionIdleTimeoutMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -138,13 +141,96 @@ else:
 
 
 # =========================
-# CACHÉ (lockout, etc.)
+# CACHÉ (lockout, catálogos, reportes)
+# - Compartida entre workers de gunicorn
+# - "db": tabla swgfv_cache (se crea en la migración 0026)
+# - "file": directorio local (SWGFV_CACHE_DIR)
+# - "locmem": solo para desarrollo con un proceso
 # =========================
-CACHES = {
-    "default": {
+SWGFV_CACHE_BACKEND = os.getenv("SWGFV_CACHE_BACKEND", "db").lower()
+
+_CACHE_BACKENDS = {
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "swgfv_cache",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("SWGFV_CACHE_DIR", str(BASE_DIR / ".cache" / "swgfv")),
+    },
+    "locmem": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "swgfv-cache",
+    },
+}
+
+# Versiones de namespace (core/utils/cache_utils.py) en su propio alias:
+# el cull de MAX_ENTRIES en "default" no puede borrarlas (la versión
+# volvería a 1 y revivirían claves invalidadas). Mismo tipo de backend,
+# otra ubicación; la tabla swgfv_cache_versiones se crea en la migración 0038
+_CACHE_VERSIONES = {
+    "db": {**_CACHE_BACKENDS["db"], "LOCATION": "swgfv_cache_versiones"},
+    "file": {**_CACHE_BACKENDS["file"], "LOCATION": _CACHE_BACKENDS["file"]["LOCATION"] + "-versiones"},
+    "locmem": {**_CACHE_BACKENDS["locmem"], "LOCATION": "swgfv-cache-versiones"},
+}
+
+# =========================
+# FRAGMENTOS DE PLANTILLA ({% cache %} en layout.html)
+# - Navegación y partes fijas del layout, por rol y por versión de deploy
+# - En memoria del proceso: leerlos de la BD costaría más que renderizarlos
+# - SWGFV_DEPLOY_VERSION (o el commit que expone Render) forma parte de la
+#   clave, así un deploy nuevo nunca sirve HTML del anterior
+# =========================
+SWGFV_FRAGMENT_CACHE = os.getenv("SWGFV_FRAGMENT_CACHE", "1") == "1"
+SWGFV_DEPLOY_VERSION = (
+    os.getenv("SWGFV_DEPLOY_VERSION")
+    or os.getenv("RENDER_GIT_COMMIT", "")[:12]
+    or "dev"
+)
+
+# =========================
+# CACHÉ DE LOGIN FALLIDO (alias "throttle")
+# - Un intento fallido de un usuario nuevo no debe escribir en la BD
+#   (un ataque con muchos usuarios llenaría swgfv_cache)
+# - Por defecto en memoria de cada worker: el límite se cuenta por
+#   proceso; el bloqueo (LoginLock) sí queda en BD para todos
+# - SWGFV_THROTTLE_REDIS_URL: contador compartido en Redis (paquete redis)
+# =========================
+SWGFV_THROTTLE_REDIS_URL = os.getenv("SWGFV_THROTTLE_REDIS_URL", "")
+
+if SWGFV_THROTTLE_REDIS_URL:
+    _THROTTLE_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": SWGFV_THROTTLE_REDIS_URL,
     }
+else:
+    _THROTTLE_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "swgfv-throttle",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+CACHES = {
+    "default": {
+        **_CACHE_BACKENDS.get(SWGFV_CACHE_BACKEND, _CACHE_BACKENDS["db"]),
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    "versiones": {
+        **_CACHE_VERSIONES.get(SWGFV_CACHE_BACKEND, _CACHE_VERSIONES["db"]),
+        "TIMEOUT": None,
+    },
+    # Contadores de login (core/login_throttle.py): fuera de la BD
+    "throttle": _THROTTLE_CACHE,
+    "template_fragments": {
+        "BACKEND": (
+            "django.core.cache.backends.locmem.LocMemCache"
+            if SWGFV_FRAGMENT_CACHE
+            else "django.core.cache.backends.dummy.DummyCache"
+        ),
+        "LOCATION": "swgfv-fragments",
+        "TIMEOUT": None,
+    },
 }
 
 # =========================
@@ -180,6 +266,37 @@ CSRF_COOKIE_SECURE = not DEBUG
 SESSION_COOKIE_SAMESITE = "Lax"
 CSRF_COOKIE_SAMESITE = "Lax"
 
+# Inactividad de sesión (SessionIdleTimeoutMiddleware)
+# - La marca de actividad solo se reescribe cada N segundos
+# - "cookie": la marca vive en una cookie firmada (sin escrituras de sesión)
+SWGFV_SESSION_ACTIVITY_GRANULARITY = int(os.getenv("SWGFV_SESSION_ACTIVITY_GRANULARITY", "60"))
+SWGFV_IDLE_TRACKING = os.getenv("SWGFV_IDLE_TRACKING", "session").lower()
+
+
+# =========================
+# RENDIMIENTO (core/perf.py)
+# - Header Server-Timing + tablero en /sistema/rendimiento/
+# - WINDOW: requests por URL en la ventana móvil
+# - NPLUS1_THRESHOLD: repeticiones de la misma consulta para marcar N+1
+# =========================
+SWGFV_PERF_ENABLED = os.getenv("SWGFV_PERF_ENABLED", "1") == "1"
+SWGFV_PERF_WINDOW = int(os.getenv("SWGFV_PERF_WINDOW", "500"))
+SWGFV_PERF_NPLUS1_THRESHOLD = int(os.getenv("SWGFV_PERF_NPLUS1_THRESHOLD", "10"))
+
+
+# =========================
+# BITÁCORA (core/audit_buffer.py)
+# - Los eventos se escriben en lote al terminar el request
+# - ASYNC: un hilo escribe cada BUFFER_SIZE eventos o BUFFER_SECONDS
+# - SPILL_PATH: respaldo JSONL si la escritura en BD falla
+# =========================
+SWGFV_AUDIT_ASYNC = os.getenv("SWGFV_AUDIT_ASYNC", "0") == "1"
+SWGFV_AUDIT_BUFFER_SIZE = int(os.getenv("SWGFV_AUDIT_BUFFER_SIZE", "50"))
+SWGFV_AUDIT_BUFFER_SECONDS = float(os.getenv("SWGFV_AUDIT_BUFFER_SECONDS", "5"))
+SWGFV_AUDIT_SPILL_PATH = os.getenv("SWGFV_AUDIT_SPILL_PATH", str(BASE_DIR / "logs" / "audit_spill.jsonl"))
+# Archivos de "manage.py archivar_bitacora" (JSONL.gz por día + manifest.json)
+SWGFV_AUDIT_ARCHIVE_DIR = os.getenv("SWGFV_AUDIT_ARCHIVE_DIR", str(BASE_DIR / "archivo" / "bitacora"))
+
 
 # =========================
 # Google reCAPTCHA v2
@@ -193,9 +310,37 @@ else:
     RECAPTCHA_PUBLIC_KEY = os.getenv("RECAPTCHA_PUBLIC_KEY", "")
     RECAPTCHA_PRIVATE_KEY = os.getenv("RECAPTCHA_PRIVATE_KEY", "")
 
+# Verificación (core/recaptcha.py)
+# - VERIFIER: "google", "stub" (sin red) o ruta a una clase propia
+# - VERIFY_URL: permite apuntar a un servidor local (manage.py recaptcha_stub)
+# - FAILURE_POLICY: "closed" rechaza / "open" deja pasar si Google no responde
+SWGFV_RECAPTCHA_VERIFIER = os.getenv("SWGFV_RECAPTCHA_VERIFIER", "google")
+SWGFV_RECAPTCHA_VERIFY_URL = os.getenv("SWGFV_RECAPTCHA_VERIFY_URL", "")
+SWGFV_RECAPTCHA_CONNECT_TIMEOUT = float(os.getenv("SWGFV_RECAPTCHA_CONNECT_TIMEOUT", "2"))
+SWGFV_RECAPTCHA_READ_TIMEOUT = float(os.getenv("SWGFV_RECAPTCHA_READ_TIMEOUT", "3"))
+SWGFV_RECAPTCHA_FAILURE_POLICY = os.getenv("SWGFV_RECAPTCHA_FAILURE_POLICY", "closed").lower()
+SWGFV_RECAPTCHA_BREAKER_FAILS = int(os.getenv("SWGFV_RECAPTCHA_BREAKER_FAILS", "5"))
+SWGFV_RECAPTCHA_BREAKER_COOLDOWN = int(os.getenv("SWGFV_RECAPTCHA_BREAKER_COOLDOWN", "30"))
+
 # =========================
 # Silenciar validación de claves de prueba SOLO en local
 # =========================
 if DEBUG:
     SILENCED_SYSTEM_CHECKS = ["django_recaptcha.recaptcha_test_key_error"]
 
+
+# =========================
+# Reportes PDF
+# - "compacto": hoja membretada como JPEG reducido (PDF más ligero)
+# - "estandar": hoja membretada PNG original
+# =========================
+SWGFV_PDF_PROFILE = os.getenv("SWGFV_PDF_PROFILE", "compacto")
+
+# =========================
+# Malla de irradiancia (GHI) en disco (core/utils/irradiancia_malla.py)
+# - Se carga con: python manage.py importar_irradiancia_malla
+# - SWGFV_IRRADIANCIA_MALLA: nombre de la malla activa ("" = solo catálogo por ciudad)
+# - Requiere numpy; sin numpy el cálculo usa el catálogo Irradiancia
+# =========================
+SWGFV_IRRADIANCIA_MALLA_DIR = os.getenv("SWGFV_IRRADIANCIA_MALLA_DIR", str(BASE_DIR / "data" / "irradiancia_malla"))
+SWGFV_IRRADIANCIA_MALLA = os.getenv("SWGFV_IRRADIANCIA_MALLA", "")